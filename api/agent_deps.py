@@ -7,9 +7,10 @@ from orchestration.lc_llm import LLMRunnable
 from orchestration.rewrite import QueryWriter
 from orchestration.reasoning_graph import build_reasoning_graph
 from rag.index_manager import build_or_load_index
+from ingestion.corpus import load_corpus
 from api.config import settings 
 
-PDFs = ["data/The_GALE_ENCYCLOPEDIA_of_MEDICINE_SECOND.pdf"]
+PDFs = load_corpus()
 
 # NOTE:
 # Objects below are initialized once at process startup.
@@ -17,7 +18,9 @@ PDFs = ["data/The_GALE_ENCYCLOPEDIA_of_MEDICINE_SECOND.pdf"]
 
 _embedder = EmbeddingService()
 
-_faiss_store, _bm25_store = build_or_load_index(PDFs)
+_faiss_store, _bm25_store = build_or_load_index(
+    PDFs, build=settings.INDEX_AUTO_BUILD
+)
 
 _dense_retriever = Retriever(_embedder, _faiss_store)
 
@@ -1,3 +1,5 @@
+from typing import Optional, List
+
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -14,9 +16,85 @@ class Settings(BaseSettings):
     CHUNK_OVERLAP: int = 50
     MAX_CHARS: int = 1000
     MIN_CHARS: int = 150
+    # "token" packs sentences up to the embedding model's max_seq_length
+    CHUNKER: str = "semantic"  # allowed: "semantic", "token"
+    # Cut running heads/page numbers repeated at page edges before chunking
+    BOILERPLATE_STRIP: bool = False
+    BOILERPLATE_MIN_SHARE: float = 0.4  # of the sampled pages of a document
+    BOILERPLATE_SAMPLE_PAGES: int = 100
+    # Drop near-duplicate chunks (MinHash/LSH); the kept copy lists the others
+    DEDUP_ENABLED: bool = False
+    DEDUP_THRESHOLD: float = 0.85  # estimated Jaccard of word 5-gram shingles
+    DEDUP_NUM_PERM: int = 128
+
+    # ===== Ingestion =====
+    INDEX_PDFS: List[str] = ["data/The_GALE_ENCYCLOPEDIA_of_MEDICINE_SECOND.pdf"]
+    # Directory of PDFs or YAML manifest of sources; empty = INDEX_PDFS
+    CORPUS_SOURCE: str = ""
+    # Build a missing/stale index at API startup; off = `python -m rag.build_index` only
+    INDEX_AUTO_BUILD: bool = True
+    # Text extraction library; "pypdfium2" / "pdfminer" need their package installed
+    PDF_BACKEND: str = "pypdf"  # allowed: "pypdf", "pypdfium2", "pdfminer"
+    PDF_EXTRACT_WORKERS: int = 0  # 0 = one process per CPU, 1 = in-process
+    PDF_PAGES_PER_TASK: int = 16
+    # Whole PDFs extracted in parallel when the corpus has several; 0 = one per CPU, 1 = off
+    INGEST_DOC_WORKERS: int = 0
+    # 0 = no limit; enforced inside pypdf / pdfminer only, a pypdfium2 page runs to completion
+    PDF_PAGE_TIMEOUT_SECONDS: float = 30.0
+    # Extracted page text by PDF hash; re-chunking skips the PDF parse
+    PAGE_CACHE_ENABLED: bool = True
+    PAGE_CACHE_DIR: str = "data/cache/pages"
+    # PDF hashes reused while (size, mtime, inode) is unchanged; skips rehashing at startup
+    FILE_MANIFEST_ENABLED: bool = True
+    FILE_MANIFEST_PATH: str = "data/cache/file_manifest.json"
+    # xxh3 check (needs `xxhash`) before a full SHA-256 when only the stat changed
+    FILE_HASH_FAST: bool = True
+    # Chunks embedded and indexed per step of the streaming build
+    INDEX_BATCH_SIZE: int = 256
+    # Chunks per checkpoint shard; an interrupted rebuild resumes from the last one
+    INDEX_CHECKPOINT_CHUNKS: int = 4096
 
     # ===== Retrieval =====
     SIMILARITY_THRESHOLD: float = 0.45
+    BM25_SEARCH_MODE: str = "maxscore"  # allowed: "exhaustive", "maxscore"
+    HYBRID_CONCURRENT: bool = True
+    RETRIEVAL_MAX_WORKERS: int = 8
+    # Per-leg budget of a hybrid search; a late leg is dropped. 0 = no limit,
+    # as for every *_TIMEOUT_SECONDS setting
+    DENSE_TIMEOUT_SECONDS: float = 2.0
+    SPARSE_TIMEOUT_SECONDS: float = 1.0
+
+    # ===== Vector index =====
+    FAISS_INDEX_TYPE: str = "flat"  # allowed: "flat", "ivf_flat", "hnsw"
+    FAISS_IVF_NLIST: int = 0  # 0 = auto (4 * sqrt(N))
+    FAISS_HNSW_M: int = 32
+    FAISS_HNSW_EF_CONSTRUCTION: int = 200
+    FAISS_TRAIN_SAMPLE: int = 100000
+    FAISS_CODEC: str = "none"  # allowed: "none", "sq8", "pq"
+    FAISS_PQ_M: int = 0  # 0 = auto (largest divisor of dim <= dim / 4)
+    FAISS_PQ_NBITS: int = 8
+    FAISS_RERANK_FACTOR: int = 4
+    # Max recall@5 drop vs float32 flat a codec may cost (benchmark gate)
+    FAISS_RECALL_TOLERANCE: float = 0.02
+    # Map index files read-only so API workers share one page-cache copy
+    INDEX_MMAP: bool = True
+    # Apply PDF additions/removals in place instead of rebuilding
+    INDEX_INCREMENTAL: bool = True
+    # Share of dead chunk-store rows that triggers a compacting rebuild
+    INDEX_MAX_DEAD_RATIO: float = 0.5
+    # Query-time knobs; None keeps the values persisted with the index
+    FAISS_NPROBE: Optional[int] = None
+    FAISS_EF_SEARCH: Optional[int] = None
+
+    # ===== Embedding cache =====
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_PATH: str = "data/cache/embeddings.sqlite"
+    EMBEDDING_CACHE_MAX_MB: int = 2048
+    # Query vectors kept in memory (LRU) for repeated questions; 0 = off
+    QUERY_CACHE_SIZE: int = 4096
+    # Concurrent query misses wait up to this long to share one forward pass; 0 = off
+    QUERY_BATCH_WINDOW_MS: float = 2.0
+    QUERY_BATCH_MAX_SIZE: int = 32
 
     # ===== Limits =====
     MAX_PROMPT_TOKENS: int = 3000
@@ -24,6 +102,16 @@ class Settings(BaseSettings):
 
     # ===== Device =======
     EMBEDDING_DEVICE: str = "cpu"  # allowed: "cpu", "cuda"
+    # Padded tokens per forward pass; inputs sorted by length. 0 = fixed batches of 32
+    EMBED_BATCH_TOKENS: int = 4096
+    # "onnx" runs the embedding model on ONNX Runtime (needs optimum[onnxruntime])
+    EMBEDDING_BACKEND: str = "torch"  # allowed: "torch", "onnx"
+    # Dynamic int8 quantization of the ONNX export for this CPU; "" = float32
+    EMBEDDING_ONNX_QUANTIZE: str = ""  # allowed: "", "arm64", "avx2", "avx512", "avx512_vnni"
+    EMBEDDING_ONNX_DIR: str = "data/models/onnx"
+    # Processes for bulk embedding (index build); 0 = one per EMBED_WORKER_THREADS CPUs, 1 = in-process
+    EMBED_WORKERS: int = 0
+    EMBED_WORKER_THREADS: int = 4  # torch / ONNX Runtime threads per worker
 
     # ===== Database URL ======
     DATABASE_URL: str = "sqlite:///./rag_app.db"
@@ -0,0 +1,21 @@
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional, Tuple
+
+
+def spawn_pool(
+    workers: int,
+    initializer: Optional[Callable] = None,
+    initargs: Tuple = (),
+) -> ProcessPoolExecutor:
+    """
+    Process pool whose workers are started with spawn, not fork: the
+    caller may already run torch / FAISS threads, and a forked child
+    inherits their locks in whatever state they were.
+    """
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=mp.get_context("spawn"),
+        initializer=initializer,
+        initargs=initargs,
+    )
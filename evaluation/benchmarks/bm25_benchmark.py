@@ -0,0 +1,160 @@
+"""
+BM25 search latency: inverted-index engine vs rank_bm25 full scan.
+
+Synthetic chunks are drawn from a Zipf vocabulary so that postings
+lengths look like real text (a few very common terms, a long tail).
+
+Run:
+    python -m evaluation.benchmarks.bm25_benchmark --sizes 10000 100000 1000000
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+from rag.bm25_store import BM25Store
+
+
+OUTPUT_FILE = Path("evaluation/benchmarks/results/bm25_benchmark.json")
+
+VOCAB_SIZE = 50_000
+CHUNK_TOKENS = 120
+N_QUERIES = 200
+TOP_K = 5
+SEED = 13
+
+
+# -------------------------------------------------
+# SYNTHETIC CORPUS
+# -------------------------------------------------
+def make_vocab(size: int):
+    return [f"term{i}" for i in range(size)]
+
+
+def sample_tokens(rng, vocab, n_tokens: int):
+    ranks = rng.zipf(1.15, size=n_tokens) - 1
+    ranks = ranks[ranks < len(vocab)]
+    return [vocab[r] for r in ranks]
+
+
+def make_chunks(rng, vocab, n_chunks: int):
+    return [
+        {
+            "chunk_id": f"synthetic_p{i}_s{i}",
+            "content": " ".join(sample_tokens(rng, vocab, CHUNK_TOKENS)),
+            "metadata": {},
+        }
+        for i in range(n_chunks)
+    ]
+
+
+def make_queries(rng, vocab, n_queries: int):
+    lengths = rng.integers(2, 12, size=n_queries)
+    return [" ".join(sample_tokens(rng, vocab, n * 4)[:n]) for n in lengths]
+
+
+# -------------------------------------------------
+# TIMING
+# -------------------------------------------------
+def percentiles(samples_ms):
+    arr = np.asarray(samples_ms)
+    return {
+        "p50_ms": float(np.percentile(arr, 50)),
+        "p95_ms": float(np.percentile(arr, 95)),
+        "mean_ms": float(arr.mean()),
+    }
+
+
+def time_native(store: BM25Store, queries):
+    samples = []
+    results = []
+    for q in queries:
+        start = time.perf_counter()
+        results.append(store.search(q, TOP_K))
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples, results
+
+
+def time_reference(store: BM25Store, queries):
+    from rank_bm25 import BM25Okapi
+
+    bm25 = BM25Okapi([store._preprocess(c["content"]) for c in store.documents])
+
+    samples = []
+    results = []
+    for q in queries:
+        start = time.perf_counter()
+        scores = bm25.get_scores(store._preprocess(q))
+        top = sorted(
+            range(len(scores)),
+            key=lambda i: scores[i],
+            reverse=True,
+        )[:TOP_K]
+        samples.append((time.perf_counter() - start) * 1000)
+        results.append([(store.documents[i], float(scores[i])) for i in top])
+    return samples, results
+
+
+# -------------------------------------------------
+# MAIN
+# -------------------------------------------------
+def run(sizes, reference_max: int):
+    rng = np.random.default_rng(SEED)
+    vocab = make_vocab(VOCAB_SIZE)
+    queries = make_queries(rng, vocab, N_QUERIES)
+
+    report = {}
+
+    for n in sizes:
+        print(f"\nCorpus size: {n}")
+        chunks = make_chunks(rng, vocab, n)
+
+        store = BM25Store("bm25_benchmark.pkl")
+        start = time.perf_counter()
+        store.build(chunks)
+        build_s = time.perf_counter() - start
+
+        native_ms, native_results = time_native(store, queries)
+        row = {
+            "build_s": build_s,
+            "postings": int(store.index.postings.nnz),
+            "native": percentiles(native_ms),
+        }
+
+        if n <= reference_max:
+            ref_ms, ref_results = time_reference(store, queries)
+            row["rank_bm25"] = percentiles(ref_ms)
+            row["speedup_p50"] = row["rank_bm25"]["p50_ms"] / row["native"]["p50_ms"]
+            row["identical_rankings"] = all(
+                [c["chunk_id"] for c, _ in a] == [c["chunk_id"] for c, _ in b]
+                for a, b in zip(native_results, ref_results)
+            )
+
+        print(json.dumps(row, indent=2))
+        report[str(n)] = row
+
+    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    OUTPUT_FILE.write_text(json.dumps(report, indent=2))
+    print("\nSaved results to:", OUTPUT_FILE)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10_000, 100_000, 1_000_000],
+    )
+    parser.add_argument(
+        "--reference-max",
+        type=int,
+        default=100_000,
+        help="largest corpus to also time with rank_bm25 (slow)",
+    )
+    args = parser.parse_args()
+
+    run(args.sizes, args.reference_max)
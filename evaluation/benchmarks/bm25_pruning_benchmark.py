@@ -0,0 +1,103 @@
+"""
+BM25 MaxScore pruning vs exhaustive scoring, bucketed by query length.
+
+Long queries (history-aware rewrites, pasted symptom lists) are where
+exhaustive scoring hurts most: every posting of every common term is
+accumulated. This script checks that both modes return the same top-k
+and reports latency per query-length bucket.
+
+Run:
+    python -m evaluation.benchmarks.bm25_pruning_benchmark --size 100000
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+from rag.bm25_store import BM25Store
+from evaluation.benchmarks.bm25_benchmark import (
+    make_vocab,
+    make_chunks,
+    sample_tokens,
+    percentiles,
+    VOCAB_SIZE,
+    SEED,
+)
+
+
+OUTPUT_FILE = Path("evaluation/benchmarks/results/bm25_pruning_benchmark.json")
+
+BUCKETS = [(1, 2), (3, 5), (6, 10), (11, 20), (21, 40)]
+QUERIES_PER_BUCKET = 100
+TOP_K = 5
+CONTENT_RANK = 100
+
+
+def make_query(rng, vocab, n_tokens: int):
+    """
+    Half function words (Zipf head), half content words (mid/tail),
+    which is roughly what rewritten queries and symptom lists look like.
+    """
+    head = sample_tokens(rng, vocab, n_tokens * 4)[: n_tokens // 2]
+    tail = rng.integers(CONTENT_RANK, len(vocab), size=n_tokens - len(head))
+
+    tokens = head + [vocab[r] for r in tail]
+    rng.shuffle(tokens)
+    return " ".join(tokens)
+
+
+def make_bucket_queries(rng, vocab, low: int, high: int):
+    lengths = rng.integers(low, high + 1, size=QUERIES_PER_BUCKET)
+    return [make_query(rng, vocab, int(n)) for n in lengths]
+
+
+def time_mode(store: BM25Store, queries, mode: str):
+    samples = []
+    results = []
+    for q in queries:
+        start = time.perf_counter()
+        results.append(store.search(q, TOP_K, mode=mode))
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples, results
+
+
+def run(size: int):
+    rng = np.random.default_rng(SEED)
+    vocab = make_vocab(VOCAB_SIZE)
+
+    store = BM25Store("bm25_pruning_benchmark.pkl")
+    store.build(make_chunks(rng, vocab, size))
+
+    report = {"corpus_size": size, "buckets": {}}
+
+    for low, high in BUCKETS:
+        queries = make_bucket_queries(rng, vocab, low, high)
+
+        exhaustive_ms, exhaustive = time_mode(store, queries, "exhaustive")
+        maxscore_ms, pruned = time_mode(store, queries, "maxscore")
+
+        row = {
+            "exhaustive": percentiles(exhaustive_ms),
+            "maxscore": percentiles(maxscore_ms),
+            "identical_topk": exhaustive == pruned,
+        }
+        row["speedup_p50"] = row["exhaustive"]["p50_ms"] / row["maxscore"]["p50_ms"]
+
+        name = f"{low}-{high}"
+        print(name, json.dumps(row, indent=2))
+        report["buckets"][name] = row
+
+    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    OUTPUT_FILE.write_text(json.dumps(report, indent=2))
+    print("\nSaved results to:", OUTPUT_FILE)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    run(args.size)
@@ -0,0 +1,151 @@
+"""
+Index build with and without page boilerplate stripping.
+
+Synthetic documents modelled on the GALE layout after text extraction:
+each page is an entry-title running head (changes every few pages),
+body text, then a footer "GALE ENCYCLOPEDIA OF MEDICINE 2 <page>" (odd
+pages) or "<page> GALE ENCYCLOPEDIA OF MEDICINE 2" (even pages). The
+pages are fed to `index_manager.rebuild_index` in a temp directory with
+BOILERPLATE_STRIP off and on; reported per run: build seconds, chunks,
+characters sent to the embedder, BM25 postings and tokens, chunks still
+carrying the footer, and bytes removed per document.
+
+`--embedder hash` (random unit vectors) measures everything except
+model time; with the real model, embedding time follows the embedded
+character/token count.
+
+Run:
+    python -m evaluation.benchmarks.boilerplate_benchmark
+    python -m evaluation.benchmarks.boilerplate_benchmark --embedder hash
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from api.config import settings
+from rag import index_manager as im
+from rag.chunk_store import ChunkStore
+from evaluation.benchmarks.streaming_ingestion_benchmark import hash_embeddings
+
+
+OUTPUT_FILE = Path("evaluation/benchmarks/results/boilerplate_benchmark.json")
+
+SEED = 23
+DOCS = 4
+PAGES_PER_DOC = 500
+FOOTER = "GALE ENCYCLOPEDIA OF MEDICINE 2"
+
+
+def synthetic_corpus():
+    rng = np.random.default_rng(SEED)
+    vocab = np.array([f"term{i}" for i in range(20000)])
+
+    corpus = {}
+    for d in range(DOCS):
+        pages = []
+        for p in range(1, PAGES_PER_DOC + 1):
+            title = f"Entry{(p - 1) // 4}"
+            body = " ".join(
+                " ".join(rng.choice(vocab, rng.integers(8, 25))) + "."
+                for _ in range(rng.integers(20, 40))
+            )
+            footer = f"{FOOTER} {p}" if p % 2 else f"{p} {FOOTER}"
+            pages.append({
+                "content": f"{title} {body} {footer}",
+                "metadata": {
+                    "doc_id": f"{d:064x}",
+                    "page_number": p,
+                    "source_file": f"doc{d}.pdf",
+                },
+            })
+        corpus[f"doc{d}.pdf"] = pages
+    return corpus
+
+
+def build(corpus, strip: bool):
+    settings.BOILERPLATE_STRIP = strip
+    pdf_paths = list(corpus)
+    doc_hashes = {pdf: pages[0]["metadata"]["doc_id"] for pdf, pages in corpus.items()}
+    fingerprint = im.compute_fingerprint(pdf_paths, doc_hashes)
+
+    start = time.perf_counter()
+    faiss_store, bm25_store = im.rebuild_index(pdf_paths, doc_hashes, fingerprint)
+    build_s = time.perf_counter() - start
+
+    chunk_store = ChunkStore(im.CHUNK_STORE).open()
+    chunks = [chunk_store[i] for i in range(len(chunk_store))]
+    chunk_store.close()
+
+    meta = im.load_index_metadata()
+    return {
+        "build_s": build_s,
+        "chunks": faiss_store.index.ntotal,
+        "embedded_chars": sum(len(c["content"]) for c in chunks),
+        "bm25_postings": int(bm25_store.index.postings.nnz),
+        "bm25_tokens": int(bm25_store.index.doc_len.sum()),
+        "chunks_with_footer": sum(FOOTER in c["content"] for c in chunks),
+        "bytes_removed": {
+            pdf: doc.get("boilerplate_bytes_removed", 0)
+            for pdf, doc in meta["documents"].items()
+        },
+    }
+
+
+def run(embedder: str):
+    corpus = synthetic_corpus()
+
+    im.iter_pdf_pages = lambda pdf: iter(corpus[pdf])
+    im.count_pages = lambda pdf: len(corpus[pdf])
+    settings.EMBEDDING_CACHE_ENABLED = False
+    settings.PAGE_CACHE_ENABLED = True  # no checkpoint page copies
+    if embedder == "hash":
+        im.embed_chunks = hash_embeddings
+
+    report = {
+        "docs": DOCS,
+        "pages_per_doc": PAGES_PER_DOC,
+        "embedder": embedder,
+        "bytes_total": sum(
+            len(p["content"].encode("utf-8")) for pages in corpus.values() for p in pages
+        ),
+    }
+
+    for name, strip in (("off", False), ("on", True)):
+        report[name] = build(corpus, strip)
+        print(name, json.dumps(report[name], indent=2))
+
+    report["build_time_drop_pct"] = 100 * (1 - report["on"]["build_s"] / report["off"]["build_s"])
+    report["embedded_chars_drop_pct"] = 100 * (
+        1 - report["on"]["embedded_chars"] / report["off"]["embedded_chars"]
+    )
+    print("build_time_drop_pct", report["build_time_drop_pct"])
+    print("embedded_chars_drop_pct", report["embedded_chars_drop_pct"])
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--embedder", choices=["model", "hash"], default="model")
+    args = parser.parse_args()
+
+    output = OUTPUT_FILE.resolve()
+
+    # Index paths are relative to the working directory
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        im.INDEX_DIR.mkdir(parents=True, exist_ok=True)
+        try:
+            report = run(args.embedder)
+        finally:
+            os.chdir(cwd)
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print("\nSaved results to:", output)
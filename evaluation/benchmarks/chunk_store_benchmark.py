@@ -0,0 +1,192 @@
+"""
+Startup cost of the index layouts: pickled chunk copies vs shared store.
+
+- pickled: FAISS metadata pickle + BM25 pickle carrying its own copy of
+  every chunk (the layout before rag/chunk_store.py)
+- shared:  one chunk store referenced by row id from both backends,
+  arrays and text memory-mapped, chunks decoded only when returned
+
+Both layouts are written from the same chunks and vectors, then loaded
+in a fresh process each, with one dense and one sparse search after the
+load. Reported per layout: disk_mb, load_s, rss_mb and uss_mb.
+
+Run:
+    python -m evaluation.benchmarks.chunk_store_benchmark
+    python -m evaluation.benchmarks.chunk_store_benchmark --synthetic 200000
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import pickle
+import tempfile
+import time
+from pathlib import Path
+
+import faiss
+import numpy as np
+
+from evaluation.benchmarks.index_mmap_benchmark import memory_mb, SYNTHETIC_DIM
+
+
+OUTPUT_FILE = Path("evaluation/benchmarks/results/chunk_store_benchmark.json")
+
+
+def write_pickled(workdir: Path, vectors, chunks):
+    from rag.faiss_store import FaissStore
+    from rag.bm25_store import InvertedIndex, BM25Store
+
+    store = FaissStore(workdir / "faiss.index", workdir / "faiss_meta.pkl")
+    store.add_chunks(vectors, chunks)
+    faiss.write_index(store.index, str(store.index_path))
+    with open(store.metadata_path, "wb") as f:
+        pickle.dump(list(chunks), f)
+
+    tokenizer = BM25Store(workdir / "bm25.pkl")
+    index = InvertedIndex.from_corpus(
+        [tokenizer._preprocess(c["content"]) for c in chunks]
+    )
+    with open(workdir / "bm25.pkl", "wb") as f:
+        pickle.dump(
+            {"index": index.to_dict(), "documents": list(chunks)},
+            f,
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+
+
+def write_shared(workdir: Path, vectors, chunks):
+    from rag.faiss_store import FaissStore
+    from rag.bm25_store import BM25Store
+    from rag.chunk_store import ChunkStore
+
+    chunk_store = ChunkStore.write(workdir / "chunks", chunks).open()
+
+    store = FaissStore(
+        workdir / "faiss.index",
+        workdir / "faiss_meta.pkl",
+        chunk_store=chunk_store,
+    )
+    store.add_chunks(vectors, chunks)
+    store.save()
+
+    bm25 = BM25Store(workdir / "bm25.pkl", chunk_store=chunk_store)
+    bm25.build(chunks)
+    bm25.save()
+
+
+def worker(layout: str, workdir: str, query_vector, results):
+    from rag.faiss_store import FaissStore
+    from rag.bm25_store import BM25Store
+    from rag.chunk_store import ChunkStore
+
+    workdir = Path(workdir)
+    start = time.perf_counter()
+
+    if layout == "shared":
+        chunk_store = ChunkStore(workdir / "chunks").open()
+        faiss_store = FaissStore(
+            workdir / "faiss.index",
+            workdir / "faiss_meta.pkl",
+            mmap=True,
+            chunk_store=chunk_store,
+        )
+        bm25_store = BM25Store(
+            workdir / "bm25.pkl", mmap=True, chunk_store=chunk_store
+        )
+    else:
+        faiss_store = FaissStore(workdir / "faiss.index", workdir / "faiss_meta.pkl")
+        bm25_store = BM25Store(workdir / "bm25.pkl")
+
+    faiss_store.load()
+    bm25_store.load()
+    load_s = time.perf_counter() - start
+
+    _, idx = faiss_store.search(query_vector, 5)
+    hits = [faiss_store.metadata[i] for i in idx[0] if i != -1]
+    bm25_store.search(hits[0]["content"][:200], 5)
+
+    row = {"load_s": load_s}
+    row.update(memory_mb())
+    results.put(row)
+
+
+def measure(layout: str, workdir: Path, query_vector):
+    ctx = mp.get_context("spawn")
+    results = ctx.Queue()
+    proc = ctx.Process(
+        target=worker, args=(layout, str(workdir), query_vector, results)
+    )
+    proc.start()
+    row = results.get()
+    proc.join()
+
+    row["disk_mb"] = sum(
+        p.stat().st_size for p in workdir.rglob("*") if p.is_file()
+    ) / 1e6
+    return row
+
+
+def live_corpus():
+    from rag.chunk_store import ChunkStore
+    from rag.faiss_store import FaissStore
+    from rag.index_manager import FAISS_INDEX, FAISS_META, CHUNK_STORE
+    from evaluation.benchmarks.faiss_ann_tuning import extract_vectors
+
+    chunk_store = ChunkStore(CHUNK_STORE).open()
+    store = FaissStore(FAISS_INDEX, FAISS_META, chunk_store=chunk_store)
+    store.load()
+
+    if store.vectors is not None:
+        vectors = np.asarray(store.vectors, dtype="float32")
+    else:
+        vectors = extract_vectors(store.index)
+    return vectors, list(chunk_store)
+
+
+def synthetic_corpus(n_chunks: int):
+    from evaluation.benchmarks.bm25_benchmark import make_vocab, make_chunks, SEED
+
+    rng = np.random.default_rng(SEED)
+    chunks = make_chunks(rng, make_vocab(50_000), n_chunks)
+
+    vectors = rng.standard_normal((n_chunks, SYNTHETIC_DIM)).astype("float32")
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors, chunks
+
+
+def run(synthetic: int):
+    if synthetic:
+        vectors, chunks = synthetic_corpus(synthetic)
+        report = {"corpus": f"synthetic-{synthetic}"}
+    else:
+        vectors, chunks = live_corpus()
+        report = {"corpus": "live index"}
+
+    query_vector = vectors[:1].copy()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for layout, writer in (("pickled", write_pickled), ("shared", write_shared)):
+            workdir = Path(tmp) / layout
+            workdir.mkdir()
+            writer(workdir, vectors, chunks)
+
+            row = measure(layout, workdir, query_vector)
+            print(layout, json.dumps(row, indent=2))
+            report[layout] = row
+
+    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    OUTPUT_FILE.write_text(json.dumps(report, indent=2))
+    print("\nSaved results to:", OUTPUT_FILE)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        default=0,
+        help="use N synthetic chunks instead of the live index",
+    )
+    args = parser.parse_args()
+
+    run(args.synthetic)
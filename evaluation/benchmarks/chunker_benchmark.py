@@ -0,0 +1,245 @@
+"""
+Chunking throughput of the streaming `iter_chunks` chunkers against the
+previous string-concatenating `split_pages` implementations (kept below
+as `legacy_*`).
+
+Pages are generated on the fly from a fixed pool of synthetic texts
+(paragraphs of random sentences), so a 1M-page corpus never has to be
+held in memory. `*_long` cases use pages of 50 pool texts (~30 KB) and a
+window that fits a whole page, where each chunk is built from hundreds
+of pieces. For each chunker, both implementations consume the same
+pages; the report has pages/s, the speedup, the size of the chunk list
+the old API returned, and whether the (chunk_id,
+content) streams are identical, compared through a running hash.
+
+Run:
+    python -m evaluation.benchmarks.chunker_benchmark
+    python -m evaluation.benchmarks.chunker_benchmark --pages 100000
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from api.config import settings
+from ingestion.semantic_splitter import SemanticChunker
+from rag.chunking.paragraph_chunker import ParagraphChunker
+from rag.chunking.sentence_chunker import SentenceChunker
+
+
+OUTPUT_FILE = Path("evaluation/benchmarks/results/chunker_benchmark.json")
+
+POOL_SIZE = 2000
+SEED = 11
+
+LONG_PAGE_TEXTS = 50
+LONG_WINDOW = 100_000
+
+
+# -------------------------------------------------
+# Previous implementations
+# -------------------------------------------------
+def legacy_paragraph(chunker, pages):
+    chunks = []
+    idx = 0
+    for page in pages:
+        paras = re.split(r"\n{2,}", page["content"])
+        paras = [p.strip() for p in paras if len(p.strip()) > 30]
+        buffer = ""
+        for para in paras:
+            if len(buffer) + len(para) <= chunker.max_chars:
+                buffer += ("\n\n" + para) if buffer else para
+            else:
+                if len(buffer) >= chunker.min_chars:
+                    chunks.append(chunker._make_chunk(buffer, page["metadata"], idx))
+                    idx += 1
+                    buffer = para
+                else:
+                    buffer += "\n\n" + para
+        if buffer:
+            chunks.append(chunker._make_chunk(buffer, page["metadata"], idx))
+            idx += 1
+    return chunks
+
+
+def legacy_sentence(chunker, pages):
+    chunks = []
+    idx = 0
+    for page in pages:
+        sentences = re.split(r'(?<=[.!?]) +', page["content"])
+        buffer = ""
+        for sent in sentences:
+            sent = sent.strip()
+            if not sent:
+                continue
+            sep = 1 if buffer else 0
+            if len(buffer) + sep + len(sent) <= chunker.target_chars:
+                buffer = f"{buffer} {sent}" if buffer else sent
+            else:
+                if buffer.strip():
+                    chunks.append(chunker._make_chunk(buffer.strip(), page["metadata"], idx))
+                    idx += 1
+                buffer = sent
+        if buffer.strip():
+            chunks.append(chunker._make_chunk(buffer.strip(), page["metadata"], idx))
+            idx += 1
+    return chunks
+
+
+def legacy_semantic(chunker, pages):
+    chunks = []
+    chunk_index = 0
+    for page in pages:
+        paras = re.split("\\n{2,}", page["content"])
+        paragraphs = [p.strip() for p in paras if len(p.strip()) > 50]
+        buffer = ""
+        for para in paragraphs:
+            if len(buffer) + len(para) <= chunker.max_chars:
+                buffer = f"{buffer}\n\n{para}" if buffer else para
+            else:
+                if len(buffer) >= chunker.min_chars:
+                    chunks.append(chunker._make_chunk(buffer, page["metadata"], chunk_index))
+                    chunk_index += 1
+                    buffer = para
+                else:
+                    buffer = f"{buffer}\n\n{para}"
+        if buffer:
+            chunks.append(chunker._make_chunk(buffer, page["metadata"], chunk_index))
+            chunk_index += 1
+    return chunks
+
+
+# -------------------------------------------------
+# Synthetic corpus
+# -------------------------------------------------
+def page_pool():
+    """Page texts of 1-5 paragraphs of 1-5 sentences (~600 chars)."""
+    rng = np.random.default_rng(SEED)
+    vocab = [f"word{i}" for i in range(3000)]
+
+    def sentence():
+        words = rng.choice(vocab, rng.integers(3, 16))
+        return " ".join(words) + str(rng.choice([".", "!", "?"]))
+
+    pool = []
+    for _ in range(POOL_SIZE):
+        paragraphs = [
+            " ".join(sentence() for _ in range(rng.integers(1, 6)))
+            for _ in range(rng.integers(1, 6))
+        ]
+        pool.append("\n\n".join(paragraphs))
+    return pool
+
+
+def iter_pages(pool, n_pages, texts_per_page=1):
+    for i in range(n_pages):
+        first = i * texts_per_page
+        yield {
+            "content": "\n\n".join(
+                pool[(first + j) % len(pool)] for j in range(texts_per_page)
+            ),
+            "metadata": {"doc_id": "bench", "page_number": i + 1},
+        }
+
+
+def list_mb(chunks):
+    """Bytes held by a chunk list: list, dicts, strings, metadata (deduplicated)."""
+    total = sys.getsizeof(chunks)
+    seen = set()
+    for chunk in chunks:
+        total += sys.getsizeof(chunk)
+        total += sys.getsizeof(chunk["chunk_id"]) + sys.getsizeof(chunk["content"])
+        meta = chunk["metadata"]
+        if id(meta) not in seen:
+            seen.add(id(meta))
+            total += sys.getsizeof(meta)
+    return total / 1e6
+
+
+def digest(chunks):
+    hasher = hashlib.sha256()
+    n = 0
+    for chunk in chunks:
+        hasher.update(chunk["chunk_id"].encode())
+        hasher.update(chunk["content"].encode())
+        n += 1
+    return hasher.hexdigest(), n
+
+
+def run(n_pages: int):
+    pool = page_pool()
+    report = {"pages": n_pages, "chunkers": {}}
+
+    long_pages = max(1, n_pages // LONG_PAGE_TEXTS)
+
+    # name: (chunker, legacy, pages, texts per page)
+    chunkers = {
+        "paragraph": (ParagraphChunker(1200, 200), legacy_paragraph, n_pages, 1),
+        "sentence": (SentenceChunker(900), legacy_sentence, n_pages, 1),
+        "semantic": (
+            SemanticChunker(max_chars=settings.MAX_CHARS, min_chars=settings.MIN_CHARS),
+            legacy_semantic,
+            n_pages,
+            1,
+        ),
+        "paragraph_long": (
+            ParagraphChunker(LONG_WINDOW, 200), legacy_paragraph, long_pages, LONG_PAGE_TEXTS
+        ),
+        "sentence_long": (
+            SentenceChunker(LONG_WINDOW), legacy_sentence, long_pages, LONG_PAGE_TEXTS
+        ),
+        "semantic_long": (
+            SemanticChunker(max_chars=LONG_WINDOW, min_chars=settings.MIN_CHARS),
+            legacy_semantic,
+            long_pages,
+            LONG_PAGE_TEXTS,
+        ),
+    }
+
+    for name, (chunker, legacy, pages, texts_per_page) in chunkers.items():
+        start = time.perf_counter()
+        chunks = legacy(chunker, iter_pages(pool, pages, texts_per_page))
+        legacy_digest, legacy_chunks = digest(chunks)
+        legacy_s = time.perf_counter() - start
+
+        held_mb = list_mb(chunks)
+        del chunks
+
+        start = time.perf_counter()
+        new_digest, new_chunks = digest(
+            chunker.iter_chunks(iter_pages(pool, pages, texts_per_page))
+        )
+        new_s = time.perf_counter() - start
+
+        row = {
+            "pages": pages,
+            "chunks": new_chunks,
+            "legacy_s": legacy_s,
+            "iter_chunks_s": new_s,
+            "legacy_pages_per_sec": pages / legacy_s,
+            "iter_chunks_pages_per_sec": pages / new_s,
+            "speedup": legacy_s / new_s,
+            # Chunk list split_pages used to return; iter_chunks holds one page
+            "legacy_list_mb": held_mb,
+            "identical": legacy_digest == new_digest and legacy_chunks == new_chunks,
+        }
+        print(name, json.dumps(row, indent=2))
+        report["chunkers"][name] = row
+
+    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    OUTPUT_FILE.write_text(json.dumps(report, indent=2))
+    print("\nSaved results to:", OUTPUT_FILE)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    run(args.pages)
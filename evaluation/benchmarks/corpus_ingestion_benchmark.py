@@ -0,0 +1,94 @@
+"""
+Multi-document ingestion throughput (pages/sec) for 1..N document
+workers.
+
+Generates a folder of synthetic PDFs (different page counts, so every
+file has its own hash), loads it with `load_corpus`, and extracts every
+document through `DocumentPool` with each worker count (page cache off).
+Every run must return exactly the pages of the 1-worker run, in the
+same document and page order.
+
+Run:
+    python -m evaluation.benchmarks.corpus_ingestion_benchmark
+    python -m evaluation.benchmarks.corpus_ingestion_benchmark --docs 200 --pages 20
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from api.config import settings
+from ingestion.corpus import load_corpus
+from ingestion.file_manifest import file_hashes
+from ingestion.loader import DocumentPool
+from evaluation.benchmarks.pdf_extraction_benchmark import (
+    worker_counts,
+    write_synthetic_pdf,
+)
+
+
+OUTPUT_FILE = Path("evaluation/benchmarks/results/corpus_ingestion_benchmark.json")
+
+
+def extract_corpus(pdf_paths, doc_hashes, workers):
+    with DocumentPool(pdf_paths, doc_hashes, workers=workers) as loader:
+        return [page for pdf in pdf_paths for page in loader.pages(pdf)]
+
+
+def run(n_docs: int, pages_per_doc: int, max_workers: int):
+    settings.PAGE_CACHE_ENABLED = False
+    settings.FILE_MANIFEST_ENABLED = False
+    # One process per document; no page-level pool inside it
+    settings.PDF_EXTRACT_WORKERS = 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(n_docs):
+            path = Path(tmp) / f"doc_{i:04d}.pdf"
+            write_synthetic_pdf(path, pages_per_doc + i % 7)
+
+        pdf_paths = load_corpus(tmp)
+        doc_hashes = file_hashes(pdf_paths)
+
+        report = {
+            "docs": len(pdf_paths),
+            "pages": sum(pages_per_doc + i % 7 for i in range(n_docs)),
+            "cpus": os.cpu_count(),
+            "workers": {},
+        }
+        reference = None
+
+        for workers in worker_counts(max_workers):
+            start = time.perf_counter()
+            pages = extract_corpus(pdf_paths, doc_hashes, workers)
+            elapsed = time.perf_counter() - start
+
+            if reference is None:
+                reference = pages
+
+            row = {
+                "seconds": elapsed,
+                "pages_per_sec": len(pages) / elapsed,
+                "speedup": report["workers"][1]["seconds"] / elapsed
+                if report["workers"]
+                else 1.0,
+                "identical_to_serial": pages == reference,
+            }
+            print(f"workers={workers}", json.dumps(row, indent=2))
+            report["workers"][workers] = row
+
+    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    OUTPUT_FILE.write_text(json.dumps(report, indent=2))
+    print("\nSaved results to:", OUTPUT_FILE)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    run(args.docs, args.pages, args.max_workers)
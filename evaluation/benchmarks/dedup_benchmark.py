@@ -0,0 +1,224 @@
+"""
+Near-duplicate chunk elimination (MinHash/LSH) on a synthetic
+encyclopedia-like corpus.
+
+Pages mix unique paragraphs with repeated boilerplate: "Resources"
+reference blocks and cross-reference blurbs drawn from a fixed pool,
+about half of them with one word changed. For each chunker it reports:
+- chunks before/after and the share of text removed
+- index size before/after: FAISS float32 vectors (384-d), BM25
+  postings + impacts, chunk text
+- dedup throughput, and time at growing corpus sizes (linear, not
+  quadratic)
+and, on the first EXACT_SAMPLE semantic chunks, precision/recall of the
+dropped set against exact greedy Jaccard deduplication.
+
+Run:
+    python -m evaluation.benchmarks.dedup_benchmark
+    python -m evaluation.benchmarks.dedup_benchmark --pages 5000
+"""
+
+import argparse
+import json
+import re
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+
+from api.config import settings
+from ingestion.dedup import NearDuplicateFilter
+from ingestion.semantic_splitter import SemanticChunker
+from ingestion.splitter import SimpleChunker
+from rag.bm25_store import BM25Store
+from rag.chunking.sliding_window_chunker import SlidingWindowChunker
+
+
+OUTPUT_FILE = Path("evaluation/benchmarks/results/dedup_benchmark.json")
+
+SEED = 17
+DIM = 384
+EXACT_SAMPLE = 3000
+BOILERPLATE_TEMPLATES = 300
+XREF_TEMPLATES = 50
+
+
+def synthetic_pages(n_pages: int):
+    rng = np.random.default_rng(SEED)
+    vocab = [f"term{i}" for i in range(20000)]
+    refs = [f"author{i}" for i in range(2000)]
+
+    def sentence(words=(8, 25)):
+        return " ".join(rng.choice(vocab, rng.integers(*words))) + "."
+
+    resources = [
+        "Resources\n" + "\n".join(
+            " ".join(rng.choice(refs, 6)) + f" Journal {rng.integers(1, 99)} ({rng.integers(1980, 2004)})."
+            for _ in range(rng.integers(4, 9))
+        )
+        for _ in range(BOILERPLATE_TEMPLATES)
+    ]
+    xrefs = [
+        "See also " + " ".join(sentence() for _ in range(3))
+        for _ in range(XREF_TEMPLATES)
+    ]
+
+    def perturb(text):
+        words = text.split(" ")
+        words[rng.integers(len(words))] = str(rng.choice(vocab))
+        return " ".join(words)
+
+    pages = []
+    for page in range(n_pages):
+        blocks = [
+            " ".join(sentence() for _ in range(rng.integers(2, 6)))
+            for _ in range(rng.integers(2, 5))
+        ]
+        for pool, p in ((resources, 0.3), (xrefs, 0.2)):
+            if rng.random() < p:
+                block = pool[rng.integers(len(pool))]
+                blocks.append(perturb(block) if rng.random() < 0.5 else block)
+
+        pages.append({
+            "content": "\n\n".join(blocks),
+            "metadata": {
+                "doc_id": f"doc{page // 500}",
+                "page_number": page % 500 + 1,
+                "source_file": f"doc{page // 500}.pdf",
+            },
+        })
+    return pages
+
+
+def index_size_mb(chunks, workdir: Path):
+    store = BM25Store(str(workdir / "bm25.pkl"))
+    store.build(chunks)
+    index = store.index
+    bm25_bytes = (
+        index.postings.indptr.nbytes
+        + index.postings.indices.nbytes
+        + index.postings.data.nbytes
+        + index.impacts.nbytes
+    )
+    return {
+        "faiss_mb": len(chunks) * DIM * 4 / 1e6,
+        "bm25_mb": bm25_bytes / 1e6,
+        "text_mb": sum(len(c["content"].encode("utf-8")) for c in chunks) / 1e6,
+    }
+
+
+def exact_greedy(chunks, shingle_size, threshold):
+    """Dropped positions under exact Jaccard, same first-kept rule."""
+    word = re.compile(r"\w+")
+    vocab = {}
+    rows, cols = [], []
+    for i, chunk in enumerate(chunks):
+        words = word.findall(chunk["content"].lower())
+        k = min(shingle_size, len(words))
+        shingles = {tuple(words[j:j + k]) for j in range(len(words) - k + 1)}
+        for s in shingles:
+            rows.append(i)
+            cols.append(vocab.setdefault(s, len(vocab)))
+
+    x = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+        shape=(len(chunks), len(vocab)),
+    )
+    sizes = np.asarray(x.sum(axis=1)).ravel()
+    inter = (x @ x.T).tocsr()
+
+    kept, dropped = [], set()
+    kept_mask = np.zeros(len(chunks), dtype=bool)
+    for i in range(len(chunks)):
+        row = inter.getrow(i)
+        j = row.indices
+        union = sizes[i] + sizes[j] - row.data
+        jaccard = row.data / np.maximum(union, 1)
+        if np.any((jaccard >= threshold) & kept_mask[j] & (j < i)):
+            dropped.add(i)
+        else:
+            kept_mask[i] = True
+            kept.append(i)
+    return dropped
+
+
+def run(n_pages: int):
+    pages = synthetic_pages(n_pages)
+    report = {"pages": n_pages, "threshold": settings.DEDUP_THRESHOLD, "chunkers": {}}
+
+    chunkers = {
+        "semantic": SemanticChunker(max_chars=settings.MAX_CHARS, min_chars=settings.MIN_CHARS),
+        "sliding_window": SlidingWindowChunker(),
+        "simple": SimpleChunker(),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, chunker in chunkers.items():
+            chunks = chunker.split_pages(pages)
+            dedup = NearDuplicateFilter(
+                threshold=settings.DEDUP_THRESHOLD, num_perm=settings.DEDUP_NUM_PERM
+            )
+
+            start = time.perf_counter()
+            kept = list(dedup.filter(chunks))
+            dedup_s = time.perf_counter() - start
+
+            before = index_size_mb(chunks, Path(tmp))
+            after = index_size_mb(kept, Path(tmp))
+
+            row = {
+                **dedup.summary(),
+                "dedup_s": dedup_s,
+                "chunks_per_sec": len(chunks) / dedup_s,
+                "size_before": before,
+                "size_after": after,
+                "size_reduction_pct": {
+                    key: 100 * (1 - after[key] / before[key]) for key in before
+                },
+            }
+            print(name, json.dumps(row, indent=2))
+            report["chunkers"][name] = row
+
+    # Scaling: time per corpus size on the semantic chunks
+    chunks = chunkers["semantic"].split_pages(pages)
+    report["scaling"] = {}
+    size = 5000
+    while size <= len(chunks):
+        dedup = NearDuplicateFilter(settings.DEDUP_THRESHOLD, settings.DEDUP_NUM_PERM)
+        start = time.perf_counter()
+        for _ in dedup.filter(chunks[:size]):
+            pass
+        report["scaling"][size] = time.perf_counter() - start
+        size *= 2
+    print("scaling", json.dumps(report["scaling"], indent=2))
+
+    # Accuracy against exact Jaccard on a sample
+    sample = chunks[:EXACT_SAMPLE]
+    dedup = NearDuplicateFilter(settings.DEDUP_THRESHOLD, settings.DEDUP_NUM_PERM)
+    kept_ids = {c["chunk_id"] for c in dedup.filter(sample)}
+    lsh_dropped = {i for i, c in enumerate(sample) if c["chunk_id"] not in kept_ids}
+    exact_dropped = exact_greedy(sample, dedup.shingle_size, settings.DEDUP_THRESHOLD)
+
+    hits = len(lsh_dropped & exact_dropped)
+    report["accuracy"] = {
+        "sample": len(sample),
+        "exact_duplicates": len(exact_dropped),
+        "lsh_duplicates": len(lsh_dropped),
+        "precision": hits / max(len(lsh_dropped), 1),
+        "recall": hits / max(len(exact_dropped), 1),
+    }
+    print("accuracy", json.dumps(report["accuracy"], indent=2))
+
+    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    OUTPUT_FILE.write_text(json.dumps(report, indent=2))
+    print("\nSaved results to:", OUTPUT_FILE)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=20000)
+    args = parser.parse_args()
+
+    run(args.pages)
@@ -0,0 +1,178 @@
+"""
+Index-build embedding throughput: fixed batches of 32 vs length-bucketed,
+token-budget batches (EMBED_BATCH_TOKENS).
+
+Chunks are embedded in INDEX_BATCH_SIZE groups through
+`EmbeddingService.embed_texts`, as `index_manager.embed_chunks` does.
+Per setting: seconds, chunks/sec, and padding efficiency (real tokens /
+padded tokens across all forward passes); plus the largest difference
+from the fixed-batch vectors for the same chunk.
+
+Chunks come from `--chunks` (a JSONL of {"content": ...}, e.g. the GALE
+chunks written by evaluation/gale/scripts/01_extract_chunks.py) when it
+exists; otherwise synthetic chunks of GALE evaluation vocabulary with
+log-normal lengths.
+
+`--random-model` embeds with a randomly initialized model of the
+default model's shape (6-layer BERT, 384 hidden, 12 heads, 256 max
+tokens, mean pooling) and a WordPiece vocabulary trained on the chunks:
+the same compute per token as all-MiniLM-L6-v2, no download needed.
+
+Run:
+    python -m evaluation.benchmarks.embed_batching_benchmark
+    python -m evaluation.benchmarks.embed_batching_benchmark --random-model
+"""
+
+import argparse
+import json
+import re
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+
+from api.config import settings
+from rag.embedder import EmbeddingService
+from evaluation.benchmarks.faiss_ann_tuning import EVAL_FILE, load_json_robust
+
+
+OUTPUT_FILE = Path("evaluation/benchmarks/results/embed_batching_benchmark.json")
+GALE_CHUNKS = Path("evaluation/gale/data/chunks.jsonl")
+
+SEED = 31
+BUDGETS = [0, 2048, 4096, 8192, 16384]
+
+
+def synthetic_chunks(n_chunks: int):
+    rng = np.random.default_rng(SEED)
+    words = sorted({
+        w
+        for item in load_json_robust(EVAL_FILE)
+        for field in ("question", "answer_span")
+        for w in re.findall(r"[A-Za-z]+", item.get(field, ""))
+    })
+    vocab = np.array(words)
+
+    lengths = np.clip(rng.lognormal(np.log(120), 0.7, n_chunks), 5, 400).astype(int)
+    return [" ".join(rng.choice(vocab, n)) + "." for n in lengths]
+
+
+def random_minilm(texts, workdir: Path):
+    from tokenizers import BertWordPieceTokenizer
+    from transformers import BertConfig, BertModel, BertTokenizerFast
+    from sentence_transformers import SentenceTransformer, models
+
+    wordpiece = BertWordPieceTokenizer(lowercase=True)
+    wordpiece.train_from_iterator(texts, vocab_size=30522)
+    wordpiece.save_model(str(workdir))
+    tokenizer = BertTokenizerFast(vocab_file=str(workdir / "vocab.txt"))
+
+    config = BertConfig(
+        vocab_size=tokenizer.vocab_size,
+        hidden_size=384,
+        num_hidden_layers=6,
+        num_attention_heads=12,
+        intermediate_size=1536,
+    )
+    torch.manual_seed(SEED)
+    BertModel(config).save_pretrained(workdir)
+    tokenizer.save_pretrained(workdir)
+
+    transformer = models.Transformer(str(workdir), max_seq_length=256)
+    pooling = models.Pooling(transformer.get_word_embedding_dimension(), "mean")
+    return SentenceTransformer(modules=[transformer, pooling], device="cpu")
+
+
+def padding_efficiency(embedder, texts, budget):
+    lengths = np.array([
+        len(ids)
+        for ids in embedder.tokenizer(
+            texts, truncation=True, max_length=embedder.max_seq_length
+        )["input_ids"]
+    ])
+    if budget > 0:
+        batches = embedder.token_batches(texts, budget)
+    else:
+        # SentenceTransformer.encode sorts each call by character length
+        order = np.argsort([-len(t) for t in texts], kind="stable")
+        batches = [order[i : i + 32] for i in range(0, len(order), 32)]
+
+    padded = sum(len(b) * lengths[b].max() for b in batches)
+    return int(lengths.sum()), int(padded), len(batches)
+
+
+def run(texts, embedder_name):
+    embedder = EmbeddingService()
+    group = settings.INDEX_BATCH_SIZE
+
+    report = {
+        "embedder": embedder_name,
+        "chunks": len(texts),
+        "chars_mean": float(np.mean([len(t) for t in texts])),
+        "index_batch_size": group,
+        "budgets": {},
+    }
+    vectors = {}
+
+    # Warm-up: first forward passes allocate
+    embedder.embed_texts(texts[:64])
+
+    for budget in BUDGETS:
+        settings.EMBED_BATCH_TOKENS = budget
+        real = padded = batches = 0
+        parts = []
+
+        start = time.perf_counter()
+        for i in range(0, len(texts), group):
+            parts.append(embedder.embed_texts(texts[i : i + group]).cpu().numpy())
+        elapsed = time.perf_counter() - start
+
+        for i in range(0, len(texts), group):
+            r, p, b = padding_efficiency(embedder, texts[i : i + group], budget)
+            real, padded, batches = real + r, padded + p, batches + b
+
+        vectors[budget] = np.concatenate(parts)
+        row = {
+            "seconds": elapsed,
+            "chunks_per_sec": len(texts) / elapsed,
+            "forward_passes": batches,
+            "real_tokens": real,
+            "padded_tokens": padded,
+            "padding_efficiency": real / padded,
+            "max_abs_diff_vs_fixed": float(np.abs(vectors[budget] - vectors[0]).max()),
+        }
+        if budget:
+            row["speedup"] = report["budgets"][0]["seconds"] / elapsed
+        print(f"EMBED_BATCH_TOKENS={budget}", json.dumps(row, indent=2))
+        report["budgets"][budget] = row
+
+    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    OUTPUT_FILE.write_text(json.dumps(report, indent=2))
+    print("\nSaved results to:", OUTPUT_FILE)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=Path, default=GALE_CHUNKS)
+    parser.add_argument("--synthetic", type=int, default=3000, help="chunks when --chunks is missing")
+    parser.add_argument("--random-model", action="store_true")
+    args = parser.parse_args()
+
+    if args.chunks.exists():
+        with args.chunks.open(encoding="utf-8") as f:
+            texts = [json.loads(line)["content"] for line in f]
+        source = str(args.chunks)
+    else:
+        texts = synthetic_chunks(args.synthetic)
+        source = "synthetic"
+    print("chunks:", source, len(texts))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        name = settings.EMBEDDING_MODEL
+        if args.random_model:
+            EmbeddingService._model = random_minilm(texts, Path(tmp))
+            EmbeddingService._model_name = settings.EMBEDDING_MODEL
+            name = "random-minilm-shape"
+        run(texts, f"{name} ({source})")
@@ -0,0 +1,160 @@
+"""
+Embedding backends on CPU: PyTorch vs ONNX Runtime (float32 and dynamic
+int8), as selected by EMBEDDING_BACKEND / EMBEDDING_ONNX_QUANTIZE.
+
+Per backend, through `EmbeddingService`:
+- bulk throughput: chunks embedded in INDEX_BATCH_SIZE groups, as
+  `index_manager.embed_chunks` does (chunks/sec)
+- query latency: one query per call, query cache bypassed (p50/p99 ms)
+- parity: cosine of every chunk and query vector with the PyTorch one
+  (min and mean); each ONNX variant must stay within its tolerance,
+  otherwise the script exits non-zero
+
+Chunks come from `--chunks` (GALE chunks JSONL) when it exists, else
+synthetic chunks; queries are the GALE evaluation questions.
+`--random-model` uses the randomly initialized model of the default
+model's shape from embed_batching_benchmark (no download needed).
+
+Run:
+    python -m evaluation.benchmarks.embedding_backend_benchmark
+    python -m evaluation.benchmarks.embedding_backend_benchmark --random-model --quantize avx512_vnni
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from api.config import settings
+from rag.embedder import EmbeddingService, ONNX_QUANTIZE_TARGETS
+from evaluation.benchmarks.embed_batching_benchmark import (
+    GALE_CHUNKS,
+    random_minilm,
+    synthetic_chunks,
+)
+from evaluation.benchmarks.faiss_ann_tuning import EVAL_FILE, load_json_robust
+
+
+OUTPUT_FILE = Path("evaluation/benchmarks/results/embedding_backend_benchmark.json")
+
+# Min cosine to the PyTorch vector of the same input
+FP32_TOLERANCE = 0.9999
+INT8_TOLERANCE = 0.99
+
+
+def embed_bulk(embedder, texts):
+    group = settings.INDEX_BATCH_SIZE
+    start = time.perf_counter()
+    vectors = np.concatenate([
+        embedder.embed_texts(texts[i : i + group]).cpu().numpy()
+        for i in range(0, len(texts), group)
+    ])
+    return vectors, time.perf_counter() - start
+
+
+def embed_queries(embedder, queries):
+    vectors, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        vectors.append(embedder.embed_texts([query])[0].cpu().numpy())
+        latencies.append(time.perf_counter() - start)
+    return np.stack(vectors), 1000 * np.array(latencies)
+
+
+def run(texts, queries, quantize, embedder_name):
+    variants = [("torch", ""), ("onnx", ""), ("onnx", quantize)]
+    report = {
+        "embedder": embedder_name,
+        "chunks": len(texts),
+        "queries": len(queries),
+        "index_batch_size": settings.INDEX_BATCH_SIZE,
+        "embed_batch_tokens": settings.EMBED_BATCH_TOKENS,
+        "tolerance": {"fp32": FP32_TOLERANCE, "int8": INT8_TOLERANCE},
+        "backends": {},
+    }
+    reference = None
+    passed = True
+
+    for backend, target in variants:
+        settings.EMBEDDING_BACKEND = backend
+        settings.EMBEDDING_ONNX_QUANTIZE = target
+
+        start = time.perf_counter()
+        embedder = EmbeddingService()  # exports/quantizes on first use
+        load_seconds = time.perf_counter() - start
+        name = EmbeddingService.model_id().rsplit("@", 1)[-1] if backend == "onnx" else backend
+
+        embedder.embed_texts(texts[:64])  # warm-up
+        bulk, seconds = embed_bulk(embedder, texts)
+        query_vectors, latencies = embed_queries(embedder, queries)
+
+        if reference is None:
+            reference = (bulk, query_vectors)
+
+        cosines = np.concatenate([
+            (bulk * reference[0]).sum(axis=1),
+            (query_vectors * reference[1]).sum(axis=1),
+        ])
+        tolerance = INT8_TOLERANCE if target else FP32_TOLERANCE
+        row = {
+            "load_seconds": load_seconds,
+            "bulk_seconds": seconds,
+            "chunks_per_sec": len(texts) / seconds,
+            "query_ms_p50": float(np.percentile(latencies, 50)),
+            "query_ms_p99": float(np.percentile(latencies, 99)),
+            "cosine_min": float(cosines.min()),
+            "cosine_mean": float(cosines.mean()),
+        }
+        if backend == "onnx":
+            row["speedup"] = report["backends"]["torch"]["bulk_seconds"] / seconds
+            row["query_p50_speedup"] = report["backends"]["torch"]["query_ms_p50"] / row["query_ms_p50"]
+            row["within_tolerance"] = row["cosine_min"] >= tolerance
+            passed = passed and row["within_tolerance"]
+
+        print(name, json.dumps(row, indent=2))
+        report["backends"][name] = row
+
+    report["passed"] = passed
+    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    OUTPUT_FILE.write_text(json.dumps(report, indent=2))
+    print("\nSaved results to:", OUTPUT_FILE)
+    return passed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=Path, default=GALE_CHUNKS)
+    parser.add_argument("--synthetic", type=int, default=1500, help="chunks when --chunks is missing")
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--quantize", choices=ONNX_QUANTIZE_TARGETS, default="avx2")
+    parser.add_argument("--random-model", action="store_true")
+    args = parser.parse_args()
+
+    if args.chunks.exists():
+        with args.chunks.open(encoding="utf-8") as f:
+            texts = [json.loads(line)["content"] for line in f]
+        source = str(args.chunks)
+    else:
+        texts = synthetic_chunks(args.synthetic)
+        source = "synthetic"
+    queries = list(dict.fromkeys(item["question"] for item in load_json_robust(EVAL_FILE)))
+    queries = queries[: args.queries]
+    print("chunks:", source, len(texts), "| queries:", len(queries))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Exports go to a scratch directory, not the served EMBEDDING_ONNX_DIR
+        settings.EMBEDDING_ONNX_DIR = str(Path(tmp) / "onnx")
+        name = settings.EMBEDDING_MODEL
+        if args.random_model:
+            model_dir = Path(tmp) / "random-minilm-shape"
+            model_dir.mkdir()
+            random_minilm(texts, model_dir).save_pretrained(str(model_dir / "st"))
+            settings.EMBEDDING_MODEL = str(model_dir / "st")
+            name = "random-minilm-shape"
+        ok = run(texts, queries, args.quantize, f"{name} ({source})")
+
+    sys.exit(0 if ok else 1)
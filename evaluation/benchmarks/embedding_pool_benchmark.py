@@ -0,0 +1,129 @@
+"""
+Bulk embedding throughput (chunks/sec) of `EmbeddingPool` for 1..N
+worker processes.
+
+Chunks are embedded as `index_manager.embed_batches` does during a
+build: INDEX_BATCH_SIZE chunks per worker per call. Each run splits the
+machine's cores between its workers (`--threads` overrides), so
+1 worker x all cores is the baseline. Every run must return the
+baseline's vectors in the same order (largest absolute difference
+reported; batching differs per shard, so not bit for bit).
+
+Worker start-up (spawn + model load) is timed separately; it is paid
+once per build.
+
+`--random-model` uses the randomly initialized model of the default
+model's shape from embed_batching_benchmark (no download needed).
+
+Run:
+    python -m evaluation.benchmarks.embedding_pool_benchmark --random-model
+    python -m evaluation.benchmarks.embedding_pool_benchmark --max-workers 16 --threads 2
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+
+from api.config import settings
+from rag.embedding_pool import EmbeddingPool, MIN_SHARD_TEXTS
+from evaluation.benchmarks.embed_batching_benchmark import (
+    GALE_CHUNKS,
+    random_minilm,
+    synthetic_chunks,
+)
+from evaluation.benchmarks.pdf_extraction_benchmark import worker_counts
+
+
+OUTPUT_FILE = Path("evaluation/benchmarks/results/embedding_pool_benchmark.json")
+
+
+def embed_corpus(pool, texts):
+    group = settings.INDEX_BATCH_SIZE * pool.workers
+    return np.concatenate([
+        pool.embed_texts(texts[i : i + group])
+        for i in range(0, len(texts), group)
+    ])
+
+
+def run(texts, max_workers, threads, embedder_name):
+    cpus = os.cpu_count() or 1
+    report = {
+        "embedder": embedder_name,
+        "chunks": len(texts),
+        "cpus": cpus,
+        "index_batch_size": settings.INDEX_BATCH_SIZE,
+        "workers": {},
+    }
+    reference = None
+
+    for workers in worker_counts(max_workers):
+        worker_threads = threads or max(1, cpus // workers)
+
+        start = time.perf_counter()
+        pool = EmbeddingPool(workers=workers, threads=worker_threads)
+        if pool.pool is None:
+            torch.set_num_threads(worker_threads)
+        # Spawns the workers and loads their models
+        pool.embed_texts(texts[: MIN_SHARD_TEXTS * workers])
+        startup = time.perf_counter() - start
+
+        start = time.perf_counter()
+        vectors = embed_corpus(pool, texts)
+        elapsed = time.perf_counter() - start
+        pool.close()
+
+        if reference is None:
+            reference = vectors
+
+        row = {
+            "threads_per_worker": worker_threads,
+            "startup_seconds": startup,
+            "seconds": elapsed,
+            "chunks_per_sec": len(texts) / elapsed,
+            "speedup": report["workers"][1]["seconds"] / elapsed
+            if report["workers"]
+            else 1.0,
+            "max_abs_diff_vs_single": float(np.abs(vectors - reference).max()),
+        }
+        print(f"workers={workers}", json.dumps(row, indent=2))
+        report["workers"][workers] = row
+
+    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    OUTPUT_FILE.write_text(json.dumps(report, indent=2))
+    print("\nSaved results to:", OUTPUT_FILE)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=Path, default=GALE_CHUNKS)
+    parser.add_argument("--synthetic", type=int, default=1500, help="chunks when --chunks is missing")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--threads", type=int, default=0, help="per worker; 0 = cores / workers")
+    parser.add_argument("--random-model", action="store_true")
+    args = parser.parse_args()
+
+    if args.chunks.exists():
+        with args.chunks.open(encoding="utf-8") as f:
+            texts = [json.loads(line)["content"] for line in f]
+        source = str(args.chunks)
+    else:
+        texts = synthetic_chunks(args.synthetic)
+        source = "synthetic"
+    print("chunks:", source, len(texts))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        name = settings.EMBEDDING_MODEL
+        if args.random_model:
+            # Saved to disk: pool workers load the model by path
+            model_dir = Path(tmp) / "random-minilm-shape"
+            model_dir.mkdir()
+            random_minilm(texts, model_dir).save_pretrained(str(model_dir / "st"))
+            settings.EMBEDDING_MODEL = str(model_dir / "st")
+            name = "random-minilm-shape"
+        run(texts, args.max_workers, args.threads, f"{name} ({source})")
@@ -0,0 +1,181 @@
+"""
+ANN operating-point sweep for FaissStore (IVF-Flat nprobe, HNSW efSearch).
+
+Vectors are taken from the current index (no re-embedding); GALE
+questions are embedded once. For every setting the script reports:
+- recall@5:       gold chunk_id in the top-5 (GALE ground truth)
+- ann_overlap@5:  share of the exact (flat) top-5 that the ANN index returns
+- p50/p95 latency of single-query searches (what the API issues)
+
+Run:
+    python -m evaluation.benchmarks.faiss_ann_tuning
+    python -m evaluation.benchmarks.faiss_ann_tuning --apply-nprobe 16
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import faiss
+import numpy as np
+
+from ingestion.corpus import load_corpus
+from rag.embedder import EmbeddingService
+from rag.faiss_store import FaissStore
+from rag.index_manager import build_or_load_index, save_search_params
+
+
+EVAL_FILE = Path("evaluation/gale/evaluation_gale_final.json")
+OUTPUT_FILE = Path("evaluation/benchmarks/results/faiss_ann_tuning.json")
+
+TOP_K = 5
+NPROBES = [1, 2, 4, 8, 16, 32, 64, 128]
+EF_SEARCHES = [16, 32, 64, 128, 256, 512]
+
+
+# -------------------------------------------------
+# LOAD FILES SAFELY WITHOUT CRASHING
+# -------------------------------------------------
+def load_json_robust(path: Path):
+    raw = path.read_bytes()
+    try:
+        return json.loads(raw.decode("utf-8"))
+    except UnicodeDecodeError:
+        return json.loads(raw.decode("cp1252"))
+
+
+def live_ids(index) -> np.ndarray:
+    """Row ids held by `index`; not 0..ntotal-1 once documents were removed."""
+    if isinstance(index, faiss.IndexIDMap):
+        ids = faiss.vector_to_array(index.id_map)
+    elif isinstance(index, faiss.IndexIVF):
+        lists = index.invlists
+        ids = np.concatenate([
+            faiss.rev_swig_ptr(lists.get_ids(i), lists.list_size(i)).copy()
+            for i in range(index.nlist)
+        ])
+    else:
+        # Saved before id mapping: ids are positions
+        ids = np.arange(index.ntotal)
+    return np.sort(ids)
+
+
+def extract_vectors(store: FaissStore):
+    """(row ids, vectors) of the live rows, fetched by id."""
+    index = store.index
+    ids = live_ids(index)
+
+    if store.vectors is not None:
+        # Codec indexes reconstruct lossily; the float16 copy is row = id
+        return ids, np.asarray(store.vectors[ids], dtype="float32")
+
+    if isinstance(index, faiss.IndexIVF):
+        index.set_direct_map_type(faiss.DirectMap.Hashtable)
+    return ids, index.reconstruct_batch(ids)
+
+
+def build_variant(index_type: str, vectors, metadata, **params) -> FaissStore:
+    store = FaissStore(
+        "unused.index",
+        "unused.pkl",
+        dimension=vectors.shape[1],
+        index_type=index_type,
+        **params,
+    )
+    store.add_chunks(vectors, metadata)
+    return store
+
+
+def measure(store: FaissStore, queries, gold_ids, exact_top):
+    latencies = []
+    hits = 0
+    overlap = 0.0
+
+    for i, q in enumerate(queries):
+        start = time.perf_counter()
+        _, idx = store.search(q[None, :], TOP_K)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        ids = [store.metadata[j]["chunk_id"] for j in idx[0] if j != -1]
+        hits += gold_ids[i] in ids
+        overlap += len(set(idx[0]) & set(exact_top[i])) / TOP_K
+
+    arr = np.asarray(latencies)
+    return {
+        "recall@5": hits / len(queries),
+        "ann_overlap@5": overlap / len(queries),
+        "p50_ms": float(np.percentile(arr, 50)),
+        "p95_ms": float(np.percentile(arr, 95)),
+    }
+
+
+def run(nlist: int, hnsw_m: int):
+    # Loaded here, not at import: other benchmarks import this module
+    faiss_store, _ = build_or_load_index(load_corpus())
+    ids, vectors = extract_vectors(faiss_store)
+    # Variants number the live rows 0..n-1; metadata follows the real ids
+    metadata = [faiss_store.metadata[int(i)] for i in ids]
+
+    data = load_json_robust(EVAL_FILE)
+    embedder = EmbeddingService()
+    queries = (
+        embedder.embed_texts([item["question"] for item in data])
+        .cpu()
+        .numpy()
+        .astype("float32")
+    )
+    gold_ids = [item["chunk_id"] for item in data]
+
+    flat = build_variant("flat", vectors, metadata)
+    _, exact_top = flat.search(queries, TOP_K)
+
+    report = {"flat": measure(flat, queries, gold_ids, exact_top)}
+    print("flat", report["flat"])
+
+    ivf = build_variant("ivf_flat", vectors, metadata, nlist=nlist)
+    report["ivf_flat"] = {"nlist": ivf.nlist, "sweep": {}}
+    for nprobe in NPROBES:
+        if nprobe > ivf.nlist:
+            break
+        ivf.set_search_params(nprobe=nprobe)
+        row = measure(ivf, queries, gold_ids, exact_top)
+        report["ivf_flat"]["sweep"][nprobe] = row
+        print(f"ivf_flat nprobe={nprobe}", row)
+
+    hnsw = build_variant("hnsw", vectors, metadata, hnsw_m=hnsw_m)
+    report["hnsw"] = {"hnsw_m": hnsw_m, "sweep": {}}
+    for ef in EF_SEARCHES:
+        hnsw.set_search_params(ef_search=ef)
+        row = measure(hnsw, queries, gold_ids, exact_top)
+        report["hnsw"]["sweep"][ef] = row
+        print(f"hnsw efSearch={ef}", row)
+
+    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    OUTPUT_FILE.write_text(json.dumps(report, indent=2))
+    print("\nSaved results to:", OUTPUT_FILE)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nlist", type=int, default=0, help="0 = auto")
+    parser.add_argument("--hnsw-m", type=int, default=32)
+    parser.add_argument(
+        "--apply-nprobe",
+        type=int,
+        help="persist nprobe for the live index instead of sweeping",
+    )
+    parser.add_argument(
+        "--apply-ef-search",
+        type=int,
+        help="persist efSearch for the live index instead of sweeping",
+    )
+    args = parser.parse_args()
+
+    if args.apply_nprobe is not None or args.apply_ef_search is not None:
+        save_search_params(
+            nprobe=args.apply_nprobe,
+            ef_search=args.apply_ef_search,
+        )
+    else:
+        run(args.nlist, args.hnsw_m)
@@ -0,0 +1,159 @@
+"""
+Compressed vector storage (SQ8 / PQ) vs float32, with exact re-scoring.
+
+Every codec is built from the vectors of the current index and searched
+through `FaissStore.search`, so compressed variants re-score their
+candidates against the float16 copy exactly as the API does. Reported per
+variant:
+- bytes_per_vector / index_mb:  in-RAM size of the FAISS index
+- rescoring_mb:                 float16 copy (memory-mapped, on disk)
+- recall@5 and its drop vs float32 flat, checked against
+  FAISS_RECALL_TOLERANCE
+- p50/p95 latency of single-query searches
+
+Run:
+    python -m evaluation.benchmarks.faiss_codec_benchmark
+    python -m evaluation.benchmarks.faiss_codec_benchmark --rerank-factor 8
+"""
+
+import argparse
+import json
+import tempfile
+from pathlib import Path
+
+import faiss
+import numpy as np
+
+from api.config import settings
+from rag.embedder import EmbeddingService
+from rag.faiss_store import FaissStore
+from rag.index_manager import build_or_load_index
+from evaluation.benchmarks.faiss_ann_tuning import (
+    PDFS,
+    EVAL_FILE,
+    TOP_K,
+    load_json_robust,
+    extract_vectors,
+    measure,
+)
+
+
+OUTPUT_FILE = Path("evaluation/benchmarks/results/faiss_codec_benchmark.json")
+
+VARIANTS = [
+    ("flat", "none"),
+    ("flat", "sq8"),
+    ("flat", "pq"),
+    ("ivf_flat", "sq8"),
+    ("ivf_flat", "pq"),
+    ("hnsw", "sq8"),
+    ("hnsw", "pq"),
+]
+
+
+def build_variant(workdir: Path, index_type, codec, vectors, metadata, **params):
+    name = f"{index_type}_{codec}"
+    store = FaissStore(
+        workdir / f"{name}.index",
+        workdir / f"{name}.pkl",
+        dimension=vectors.shape[1],
+        index_type=index_type,
+        codec=codec,
+        **params,
+    )
+    store.add_chunks(vectors, metadata)
+    store.save()
+
+    # Reload so re-scoring reads the memory-mapped copy, as in production
+    loaded = FaissStore(store.index_path, store.metadata_path)
+    loaded.rerank_factor = store.rerank_factor
+    loaded.load()
+    return loaded
+
+
+def size_report(store: FaissStore):
+    row = {
+        "bytes_per_vector": store.bytes_per_vector(),
+        "index_mb": len(faiss.serialize_index(store.index)) / 1e6,
+    }
+    if store.vectors is not None:
+        row["rescoring_mb"] = store.vectors_path.stat().st_size / 1e6
+    return row
+
+
+def run(rerank_factor: int, pq_m: int):
+    faiss_store, _ = build_or_load_index(PDFS)
+
+    if faiss_store.vectors is not None:
+        vectors = np.asarray(faiss_store.vectors, dtype="float32")
+    else:
+        vectors = extract_vectors(faiss_store.index)
+    metadata = faiss_store.metadata
+
+    data = load_json_robust(EVAL_FILE)
+    embedder = EmbeddingService()
+    queries = (
+        embedder.embed_texts([item["question"] for item in data])
+        .cpu()
+        .numpy()
+        .astype("float32")
+    )
+    gold_ids = [item["chunk_id"] for item in data]
+
+    report = {
+        "vectors": len(vectors),
+        "dim": int(vectors.shape[1]),
+        "rerank_factor": rerank_factor,
+        "recall_tolerance": settings.FAISS_RECALL_TOLERANCE,
+        "variants": {},
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        baseline = None
+        exact_top = None
+
+        for index_type, codec in VARIANTS:
+            store = build_variant(
+                workdir,
+                index_type,
+                codec,
+                vectors,
+                metadata,
+                pq_m=pq_m,
+                rerank_factor=rerank_factor,
+            )
+
+            if exact_top is None:
+                _, exact_top = store.search(queries, TOP_K)
+
+            row = size_report(store)
+            row.update(measure(store, queries, gold_ids, exact_top))
+
+            if baseline is None:
+                baseline = row["recall@5"]
+            row["recall_drop"] = baseline - row["recall@5"]
+            row["within_tolerance"] = (
+                row["recall_drop"] <= settings.FAISS_RECALL_TOLERANCE
+            )
+
+            name = f"{index_type}/{codec}"
+            print(name, json.dumps(row, indent=2))
+            report["variants"][name] = row
+
+    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    OUTPUT_FILE.write_text(json.dumps(report, indent=2))
+    print("\nSaved results to:", OUTPUT_FILE)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--rerank-factor",
+        type=int,
+        default=settings.FAISS_RERANK_FACTOR,
+    )
+    parser.add_argument("--pq-m", type=int, default=0, help="0 = auto")
+    args = parser.parse_args()
+
+    run(args.rerank_factor, args.pq_m)
@@ -0,0 +1,124 @@
+"""
+Startup cost of corpus fingerprinting with and without the file manifest.
+
+Writes a synthetic corpus (default 5 GB across 50 files) to a temp
+directory and times `file_hashes` for:
+- full:        manifest off, SHA-256 of every byte (previous behaviour)
+- cold:        empty manifest, first run hashes and records everything
+- warm:        manifest hit, one stat per file
+- touched:     every mtime bumped, contents unchanged
+               (xxh3 check with `xxhash`, else full SHA-256)
+- one_changed: one file rewritten, the rest hits
+
+Every run must return the same hashes as `full` (except `one_changed`,
+which must differ in exactly one file).
+
+Run:
+    python -m evaluation.benchmarks.fingerprint_benchmark
+    python -m evaluation.benchmarks.fingerprint_benchmark --gb 1 --files 10
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from api.config import settings
+from ingestion import file_manifest
+from ingestion.file_manifest import file_hashes
+
+
+OUTPUT_FILE = Path("evaluation/benchmarks/results/fingerprint_benchmark.json")
+
+BLOCK = 64 << 20
+
+
+def write_corpus(root: Path, total_bytes: int, n_files: int):
+    """Files of pseudo-random bytes; each starts with its own index."""
+    block = os.urandom(BLOCK)
+    size = total_bytes // n_files
+    paths = []
+
+    for i in range(n_files):
+        path = root / f"doc_{i:04d}.pdf"
+        with open(path, "wb") as f:
+            f.write(i.to_bytes(8, "little"))
+            remaining = size - 8
+            while remaining > 0:
+                f.write(block[: min(BLOCK, remaining)])
+                remaining -= BLOCK
+        paths.append(str(path))
+
+    # Old mtimes, so no entry falls in the racy window
+    past = time.time() - 3600
+    for path in paths:
+        os.utime(path, (past, past))
+    return paths
+
+
+def timed_hashes(paths):
+    file_manifest._manifest = None  # simulate a fresh process
+    start = time.perf_counter()
+    hashes = file_hashes(paths)
+    elapsed = time.perf_counter() - start
+    return hashes, elapsed, dict(file_manifest.get_manifest().stats)
+
+
+def run(root: Path, total_gb: float, n_files: int):
+    paths = write_corpus(root, int(total_gb * 1e9), n_files)
+    settings.FILE_MANIFEST_PATH = str(root / "file_manifest.json")
+
+    report = {
+        "corpus_gb": total_gb,
+        "files": n_files,
+        "xxhash_available": file_manifest.xxhash is not None,
+        "runs": {},
+    }
+
+    settings.FILE_MANIFEST_ENABLED = False
+    start = time.perf_counter()
+    reference = file_hashes(paths)
+    report["runs"]["full"] = {"seconds": time.perf_counter() - start}
+    settings.FILE_MANIFEST_ENABLED = True
+
+    def record(name, hashes, elapsed, stats, expect_changed=0):
+        changed = sum(hashes[p] != reference[p] for p in paths)
+        row = {
+            "seconds": elapsed,
+            "speedup_vs_full": report["runs"]["full"]["seconds"] / elapsed,
+            "stats": stats,
+            "correct": changed == expect_changed,
+        }
+        print(name, json.dumps(row))
+        report["runs"][name] = row
+
+    record("cold", *timed_hashes(paths))
+    record("warm", *timed_hashes(paths))
+
+    now = time.time() - 60
+    for path in paths:
+        os.utime(path, (now, now))
+    record("touched", *timed_hashes(paths))
+
+    with open(paths[0], "r+b") as f:
+        f.write(b"\xff" * 8)
+    # An edit moves the mtime (restoring it too would hide the change)
+    os.utime(paths[0], (now + 30, now + 30))
+    record("one_changed", *timed_hashes(paths), expect_changed=1)
+
+    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    OUTPUT_FILE.write_text(json.dumps(report, indent=2))
+    print("\nSaved results to:", OUTPUT_FILE)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--gb", type=float, default=5.0)
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--dir", default=None, help="where to write the corpus")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        run(Path(tmp), args.gb, args.files)
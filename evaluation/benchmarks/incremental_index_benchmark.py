@@ -0,0 +1,188 @@
+"""
+Index update cost: full rebuild vs incremental, one PDF at a time.
+
+Starts from a saved 50-document index (synthetic chunks and vectors, so
+the model is not needed) and applies three corpus changes:
+- add:      one new document
+- replace:  one existing document with a new version
+- remove:   one document
+
+Each change is applied twice, from the same starting index:
+- rebuild:      chunk store + FAISS + BM25 written from scratch
+- incremental:  stores loaded, rows removed / appended, saved
+
+Index work only; embedding is reported as the number of chunks each
+strategy has to embed (rebuild: the whole corpus minus embedding cache
+hits; incremental: the changed document).
+
+Run:
+    python -m evaluation.benchmarks.incremental_index_benchmark
+    python -m evaluation.benchmarks.incremental_index_benchmark --chunks-per-doc 400
+"""
+
+import argparse
+import json
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from evaluation.benchmarks.bm25_benchmark import make_vocab, make_chunks, SEED
+from evaluation.benchmarks.index_mmap_benchmark import SYNTHETIC_DIM
+
+
+OUTPUT_FILE = Path("evaluation/benchmarks/results/incremental_index_benchmark.json")
+
+N_DOCS = 50
+INDEX_TYPES = ["flat", "ivf_flat", "hnsw"]
+
+
+def make_corpus(rng, vocab, n_docs: int, chunks_per_doc: int):
+    docs = []
+    for d in range(n_docs + 2):
+        chunks = make_chunks(rng, vocab, chunks_per_doc)
+        for c in chunks:
+            c["chunk_id"] = f"doc{d}_{c['chunk_id']}"
+
+        vectors = rng.standard_normal((chunks_per_doc, SYNTHETIC_DIM))
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        docs.append((chunks, vectors.astype("float32")))
+    return docs
+
+
+def stores(workdir: Path, index_type: str, chunk_store, dimension=None):
+    from rag.faiss_store import FaissStore
+    from rag.bm25_store import BM25Store
+
+    faiss_store = FaissStore(
+        workdir / "faiss.index",
+        workdir / "faiss_meta.pkl",
+        dimension=dimension,
+        index_type=index_type,
+        chunk_store=chunk_store,
+    )
+    bm25_store = BM25Store(workdir / "bm25.pkl", chunk_store=chunk_store)
+    return faiss_store, bm25_store
+
+
+def rebuild(workdir: Path, index_type: str, docs):
+    from rag.chunk_store import ChunkStore
+
+    chunks = [c for doc_chunks, _ in docs for c in doc_chunks]
+    vectors = np.concatenate([v for _, v in docs])
+
+    chunk_store = ChunkStore.write(workdir / "chunks", chunks).open()
+    faiss_store, bm25_store = stores(
+        workdir, index_type, chunk_store, dimension=vectors.shape[1]
+    )
+
+    faiss_store.add_chunks(vectors, chunks)
+    faiss_store.save()
+    bm25_store.build(chunks)
+    bm25_store.save()
+
+    chunk_store.close()
+
+
+def incremental(workdir: Path, index_type: str, dead_rows, new_doc):
+    from rag.chunk_store import ChunkStore
+
+    chunk_store = ChunkStore(workdir / "chunks").open()
+    faiss_store, bm25_store = stores(workdir, index_type, chunk_store)
+    faiss_store.load()
+    bm25_store.load()
+
+    if len(dead_rows):
+        faiss_store.remove_ids(dead_rows)
+        bm25_store.remove_documents(dead_rows)
+
+    if new_doc is not None:
+        chunks, vectors = new_doc
+        rows = chunk_store.append(chunks)
+        faiss_store.add_chunks(
+            vectors, chunks, ids=np.arange(rows.start, rows.stop)
+        )
+        bm25_store.add_documents(chunks)
+
+    faiss_store.save()
+    bm25_store.save()
+
+    chunk_store.close()
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def run(chunks_per_doc: int):
+    rng = np.random.default_rng(SEED)
+    docs = make_corpus(rng, make_vocab(50_000), N_DOCS, chunks_per_doc)
+    base, extra, new_version = docs[:N_DOCS], docs[N_DOCS], docs[N_DOCS + 1]
+
+    target = N_DOCS // 2
+    target_rows = np.arange(target * chunks_per_doc, (target + 1) * chunks_per_doc)
+
+    changes = {
+        "add": (base + [extra], [], extra),
+        "replace": (
+            base[:target] + base[target + 1 :] + [new_version],
+            target_rows,
+            new_version,
+        ),
+        "remove": (base[:target] + base[target + 1 :], target_rows, None),
+    }
+
+    report = {
+        "documents": N_DOCS,
+        "chunks_per_doc": chunks_per_doc,
+        "dim": SYNTHETIC_DIM,
+        "results": {},
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        seed_dir = Path(tmp) / "seed"
+        work_dir = Path(tmp) / "work"
+
+        for index_type in INDEX_TYPES:
+            seed_dir.mkdir()
+            rebuild(seed_dir, index_type, base)
+
+            report["results"][index_type] = {}
+            for change, (corpus, dead_rows, new_doc) in changes.items():
+                work_dir.mkdir()
+                rebuild_s = timed(rebuild, work_dir, index_type, corpus)
+                shutil.rmtree(work_dir)
+
+                shutil.copytree(seed_dir, work_dir)
+                incremental_s = timed(
+                    incremental, work_dir, index_type, dead_rows, new_doc
+                )
+                shutil.rmtree(work_dir)
+
+                row = {
+                    "rebuild_s": rebuild_s,
+                    "incremental_s": incremental_s,
+                    "speedup": rebuild_s / incremental_s,
+                    "chunks_embedded_rebuild": len(corpus) * chunks_per_doc,
+                    "chunks_embedded_incremental": 0 if new_doc is None else chunks_per_doc,
+                }
+                print(index_type, change, json.dumps(row, indent=2))
+                report["results"][index_type][change] = row
+
+            shutil.rmtree(seed_dir)
+
+    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    OUTPUT_FILE.write_text(json.dumps(report, indent=2))
+    print("\nSaved results to:", OUTPUT_FILE)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks-per-doc", type=int, default=200)
+    args = parser.parse_args()
+
+    run(args.chunks_per_doc)
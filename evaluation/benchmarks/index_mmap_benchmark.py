@@ -0,0 +1,196 @@
+"""
+Per-worker memory and cold start: copied vs memory-mapped index loading.
+
+Starts N worker processes at once (as `uvicorn --workers N` does), each
+loading FaissStore + BM25Store and running a few searches so the pages a
+real worker touches are resident. Workers stay alive until all have
+reported, so shared pages are counted while actually shared.
+
+Reported per (mode, workers):
+- cold_start_s:  spawn to last worker ready (imports + load + warmup)
+- load_s:        mean time inside FaissStore.load + BM25Store.load
+- rss_mb:        mean resident set per worker (counts shared pages fully)
+- pss_mb:        mean proportional set (shared pages split across sharers)
+- uss_mb:        mean private memory per worker
+- total_pss_mb:  what N workers really cost the machine
+
+Page cache is warm after the first run; numbers are steady-state
+restarts, not first boot after a reboot.
+
+Run:
+    python -m evaluation.benchmarks.index_mmap_benchmark
+    python -m evaluation.benchmarks.index_mmap_benchmark --synthetic 200000
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+
+OUTPUT_FILE = Path("evaluation/benchmarks/results/index_mmap_benchmark.json")
+
+WORKER_COUNTS = [1, 4, 8]
+WARMUP_QUERIES = 20
+SYNTHETIC_DIM = 384
+
+
+def memory_mb():
+    fields = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1]) / 1024
+
+    return {
+        "rss_mb": fields["Rss"],
+        "pss_mb": fields["Pss"],
+        "uss_mb": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def worker(paths, mmap, ready, done, results):
+    from rag.faiss_store import FaissStore
+    from rag.bm25_store import BM25Store
+
+    start = time.perf_counter()
+
+    faiss_store = FaissStore(paths["faiss_index"], paths["faiss_meta"], mmap=mmap)
+    faiss_store.load()
+    bm25_store = BM25Store(paths["bm25"], mmap=mmap)
+    bm25_store.load()
+
+    load_s = time.perf_counter() - start
+
+    rng = np.random.default_rng(0)
+    queries = rng.standard_normal((WARMUP_QUERIES, faiss_store.dim))
+    queries = (queries / np.linalg.norm(queries, axis=1, keepdims=True)).astype(
+        "float32"
+    )
+    for q in queries:
+        _, idx = faiss_store.search(q[None, :], 5)
+        [faiss_store.metadata[i] for i in idx[0] if i != -1]
+
+    for c in faiss_store.metadata[:WARMUP_QUERIES]:
+        bm25_store.search(c["content"][:200], 5)
+
+    row = {"load_s": load_s, "ready_at": time.time()}
+    ready.put(row)
+
+    # Measure only once every worker is up, so sharing is real
+    done.wait()
+    row.update(memory_mb())
+    results.put(row)
+
+
+def run_workers(paths, n_workers: int, mmap: bool):
+    ctx = mp.get_context("spawn")
+    ready, results = ctx.Queue(), ctx.Queue()
+    done = ctx.Event()
+
+    spawned_at = time.time()
+    procs = [
+        ctx.Process(target=worker, args=(paths, mmap, ready, done, results))
+        for _ in range(n_workers)
+    ]
+    for p in procs:
+        p.start()
+
+    boot = [ready.get() for _ in procs]
+    done.set()
+    rows = [results.get() for _ in procs]
+
+    for p in procs:
+        p.join()
+
+    def mean(key):
+        return float(np.mean([r[key] for r in rows]))
+
+    return {
+        "cold_start_s": max(r["ready_at"] for r in boot) - spawned_at,
+        "load_s": mean("load_s"),
+        "rss_mb": mean("rss_mb"),
+        "pss_mb": mean("pss_mb"),
+        "uss_mb": mean("uss_mb"),
+        "total_pss_mb": float(sum(r["pss_mb"] for r in rows)),
+    }
+
+
+def build_synthetic(workdir: Path, n_chunks: int):
+    from rag.faiss_store import FaissStore
+    from rag.bm25_store import BM25Store
+    from evaluation.benchmarks.bm25_benchmark import make_vocab, make_chunks, SEED
+
+    rng = np.random.default_rng(SEED)
+    chunks = make_chunks(rng, make_vocab(50_000), n_chunks)
+
+    vectors = rng.standard_normal((n_chunks, SYNTHETIC_DIM)).astype("float32")
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    paths = {
+        "faiss_index": str(workdir / "faiss.index"),
+        "faiss_meta": str(workdir / "faiss_meta.pkl"),
+        "bm25": str(workdir / "bm25.pkl"),
+    }
+
+    faiss_store = FaissStore(paths["faiss_index"], paths["faiss_meta"])
+    faiss_store.add_chunks(vectors, chunks)
+    faiss_store.save()
+
+    bm25_store = BM25Store(paths["bm25"])
+    bm25_store.build(chunks)
+    bm25_store.save()
+
+    return paths
+
+
+def live_paths():
+    from rag.index_manager import FAISS_INDEX, FAISS_META, BM25_INDEX
+
+    if not FAISS_INDEX.exists() or not BM25_INDEX.exists():
+        raise SystemExit("No live index; build it first or pass --synthetic N")
+
+    return {
+        "faiss_index": str(FAISS_INDEX),
+        "faiss_meta": str(FAISS_META),
+        "bm25": str(BM25_INDEX),
+    }
+
+
+def run(synthetic: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        if synthetic:
+            paths = build_synthetic(Path(tmp), synthetic)
+            report = {"corpus": f"synthetic-{synthetic}"}
+        else:
+            paths = live_paths()
+            report = {"corpus": "live index"}
+
+        for mode, mmap in (("copy", False), ("mmap", True)):
+            report[mode] = {}
+            for n in WORKER_COUNTS:
+                row = run_workers(paths, n, mmap)
+                print(mode, f"workers={n}", json.dumps(row, indent=2))
+                report[mode][n] = row
+
+    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    OUTPUT_FILE.write_text(json.dumps(report, indent=2))
+    print("\nSaved results to:", OUTPUT_FILE)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        default=0,
+        help="build a synthetic index with N chunks instead of the live one",
+    )
+    args = parser.parse_args()
+
+    run(args.synthetic)
@@ -0,0 +1,99 @@
+"""
+Re-chunking cost with and without the page-text cache.
+
+For one PDF, times:
+- extract:  `load_pdf` with the cache off (a full pypdf pass)
+- cached:   `load_pdf` reading the cache entry written by a first pass
+- chunk:    SemanticChunker over the pages, per MAX_CHARS setting
+
+and reports the cache entry size against the raw page text. The cache
+lives in a temp directory, so the run does not touch PAGE_CACHE_DIR.
+
+Run:
+    python -m evaluation.benchmarks.page_cache_benchmark
+    python -m evaluation.benchmarks.page_cache_benchmark --synthetic 600
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from api.config import settings
+from ingestion.loader import load_pdf
+from ingestion.page_cache import PageCache
+from ingestion.semantic_splitter import SemanticChunker
+from evaluation.benchmarks.pdf_extraction_benchmark import PDF, write_synthetic_pdf
+
+
+OUTPUT_FILE = Path("evaluation/benchmarks/results/page_cache_benchmark.json")
+
+MAX_CHARS = [600, 1000, 1800]
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def run(pdf: str, cache_dir: Path):
+    settings.PAGE_CACHE_DIR = str(cache_dir)
+
+    pages, extract_s = timed(load_pdf, pdf, workers=1, cache=False)
+
+    # First cached pass writes the entry; the second one reads it
+    load_pdf(pdf, workers=1, cache=True)
+    cached_pages, cached_s = timed(load_pdf, pdf, workers=1, cache=True)
+
+    doc_id = pages[0]["metadata"]["doc_id"]
+    entry = PageCache(cache_dir).path(doc_id)
+
+    report = {
+        "pdf": Path(pdf).name,
+        "pages_with_text": len(pages),
+        "identical": cached_pages == pages,
+        "extract_s": extract_s,
+        "cached_s": cached_s,
+        "speedup": extract_s / cached_s,
+        "text_mb": sum(len(p["content"].encode("utf-8")) for p in pages) / 1e6,
+        "cache_mb": entry.stat().st_size / 1e6,
+        "rechunk": {},
+    }
+
+    for max_chars in MAX_CHARS:
+        chunker = SemanticChunker(max_chars=max_chars, min_chars=settings.MIN_CHARS)
+        chunks, chunk_s = timed(chunker.split_pages, cached_pages)
+        report["rechunk"][max_chars] = {
+            "chunks": len(chunks),
+            "chunk_s": chunk_s,
+            "cold_total_s": extract_s + chunk_s,
+            "cached_total_s": cached_s + chunk_s,
+        }
+
+    print(json.dumps(report, indent=2))
+
+    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    OUTPUT_FILE.write_text(json.dumps(report, indent=2))
+    print("\nSaved results to:", OUTPUT_FILE)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pdf", default=PDF)
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        default=0,
+        help="use a generated N-page PDF instead of --pdf",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf = args.pdf
+        if args.synthetic:
+            pdf = str(Path(tmp) / f"synthetic_{args.synthetic}.pdf")
+            write_synthetic_pdf(Path(pdf), args.synthetic)
+
+        run(pdf, Path(tmp) / "pages")
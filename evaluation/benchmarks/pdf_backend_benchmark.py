@@ -0,0 +1,115 @@
+"""
+PDF extraction backends compared: throughput and text differences.
+
+Runs `load_pdf` once per backend in `ingestion.pdf_backends` (single
+process, page cache off) and reports per backend:
+- seconds and pages/sec
+- pages with text, and whether every page has the loader's schema
+  ({content, metadata.doc_id/page_number/source_file})
+- text against the pypdf reference: pages with identical text, pages
+  only one side returned, and mean/min word-level similarity
+  (difflib ratio over the page's word sequence)
+
+Backends whose package is not installed are reported as skipped.
+
+Run:
+    python -m evaluation.benchmarks.pdf_backend_benchmark
+    python -m evaluation.benchmarks.pdf_backend_benchmark --synthetic 600
+"""
+
+import argparse
+import difflib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from ingestion.loader import load_pdf
+from ingestion.pdf_backends import BACKENDS
+from evaluation.benchmarks.pdf_extraction_benchmark import PDF, write_synthetic_pdf
+
+
+OUTPUT_FILE = Path("evaluation/benchmarks/results/pdf_backend_benchmark.json")
+
+REFERENCE = "pypdf"
+SCHEMA = {"doc_id", "page_number", "source_file"}
+
+
+def text_diff(reference, pages):
+    ref = {p["metadata"]["page_number"]: p["content"] for p in reference}
+    got = {p["metadata"]["page_number"]: p["content"] for p in pages}
+    common = sorted(ref.keys() & got.keys())
+
+    ratios = [
+        difflib.SequenceMatcher(
+            None, ref[n].split(), got[n].split(), autojunk=False
+        ).ratio()
+        for n in common
+    ]
+    return {
+        "pages_identical": sum(ref[n] == got[n] for n in common),
+        "pages_only_reference": len(ref.keys() - got.keys()),
+        "pages_only_backend": len(got.keys() - ref.keys()),
+        "word_similarity_mean": sum(ratios) / len(ratios) if ratios else 0.0,
+        "word_similarity_min": min(ratios) if ratios else 0.0,
+    }
+
+
+def run(pdf: str):
+    report = {"pdf": Path(pdf).name, "cpus": os.cpu_count(), "backends": {}}
+    reference = None
+
+    for name in [REFERENCE] + [b for b in BACKENDS if b != REFERENCE]:
+        start = time.perf_counter()
+        try:
+            pages = load_pdf(pdf, workers=1, cache=False, backend=name)
+        except Exception as e:
+            if isinstance(e.__cause__, ImportError):
+                report["backends"][name] = {"skipped": str(e.__cause__)}
+                print(name, "skipped:", e.__cause__)
+                continue
+            raise
+        elapsed = time.perf_counter() - start
+
+        row = {
+            "seconds": elapsed,
+            "pages_per_sec": len(pages) / elapsed,
+            "pages_with_text": len(pages),
+            "chars": sum(len(p["content"]) for p in pages),
+            "schema_ok": all(
+                set(p) == {"content", "metadata"} and set(p["metadata"]) == SCHEMA
+                for p in pages
+            ),
+        }
+        if name == REFERENCE:
+            reference = pages
+        else:
+            row["vs_" + REFERENCE] = text_diff(reference, pages)
+
+        print(name, json.dumps(row, indent=2))
+        report["backends"][name] = row
+
+    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    OUTPUT_FILE.write_text(json.dumps(report, indent=2))
+    print("\nSaved results to:", OUTPUT_FILE)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pdf", default=PDF)
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        default=0,
+        help="extract a generated N-page PDF instead of --pdf",
+    )
+    args = parser.parse_args()
+
+    if args.synthetic:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / f"synthetic_{args.synthetic}.pdf"
+            write_synthetic_pdf(path, args.synthetic)
+            run(str(path))
+    else:
+        run(args.pdf)
@@ -0,0 +1,149 @@
+"""
+PDF text extraction throughput (pages/sec) for 1..N worker processes.
+
+Runs `load_pdf` with each worker count and checks that every run returns
+exactly the pages of the single-process run, in the same order.
+
+Run:
+    python -m evaluation.benchmarks.pdf_extraction_benchmark
+    python -m evaluation.benchmarks.pdf_extraction_benchmark --synthetic 600
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from ingestion.loader import load_pdf
+
+
+OUTPUT_FILE = Path("evaluation/benchmarks/results/pdf_extraction_benchmark.json")
+
+PDF = "data/The_GALE_ENCYCLOPEDIA_of_MEDICINE_SECOND.pdf"
+LINES_PER_PAGE = 45
+SEED = 13
+
+
+def write_synthetic_pdf(path: Path, n_pages: int):
+    """
+    Minimal multi-page PDF with Helvetica text, written by hand so the
+    benchmark needs no PDF library besides the one under test.
+    """
+    rng = np.random.default_rng(SEED)
+    vocab = [f"term{i}" for i in range(5000)]
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once page ids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+
+    for _ in range(n_pages):
+        lines = [
+            " ".join(rng.choice(vocab, 12)) for _ in range(LINES_PER_PAGE)
+        ]
+        stream = "BT /F1 10 Tf 12 TL 40 760 Td " + " ".join(
+            f"({line}) '" for line in lines
+        ) + " ET"
+        stream = stream.encode("latin-1")
+
+        objects.append(
+            b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+        )
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+            % content_id
+        )
+        page_ids.append(len(objects))
+
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % i for i in page_ids),
+        n_pages,
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (i, body)
+
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+
+    path.write_bytes(bytes(out))
+
+
+def worker_counts(max_workers: int):
+    counts = [1]
+    while counts[-1] * 2 <= max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+    return counts
+
+
+def run(pdf: str, max_workers: int):
+    report = {
+        "pdf": Path(pdf).name,
+        "cpus": os.cpu_count(),
+        "workers": {},
+    }
+    reference = None
+
+    for workers in worker_counts(max_workers):
+        start = time.perf_counter()
+        pages = load_pdf(pdf, workers=workers, cache=False)
+        elapsed = time.perf_counter() - start
+
+        if reference is None:
+            reference = pages
+            report["pages_with_text"] = len(pages)
+
+        row = {
+            "seconds": elapsed,
+            "pages_per_sec": len(pages) / elapsed,
+            "speedup": report["workers"][1]["seconds"] / elapsed
+            if report["workers"]
+            else 1.0,
+            "identical_to_serial": pages == reference,
+        }
+        print(f"workers={workers}", json.dumps(row, indent=2))
+        report["workers"][workers] = row
+
+    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    OUTPUT_FILE.write_text(json.dumps(report, indent=2))
+    print("\nSaved results to:", OUTPUT_FILE)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pdf", default=PDF)
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        default=0,
+        help="extract a generated N-page PDF instead of --pdf",
+    )
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / f"synthetic_{args.synthetic}.pdf"
+            write_synthetic_pdf(path, args.synthetic)
+            run(str(path), args.max_workers)
+    else:
+        run(args.pdf, args.max_workers)
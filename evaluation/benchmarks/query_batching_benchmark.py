@@ -0,0 +1,139 @@
+"""
+Query micro-batching under concurrent load: latency p50/p99 and QPS of
+`EmbeddingService.embed_query` per batching window and client count.
+
+Closed-loop load test: `--clients` threads (each level in CONCURRENCY
+up to it) send queries back to back, as API request threads do, with
+the query cache off so every query reaches the model. Queries are GALE
+evaluation questions made unique. Per window in WINDOWS_MS
+(0 = batching off) and concurrency: QPS, latency p50/p99 (ms), and the
+mean number of queries per forward pass. The batched vectors are also
+compared with unbatched ones (max absolute difference).
+
+`--random-model` uses the randomly initialized model of the default
+model's shape from embed_batching_benchmark (no download needed).
+
+Run:
+    python -m evaluation.benchmarks.query_batching_benchmark
+    python -m evaluation.benchmarks.query_batching_benchmark --random-model
+"""
+
+import argparse
+import json
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from api.config import settings
+from rag.embedder import EmbeddingService, QueryBatcher, QueryEmbeddingCache
+from evaluation.benchmarks.embed_batching_benchmark import random_minilm
+from evaluation.benchmarks.faiss_ann_tuning import EVAL_FILE, load_json_robust
+
+
+OUTPUT_FILE = Path("evaluation/benchmarks/results/query_batching_benchmark.json")
+
+WINDOWS_MS = [0, 2, 5]
+CONCURRENCY = [1, 8, 32]
+
+
+def load_test(embedder, queries, clients):
+    latencies = [[] for _ in range(clients)]
+    vectors = {}
+    cursor = iter(range(len(queries)))
+    lock = threading.Lock()
+
+    def client(slot):
+        while True:
+            with lock:
+                i = next(cursor, None)
+            if i is None:
+                return
+            start = time.perf_counter()
+            vectors[i] = embedder.embed_query(queries[i])
+            latencies[slot].append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client, args=(slot,)) for slot in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    ms = 1000 * np.concatenate([np.array(l) for l in latencies])
+    return np.stack([vectors[i] for i in range(len(queries))]), ms, elapsed
+
+
+def run(n_queries, max_clients, max_batch, embedder_name):
+    embedder = EmbeddingService()
+    # Every query reaches the model
+    EmbeddingService._query_cache = QueryEmbeddingCache(0)
+
+    questions = list(dict.fromkeys(item["question"] for item in load_json_robust(EVAL_FILE)))
+    report = {
+        "embedder": embedder_name,
+        "queries_per_run": n_queries,
+        "max_batch": max_batch,
+        "runs": {},
+    }
+
+    # Unbatched reference vectors
+    reference_queries = [f"{questions[i % len(questions)]} (reference {i})" for i in range(64)]
+    reference = np.stack([embedder.embed_texts([q])[0].cpu().numpy() for q in reference_queries])
+
+    embedder.embed_texts(reference_queries)  # warm-up
+
+    run_id = 0
+    for window in WINDOWS_MS:
+        settings.QUERY_BATCH_WINDOW_MS = window
+        for clients in [c for c in CONCURRENCY if c <= max_clients]:
+            EmbeddingService._query_batcher = (
+                QueryBatcher(EmbeddingService._embed_many, window, max_batch) if window > 0 else None
+            )
+            run_id += 1
+            queries = [f"{questions[i % len(questions)]} (run {run_id}, {i})" for i in range(n_queries)]
+
+            _, ms, elapsed = load_test(embedder, queries, clients)
+            stats = embedder.query_batch_stats()
+
+            row = {
+                "qps": n_queries / elapsed,
+                "latency_ms_p50": float(np.percentile(ms, 50)),
+                "latency_ms_p99": float(np.percentile(ms, 99)),
+                "mean_batch_size": stats.get("mean_batch_size", 1.0),
+            }
+            key = f"window={window}ms clients={clients}"
+            print(key, json.dumps(row, indent=2))
+            report["runs"][key] = row
+
+    # Batched vectors vs one query per forward pass
+    settings.QUERY_BATCH_WINDOW_MS = max(WINDOWS_MS)
+    EmbeddingService._query_batcher = QueryBatcher(EmbeddingService._embed_many, max(WINDOWS_MS), max_batch)
+    batched, _, _ = load_test(embedder, reference_queries, min(max_clients, 32))
+    report["max_abs_diff_vs_unbatched"] = float(np.abs(batched - reference).max())
+    print("max_abs_diff_vs_unbatched", report["max_abs_diff_vs_unbatched"])
+
+    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    OUTPUT_FILE.write_text(json.dumps(report, indent=2))
+    print("\nSaved results to:", OUTPUT_FILE)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=600, help="per run")
+    parser.add_argument("--clients", type=int, default=max(CONCURRENCY))
+    parser.add_argument("--max-batch", type=int, default=settings.QUERY_BATCH_MAX_SIZE)
+    parser.add_argument("--random-model", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        name = settings.EMBEDDING_MODEL
+        if args.random_model:
+            questions = [item["question"] for item in load_json_robust(EVAL_FILE)]
+            EmbeddingService._model = random_minilm(questions, Path(tmp))
+            EmbeddingService._model_name = EmbeddingService.model_id()
+            name = "random-minilm-shape"
+        run(args.queries, args.clients, args.max_batch, name)
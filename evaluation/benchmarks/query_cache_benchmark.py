@@ -0,0 +1,155 @@
+"""
+Query-embedding LRU cache: hit rate and latency on a replayed query
+stream.
+
+The stream draws GALE evaluation questions with Zipf-distributed
+popularity (a few questions asked very often), a share of them re-typed
+with extra whitespace; `--unique-share` of the requests are one-off
+questions that never repeat (the long tail). A share of requests is
+embedded twice, as the rewrite path does when the rewrite returns the
+query unchanged (`--rewrite-same`). It is replayed by `--threads`
+threads through `EmbeddingService.embed_query` for each QUERY_CACHE_SIZE
+in SIZES (0 = cache off). Reported per size: hit rate, evictions, total
+seconds and mean milliseconds per lookup; and whether cached vectors are
+identical to freshly computed ones.
+
+`--embedder hash` replaces the model with hash-seeded random vectors,
+so model time is ~0 and the timings show cache overhead only; the hit
+rates are the same as with the model.
+
+Run:
+    python -m evaluation.benchmarks.query_cache_benchmark
+    python -m evaluation.benchmarks.query_cache_benchmark --embedder hash
+"""
+
+import argparse
+import hashlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import torch
+
+from api.config import settings
+from rag.embedder import EmbeddingService, QueryEmbeddingCache
+from evaluation.benchmarks.faiss_ann_tuning import EVAL_FILE, load_json_robust
+
+
+OUTPUT_FILE = Path("evaluation/benchmarks/results/query_cache_benchmark.json")
+
+SEED = 29
+SIZES = [0, 256, 1024, 4096]
+ZIPF_S = 1.1
+RETYPED_SHARE = 0.1
+HASH_DIM = 384
+
+
+class HashModel:
+    """SentenceTransformer stand-in: unit vectors seeded by text hash."""
+
+    max_seq_length = 256
+    tokenizer = None
+
+    def encode(self, texts, **kwargs):
+        vectors = np.stack([
+            np.random.default_rng(
+                int(hashlib.sha256(t.encode()).hexdigest()[:16], 16)
+            ).standard_normal(HASH_DIM)
+            for t in texts
+        ]).astype("float32")
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        return torch.from_numpy(vectors)
+
+
+def query_stream(questions, n_requests, rewrite_same, unique_share):
+    rng = np.random.default_rng(SEED)
+    ranks = np.arange(1, len(questions) + 1)
+    popularity = ranks ** -ZIPF_S
+    picks = rng.choice(len(questions), n_requests, p=popularity / popularity.sum())
+
+    stream = []
+    for n, i in enumerate(picks):
+        query = questions[i]
+        if rng.random() < unique_share:
+            query = f"{query} (case {n})"
+        elif rng.random() < RETYPED_SHARE:
+            query = "  " + query.replace(" ", "  ") + " "
+        stream.append(query)
+        if rng.random() < rewrite_same:
+            stream.append(query)
+    return stream
+
+
+def replay(embedder, stream, threads):
+    start = time.perf_counter()
+    if threads == 1:
+        for query in stream:
+            embedder.embed_query(query)
+    else:
+        with ThreadPoolExecutor(threads) as pool:
+            list(pool.map(embedder.embed_query, stream))
+    return time.perf_counter() - start
+
+
+def run(embedder_name, n_requests, threads, rewrite_same, unique_share):
+    if embedder_name == "hash":
+        EmbeddingService._model = HashModel()
+        EmbeddingService._model_name = settings.EMBEDDING_MODEL
+    embedder = EmbeddingService()
+
+    questions = list(dict.fromkeys(item["question"] for item in load_json_robust(EVAL_FILE)))
+    stream = query_stream(questions, n_requests, rewrite_same, unique_share)
+
+    report = {
+        "embedder": embedder_name,
+        "questions": len(questions),
+        "requests": n_requests,
+        "lookups": len(stream),
+        "distinct_normalized": len({" ".join(q.split()) for q in stream}),
+        "threads": threads,
+        "rewrite_same": rewrite_same,
+        "unique_share": unique_share,
+        "sizes": {},
+    }
+
+    for size in SIZES:
+        EmbeddingService._query_cache = QueryEmbeddingCache(size)
+        seconds = replay(embedder, stream, threads)
+        stats = embedder.query_cache_stats()
+
+        row = {
+            "seconds": seconds,
+            "ms_per_lookup": 1000 * seconds / len(stream),
+            "hit_rate": stats["hit_rate"],
+            "hits": stats["hits"],
+            "misses": stats["misses"],
+            "evictions": stats["evictions"],
+            "counted_all": size == 0 or stats["hits"] + stats["misses"] == len(stream),
+        }
+        print(f"size={size}", json.dumps(row, indent=2))
+        report["sizes"][size] = row
+
+    # Cached vectors are the model's output, bit for bit
+    sample = questions[:50]
+    cached = np.stack([embedder.embed_query(q) for q in sample])
+    fresh = np.stack([embedder.embed_texts([q])[0].cpu().numpy() for q in sample])
+    report["identical_to_uncached"] = bool(np.array_equal(cached, fresh))
+    print("identical_to_uncached", report["identical_to_uncached"])
+
+    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    OUTPUT_FILE.write_text(json.dumps(report, indent=2))
+    print("\nSaved results to:", OUTPUT_FILE)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--embedder", choices=["model", "hash"], default="model")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--rewrite-same", type=float, default=0.5)
+    parser.add_argument("--unique-share", type=float, default=0.3)
+    args = parser.parse_args()
+
+    run(args.embedder, args.requests, args.threads, args.rewrite_same, args.unique_share)
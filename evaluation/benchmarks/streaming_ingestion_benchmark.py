@@ -0,0 +1,187 @@
+"""
+Peak memory of an index build vs corpus size: list-based vs streaming.
+
+- batch:      every page, then every chunk, then every embedding held in
+              lists before anything is indexed (the pipeline before
+              `index_manager.rebuild_index` streamed)
+- streaming:  `rebuild_index` — pages, chunks and INDEX_BATCH_SIZE
+              embedding batches flow through generators into FAISS and
+              the chunk store; BM25 is built from the chunk store
+
+Each (pipeline, corpus size) runs in a fresh process inside its own temp
+directory, on generated PDFs. Reported: peak_rss_mb (ru_maxrss) and
+build_rss_mb, the peak minus the process's RSS just before the build
+(imports, model). The finished indexes (index_mb) grow with the corpus
+in both pipelines; overhead_mb is what the build holds on top of them.
+
+`--embedder hash` replaces the model with deterministic random unit
+vectors, so memory can be measured without downloading the model.
+
+Run:
+    python -m evaluation.benchmarks.streaming_ingestion_benchmark
+    python -m evaluation.benchmarks.streaming_ingestion_benchmark --embedder hash
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing as mp
+import os
+import resource
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from evaluation.benchmarks.index_mmap_benchmark import memory_mb, SYNTHETIC_DIM
+from evaluation.benchmarks.pdf_extraction_benchmark import write_synthetic_pdf
+
+
+OUTPUT_FILE = Path("evaluation/benchmarks/results/streaming_ingestion_benchmark.json")
+
+PAGE_COUNTS = [500, 1000, 2000, 4000]
+PDFS_PER_CORPUS = 4
+
+
+def hash_embeddings(chunks, cache=None):
+    vectors = np.stack(
+        [
+            np.random.default_rng(
+                int(hashlib.sha256(c["content"].encode()).hexdigest()[:16], 16)
+            ).standard_normal(SYNTHETIC_DIM)
+            for c in chunks
+        ]
+    ).astype("float32")
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def batch_build(pdf_paths):
+    from ingestion.loader import load_pdf
+    from ingestion.semantic_splitter import SemanticChunker
+    from rag import index_manager as im
+    from rag.chunk_store import ChunkStore
+    from api.config import settings
+
+    pages = []
+    for pdf in pdf_paths:
+        pages.extend(load_pdf(pdf))
+
+    chunker = SemanticChunker(
+        max_chars=settings.MAX_CHARS,
+        min_chars=settings.MIN_CHARS,
+    )
+    chunks = chunker.split_pages(pages)
+    embeddings = im.embed_chunks(chunks, None)
+
+    chunk_store = ChunkStore.write(im.CHUNK_STORE, chunks).open()
+
+    faiss_store = im.new_faiss_store(chunk_store, dimension=embeddings.shape[1])
+    faiss_store.add_chunks(embeddings, chunks)
+    faiss_store.save()
+
+    bm25_store = im.new_bm25_store(chunk_store)
+    bm25_store.build(chunks)
+    bm25_store.save()
+
+    return len(chunks)
+
+
+def streaming_build(pdf_paths):
+    from rag import index_manager as im
+
+    doc_hashes = im.document_hashes(pdf_paths)
+    fingerprint = im.compute_fingerprint(pdf_paths, doc_hashes)
+    faiss_store, _ = im.rebuild_index(pdf_paths, doc_hashes, fingerprint)
+    return faiss_store.index.ntotal
+
+
+def worker(pipeline, workdir, pdf_paths, embedder, results):
+    # Index and cache paths are relative to the working directory
+    os.chdir(workdir)
+
+    from api.config import settings
+    from rag import index_manager as im
+
+    settings.EMBEDDING_CACHE_ENABLED = False
+    settings.PDF_EXTRACT_WORKERS = 1
+    settings.PAGE_CACHE_ENABLED = False
+
+    if embedder == "hash":
+        im.embed_chunks = hash_embeddings
+    else:
+        im.EmbeddingService()
+
+    before_mb = memory_mb()["rss_mb"]
+    build = batch_build if pipeline == "batch" else streaming_build
+    chunks = build(pdf_paths)
+
+    # ru_maxrss is in KiB on Linux
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    # What the finished indexes occupy; chunk text is mapped, not held
+    index_mb = sum(
+        p.stat().st_size
+        for p in im.INDEX_DIR.rglob("*")
+        if p.is_file() and not p.name.startswith(im.CHUNK_STORE.name + ".")
+    ) / 1e6
+
+    results.put(
+        {
+            "chunks": chunks,
+            "peak_rss_mb": peak_mb,
+            "build_rss_mb": peak_mb - before_mb,
+            "index_mb": index_mb,
+            "overhead_mb": peak_mb - before_mb - index_mb,
+        }
+    )
+
+
+def measure(pipeline, pdf_paths, embedder):
+    ctx = mp.get_context("spawn")
+    results = ctx.Queue()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        proc = ctx.Process(
+            target=worker,
+            args=(pipeline, workdir, pdf_paths, embedder, results),
+        )
+        proc.start()
+        row = results.get()
+        proc.join()
+
+    return row
+
+
+def run(page_counts, embedder):
+    report = {
+        "embedder": embedder,
+        "pdfs_per_corpus": PDFS_PER_CORPUS,
+        "corpora": {},
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in page_counts:
+            pdf_paths = []
+            for i in range(PDFS_PER_CORPUS):
+                path = Path(tmp) / f"corpus{pages}_{i}.pdf"
+                write_synthetic_pdf(path, pages // PDFS_PER_CORPUS)
+                pdf_paths.append(str(path))
+
+            report["corpora"][pages] = {}
+            for pipeline in ("batch", "streaming"):
+                row = measure(pipeline, pdf_paths, embedder)
+                print(f"pages={pages}", pipeline, json.dumps(row, indent=2))
+                report["corpora"][pages][pipeline] = row
+
+    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    OUTPUT_FILE.write_text(json.dumps(report, indent=2))
+    print("\nSaved results to:", OUTPUT_FILE)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, nargs="+", default=PAGE_COUNTS)
+    parser.add_argument("--embedder", choices=["model", "hash"], default="model")
+    args = parser.parse_args()
+
+    run(args.pages, args.embedder)
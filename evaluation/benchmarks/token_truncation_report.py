@@ -0,0 +1,124 @@
+"""
+How much chunk text the embedding model never sees.
+
+all-MiniLM-L6-v2 embeds at most `max_seq_length` (256) word pieces per
+input and silently drops the rest. For the character-sized
+SemanticChunker (MAX_CHARS/MIN_CHARS) and the TokenChunker, reports
+chunk count, total word pieces and how many of them are truncated.
+
+Run:
+    python -m evaluation.benchmarks.token_truncation_report
+    python -m evaluation.benchmarks.token_truncation_report --tokenizer path/to/tokenizer --max-tokens 256
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+from api.config import settings
+from ingestion.loader import load_pdf
+from ingestion.semantic_splitter import SemanticChunker
+from rag.chunking.token_chunker import TokenChunker
+from evaluation.benchmarks.pdf_extraction_benchmark import PDF
+
+
+OUTPUT_FILE = Path("evaluation/benchmarks/results/token_truncation_report.json")
+
+TOKENIZE_BATCH = 1024
+
+
+def load_tokenizer(name: str, max_tokens: int):
+    if name:
+        from transformers import AutoTokenizer
+
+        return AutoTokenizer.from_pretrained(name), max_tokens
+
+    from rag.embedder import EmbeddingService
+
+    service = EmbeddingService()
+    return service.tokenizer, service.max_seq_length
+
+
+def token_lengths(tokenizer, texts):
+    lengths = []
+    for i in range(0, len(texts), TOKENIZE_BATCH):
+        encoded = tokenizer(
+            texts[i:i + TOKENIZE_BATCH],
+            add_special_tokens=True,
+            return_attention_mask=False,
+            return_token_type_ids=False,
+        )
+        lengths.extend(len(ids) for ids in encoded["input_ids"])
+    return np.asarray(lengths, dtype=np.int64)
+
+
+def report_chunks(chunks, chunk_s, tokenizer, max_tokens):
+    lengths = token_lengths(tokenizer, [c["content"] for c in chunks])
+    truncated = np.maximum(lengths - max_tokens, 0)
+
+    return {
+        "chunks": len(chunks),
+        "chunk_s": chunk_s,
+        "tokens": int(lengths.sum()),
+        "tokens_truncated": int(truncated.sum()),
+        "pct_tokens_truncated": 100 * float(truncated.sum()) / max(int(lengths.sum()), 1),
+        "chunks_truncated": int((truncated > 0).sum()),
+        "mean_tokens": float(lengths.mean()) if len(lengths) else 0.0,
+        "p95_tokens": float(np.percentile(lengths, 95)) if len(lengths) else 0.0,
+        "max_tokens_seen": int(lengths.max()) if len(lengths) else 0,
+    }
+
+
+def run(pdf: str, tokenizer_name: str, max_tokens: int):
+    tokenizer, max_tokens = load_tokenizer(tokenizer_name, max_tokens)
+    pages = load_pdf(pdf)
+
+    report = {
+        "pdf": Path(pdf).name,
+        "pages_with_text": len(pages),
+        "max_seq_length": max_tokens,
+        "chunkers": {},
+    }
+
+    chunkers = {
+        f"semantic_{settings.MAX_CHARS}_{settings.MIN_CHARS}": SemanticChunker(
+            max_chars=settings.MAX_CHARS,
+            min_chars=settings.MIN_CHARS,
+        ),
+        "token": TokenChunker(tokenizer=tokenizer, max_tokens=max_tokens),
+    }
+
+    for name, chunker in chunkers.items():
+        start = time.perf_counter()
+        chunks = chunker.split_pages(pages)
+        chunk_s = time.perf_counter() - start
+
+        row = report_chunks(chunks, chunk_s, tokenizer, max_tokens)
+        print(name, json.dumps(row, indent=2))
+        report["chunkers"][name] = row
+
+    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    OUTPUT_FILE.write_text(json.dumps(report, indent=2))
+    print("\nSaved results to:", OUTPUT_FILE)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pdf", default=PDF)
+    parser.add_argument(
+        "--tokenizer",
+        default="",
+        help="tokenizer name/path (default: the embedding model's own)",
+    )
+    parser.add_argument(
+        "--max-tokens",
+        type=int,
+        default=256,
+        help="sequence limit to assume with --tokenizer",
+    )
+    args = parser.parse_args()
+
+    run(args.pdf, args.tokenizer, args.max_tokens)
@@ -4,21 +4,24 @@ from pathlib import Path
 import numpy as np
 import nltk
 
-from ingestion.loader import load_pdf
+from ingestion.corpus import load_corpus
+from ingestion.loader import DocumentPool
 from rag.embedder import EmbeddingService
+from rag.embedding_pool import EmbeddingPool
 from rag.faiss_store import FaissStore
 from rag.retriever import Retriever
 
 from rag.chunking.paragraph_chunker import ParagraphChunker
 from rag.chunking.sentence_chunker import SentenceChunker
 from rag.chunking.sliding_window_chunker import SlidingWindowChunker
+from rag.chunking.token_chunker import TokenChunker
 from ingestion.semantic_splitter import SemanticChunker
 
 
 # -------------------------------------------------
 # CONFIG
 # -------------------------------------------------
-PDF = "data/The_GALE_ENCYCLOPEDIA_of_MEDICINE_SECOND.pdf"
+PDFS = load_corpus()
 GALE_EVAL = Path("evaluation/gale/evaluation_gale_final.json")
 OUTPUT_FILE = "evaluation/chunking_ablation/chunking_results.json"
 
@@ -54,16 +57,15 @@ def split_sentences(text: str):
 # -------------------------------------------------
 # BUILD RETRIEVAL INDEX
 # -------------------------------------------------
-def build_index(chunks, embedder):
+def build_index(chunks, pool):
 
-    vecs = embedder.embed_texts(
-        [c["content"] for c in chunks]
-    ).cpu().numpy()
+    vecs = pool.embed_texts([c["content"] for c in chunks])
 
     store = FaissStore("tmp.index", "tmp.pkl", dimension=vecs.shape[1])
     store.add_chunks(vecs, chunks)
 
-    return Retriever(embedder, store)
+    # EmbeddingService is a singleton: the query side shares the loaded model
+    return Retriever(EmbeddingService(), store)
 
 
 # -------------------------------------------------
@@ -171,13 +173,16 @@ def load_json_robust(path: Path):
 # -------------------------------------------------
 def run():
 
-    print("Loading PDF...")
-    pages = load_pdf(PDF)
+    print("Loading PDFs...")
+    with DocumentPool(PDFS) as loader:
+        pages = [page for pdf in PDFS for page in loader.pages(pdf)]
 
     print("Loading evaluation set...")
     data = load_json_robust(GALE_EVAL)
 
     embedder = EmbeddingService()
+    # Whole-corpus embeddings per chunker, sharded over EMBED_WORKERS
+    pool = EmbeddingPool()
 
     experiments = {
         "paragraph_small": ParagraphChunker(800, 150),
@@ -185,6 +190,7 @@ def run():
         "semantic_default": SemanticChunker(),
         "sentence_boundary": SentenceChunker(),
         "sliding_window": SlidingWindowChunker(),
+        "token_budget": TokenChunker(),
     }
 
     results = {}
@@ -197,7 +203,7 @@ def run():
 
         print("Chunks created:", len(chunks))
 
-        retriever = build_index(chunks, embedder)
+        retriever = build_index(chunks, pool)
 
         metrics = evaluate_chunker(
             retriever,
@@ -207,6 +213,8 @@ def run():
 
         results[name] = metrics
 
+    pool.close()
+
     Path(OUTPUT_FILE).write_text(json.dumps(results, indent=2))
     print("\nSaved results to:", OUTPUT_FILE)
 
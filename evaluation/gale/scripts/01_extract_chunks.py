@@ -8,7 +8,8 @@ import logging
 from pathlib import Path
 from tqdm import tqdm
 
-from ingestion.loader import load_pdf
+from ingestion.corpus import load_corpus
+from ingestion.loader import DocumentPool
 from ingestion.semantic_splitter import SemanticChunker
 from api.config import settings
 from evaluation.gale.scripts.utils import is_valid_chunk
@@ -17,7 +18,7 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("extract_chunks")
 
 # Config
-PDFS = ["data/The_GALE_ENCYCLOPEDIA_of_MEDICINE_SECOND.pdf"]
+PDFS = load_corpus()
 OUT_DIR = Path("evaluation/gale/data")
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 OUT_FILE = OUT_DIR / "chunks.jsonl"
@@ -25,8 +26,9 @@ OUT_FILE = OUT_DIR / "chunks.jsonl"
 def main():
     logger.info("Loading PDFs...")
     pages = []
-    for pdf_path in PDFS:
-        pages.extend(load_pdf(pdf_path))
+    with DocumentPool(PDFS) as loader:
+        for pdf_path in PDFS:
+            pages.extend(loader.pages(pdf_path))
     
     logger.info(f"Loaded {len(pages)} pages")
     
@@ -2,15 +2,15 @@ import json
 import time
 import csv
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, List, Optional
 
 # ---- IMPORT YOUR PIPELINE ----
 from rag.index_manager import build_or_load_index
+from ingestion.corpus import load_corpus
 from rag.embedder import EmbeddingService
 from rag.retriever import Retriever
 from rag.hybrid_retriever import HybridRetriever
 from rag.reranker import CrossEncoderReranker
-from api.config import settings
 
 # -----------------------------
 # Config
@@ -19,7 +19,7 @@ from api.config import settings
 EVAL_FILE = Path("evaluation/gale/evaluation_gale_final.json")
 OUTPUT_FILE = Path("evaluation/eval_outputs/bm25.csv")
 
-PDFS = ["data/The_GALE_ENCYCLOPEDIA_of_MEDICINE_SECOND.pdf"]
+PDFS = load_corpus()
 
 TOP_K = 5
 CONFIG_ID = "bm25_v1"
@@ -3,11 +3,12 @@ from pathlib import Path
 
 from rag.embedder import EmbeddingService
 from rag.index_manager import build_or_load_index
+from ingestion.corpus import load_corpus
 from rag.retriever import Retriever
 from rag.hybrid_retriever import HybridRetriever
 from orchestration.rewrite import QueryWriter
 
-PDFS = ["data/The_GALE_ENCYCLOPEDIA_of_MEDICINE_SECOND.pdf"]
+PDFS = load_corpus()
 EVAL_FILE = "evaluation/gale/evaluation_gale_final.json"
 
 PRONOUNS = {"it", "this", "that", "they", "he", "she", "them", "its"}
@@ -3,16 +3,15 @@ import time
 from pathlib import Path
 
 from rag.embedder import EmbeddingService
-from rag.faiss_store import FaissStore
 from rag.retriever import Retriever
 from rag.hybrid_retriever import HybridRetriever
 from rag.reranker import CrossEncoderReranker
 from rag.index_manager import build_or_load_index
+from ingestion.corpus import load_corpus
 from orchestration.rewrite import QueryWriter
-from api.config import settings
 
 
-PDFS = ["data/The_GALE_ENCYCLOPEDIA_of_MEDICINE_SECOND.pdf"]
+PDFS = load_corpus()
 EVAL_FILE = "evaluation/gale/evaluation_gale_final.json"
 TOP_K = 5
 
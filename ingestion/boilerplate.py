@@ -0,0 +1,134 @@
+import re
+import math
+from collections import Counter
+from itertools import islice
+from typing import List, Dict, Any, Iterable, Iterator, Set
+
+from core.logger import get_logger
+
+
+logger = get_logger("ingestion.boilerplate")
+
+# Whole-number tokens (page numbers); digits inside words are left alone
+_NUMBER = re.compile(r"\d+")
+
+
+def _edge_keys(tokens: List[str], max_words: int, from_end: bool) -> List[str]:
+    """Number-normalized keys of the first (or last) 1..max_words tokens."""
+    edge = tokens[-max_words:][::-1] if from_end else tokens[:max_words]
+    edge = ["#" if _NUMBER.fullmatch(t) else t for t in edge]
+    return [" ".join(edge[:n]) for n in range(1, len(edge) + 1)]
+
+
+def _is_candidate(key: str) -> bool:
+    # One common word ("The") is not boilerplate; a bare page number is
+    return " " in key or key == "#"
+
+
+class BoilerplateStripper:
+    """
+    Removes running heads, page numbers and other text repeated at the
+    start or end of many pages of one document.
+
+    The loader collapses each page to a single line, so a header or
+    footer shows up as a word sequence at the page's edge. The first
+    `sample_pages` pages are read ahead; every leading and trailing word
+    sequence (up to `max_words`, numbers normalized so "Page 12" matches
+    "Page 13") found on at least `min_share` of them is learned, and the
+    longest learned match is cut from both edges of every page.
+
+    Use one instance per document. Documents shorter than `min_pages`
+    pass through unchanged.
+    """
+
+    def __init__(
+        self,
+        sample_pages: int = 100,
+        min_share: float = 0.4,
+        min_pages: int = 8,
+        max_words: int = 16,
+    ):
+        self.sample_pages = sample_pages
+        self.min_share = min_share
+        self.min_pages = min_pages
+        self.max_words = max_words
+
+        self.prefixes: Set[str] = set()
+        self.suffixes: Set[str] = set()
+        self.stats = {"pages": 0, "pages_dropped": 0, "bytes": 0, "bytes_removed": 0}
+
+    def iter_pages(self, pages: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        pages = iter(pages)
+        sample = list(islice(pages, self.sample_pages))
+
+        if len(sample) >= self.min_pages:
+            self._learn(sample)
+
+        for page in sample:
+            yield from self._strip(page)
+        for page in pages:
+            yield from self._strip(page)
+
+    def _learn(self, sample: List[Dict[str, Any]]):
+        prefix_counts: Counter = Counter()
+        suffix_counts: Counter = Counter()
+
+        for page in sample:
+            tokens = page["content"].split()
+            prefix_counts.update(set(_edge_keys(tokens, self.max_words, False)))
+            suffix_counts.update(set(_edge_keys(tokens, self.max_words, True)))
+
+        needed = max(2, math.ceil(self.min_share * len(sample)))
+        self.prefixes = {
+            k for k, c in prefix_counts.items() if c >= needed and _is_candidate(k)
+        }
+        self.suffixes = {
+            k for k, c in suffix_counts.items() if c >= needed and _is_candidate(k)
+        }
+
+    def _strip(self, page: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        content = page["content"]
+        self.stats["pages"] += 1
+        self.stats["bytes"] += len(content.encode("utf-8"))
+
+        if not (self.prefixes or self.suffixes):
+            yield page
+            return
+
+        tokens = content.split()
+        start, end = 0, len(tokens)
+
+        for n, key in enumerate(_edge_keys(tokens, self.max_words, False), start=1):
+            if key in self.prefixes:
+                start = n
+        for n, key in enumerate(_edge_keys(tokens[start:], self.max_words, True), start=1):
+            if key in self.suffixes:
+                end = len(tokens) - n
+
+        if start == 0 and end == len(tokens):
+            yield page
+            return
+
+        stripped = " ".join(tokens[start:end])
+        self.stats["bytes_removed"] += len(content.encode("utf-8")) - len(
+            stripped.encode("utf-8")
+        )
+
+        if not stripped:
+            self.stats["pages_dropped"] += 1
+            return
+
+        yield {**page, "content": stripped}
+
+    def log_summary(self, source: str):
+        logger.info(
+            "event=BOILERPLATE_STRIPPED | file=%s | pages=%d | pages_dropped=%d"
+            " | bytes_removed=%d | removed_pct=%.2f | prefixes=%d | suffixes=%d",
+            source,
+            self.stats["pages"],
+            self.stats["pages_dropped"],
+            self.stats["bytes_removed"],
+            100 * self.stats["bytes_removed"] / max(self.stats["bytes"], 1),
+            len(self.prefixes),
+            len(self.suffixes),
+        )
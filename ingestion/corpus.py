@@ -0,0 +1,92 @@
+import glob
+from pathlib import Path
+from typing import List, Optional
+
+from api.config import settings
+from core.logger import get_logger
+from core.exceptions import CustomException
+
+
+logger = get_logger("ingestion.corpus")
+
+
+def _pdfs_in(directory: Path) -> List[str]:
+    return sorted(str(p) for p in directory.rglob("*") if p.suffix.lower() == ".pdf")
+
+
+def _expand(entry: str, base: Path) -> List[str]:
+    """PDF paths of one manifest entry: a file, a directory or a glob."""
+    path = Path(entry).expanduser()
+    if not path.is_absolute():
+        path = base / path
+
+    if glob.has_magic(str(path)):
+        matches = sorted(glob.glob(str(path), recursive=True))
+        return [m for m in matches if m.lower().endswith(".pdf")]
+    if path.is_dir():
+        return _pdfs_in(path)
+    if path.is_file():
+        return [str(path)]
+
+    raise CustomException(
+        "Corpus source not found",
+        context={"entry": entry, "path": str(path)},
+    )
+
+
+def _read_manifest(path: Path) -> List[str]:
+    import yaml
+
+    data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    entries = data.get("sources", []) if isinstance(data, dict) else data
+
+    if not isinstance(entries, list):
+        raise CustomException(
+            "Corpus manifest must list its sources",
+            context={"manifest": str(path)},
+        )
+    return [str(entry) for entry in entries]
+
+
+def load_corpus(source: Optional[str] = None) -> List[str]:
+    """
+    PDF paths of the corpus, in a stable order.
+
+    `source` (default CORPUS_SOURCE; empty = INDEX_PDFS) is either
+    - a directory: every PDF below it, sorted by path
+    - a YAML manifest: a list of files, directories and glob patterns,
+      top-level or under `sources:`, relative to the manifest's directory
+
+    A path listed twice is kept at its first position. The order fixes
+    chunk row ids, so the same corpus always builds the same index.
+    """
+    source = source if source is not None else settings.CORPUS_SOURCE
+
+    if not source:
+        paths = list(settings.INDEX_PDFS)
+    else:
+        root = Path(source).expanduser()
+        if root.is_dir():
+            paths = _pdfs_in(root)
+        elif root.suffix.lower() in (".yaml", ".yml") and root.is_file():
+            paths = [
+                pdf
+                for entry in _read_manifest(root)
+                for pdf in _expand(entry, root.parent)
+            ]
+        else:
+            raise CustomException(
+                "Corpus source must be a directory or a YAML manifest",
+                context={"source": source},
+            )
+
+    paths = list(dict.fromkeys(paths))
+    if not paths:
+        raise CustomException("Corpus is empty", context={"source": source})
+
+    logger.info(
+        "event=CORPUS_LOADED | source=%s | pdfs=%d",
+        source or "INDEX_PDFS",
+        len(paths),
+    )
+    return paths
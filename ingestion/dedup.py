@@ -0,0 +1,203 @@
+import re
+import zlib
+from collections import defaultdict
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Set, Tuple
+
+import numpy as np
+
+from core.logger import get_logger
+
+
+logger = get_logger("ingestion.dedup")
+
+_WORD = re.compile(r"\w+")
+
+# Multiplier of the polynomial shingle hash (any large odd constant)
+_SHINGLE_BASE = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _choose_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    (bands, rows) with bands * rows == num_perm whose LSH threshold
+    (1 / bands) ** (1 / rows) is the highest one not above `threshold`:
+    pairs at the threshold collide with high probability, and the
+    signature check removes the extra candidates.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+
+class NearDuplicateFilter:
+    """
+    Streaming near-duplicate removal with MinHash + LSH.
+
+    Each chunk is reduced to a MinHash signature of its word
+    `shingle_size`-grams and looked up in `bands` LSH tables; only chunks
+    sharing a band bucket are compared, so cost grows linearly with the
+    corpus instead of with the number of pairs. A chunk whose estimated
+    Jaccard similarity to an earlier kept chunk reaches `threshold` is
+    dropped, and its (chunk_id, doc_id, page, file) is recorded against
+    that canonical chunk.
+
+    The first occurrence in corpus order is canonical, so the output is
+    deterministic for a given document order.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.85,
+        num_perm: int = 128,
+        shingle_size: int = 5,
+        seed: int = 1,
+    ):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = _choose_bands(num_perm, threshold)
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2**63, num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**63, num_perm, dtype=np.uint64)
+
+        self._buckets: List[Dict[bytes, List[int]]] = [
+            defaultdict(list) for _ in range(self.bands)
+        ]
+        self._signatures: List[np.ndarray] = []
+        self._canonical: List[Dict[str, Any]] = []
+
+        # canonical chunk_id -> references of the chunks collapsed into it
+        self.provenance: Dict[str, List[Dict[str, Any]]] = {}
+
+        self.stats = {"chunks": 0, "duplicates": 0, "chars": 0, "chars_removed": 0}
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash of the word shingles; None for text without words."""
+        words = _WORD.findall(text.lower())
+        if not words:
+            return None
+
+        hashes = np.fromiter(
+            (zlib.crc32(w.encode()) for w in words), dtype=np.uint64, count=len(words)
+        )
+
+        k = min(self.shingle_size, len(words))
+        shingles = np.zeros(len(words) - k + 1, dtype=np.uint64)
+        for j in range(k):
+            shingles = shingles * _SHINGLE_BASE + hashes[j:len(hashes) - k + 1 + j]
+
+        # Universal hashing: top 32 bits of a * x + b (mod 2**64)
+        permuted = (shingles[:, None] * self._a + self._b) >> np.uint64(32)
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def filter(self, chunks: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Yields the chunks that are not near-duplicates of an earlier one."""
+        for chunk in chunks:
+            text = chunk["content"]
+            self.stats["chunks"] += 1
+            self.stats["chars"] += len(text)
+
+            sig = self.signature(text)
+            if sig is None:
+                yield chunk
+                continue
+
+            match = self._find(sig)
+            if match is None:
+                self._add(sig, chunk)
+                yield chunk
+                continue
+
+            canonical = self._canonical[match]
+            self.provenance.setdefault(canonical["chunk_id"], []).append(
+                self._reference(chunk)
+            )
+            self.stats["duplicates"] += 1
+            self.stats["chars_removed"] += len(text)
+
+    def attach_provenance(
+        self, chunks: Iterable[Dict[str, Any]]
+    ) -> Iterator[Dict[str, Any]]:
+        """Adds metadata["duplicates"] to canonical chunks that absorbed others."""
+        for chunk in chunks:
+            duplicates = self.provenance.get(chunk["chunk_id"])
+            if duplicates:
+                chunk = {
+                    **chunk,
+                    "metadata": {**chunk["metadata"], "duplicates": duplicates},
+                }
+            yield chunk
+
+    def document_links(self) -> Dict[str, Set[str]]:
+        """doc_id -> other doc_ids it shares a collapsed chunk with."""
+        canonical_docs = {c["chunk_id"]: c["doc_id"] for c in self._canonical}
+        links: Dict[str, Set[str]] = defaultdict(set)
+
+        for chunk_id, duplicates in self.provenance.items():
+            owner = canonical_docs[chunk_id]
+            for ref in duplicates:
+                if ref["doc_id"] != owner:
+                    links[owner].add(ref["doc_id"])
+                    links[ref["doc_id"]].add(owner)
+
+        return links
+
+    def summary(self) -> Dict[str, Any]:
+        chunks = self.stats["chunks"]
+        return {
+            **self.stats,
+            "kept": chunks - self.stats["duplicates"],
+            "removed_pct": 100 * self.stats["duplicates"] / max(chunks, 1),
+            "chars_removed_pct": 100 * self.stats["chars_removed"] / max(self.stats["chars"], 1),
+        }
+
+    def log_summary(self):
+        summary = self.summary()
+        logger.info(
+            "event=DEDUP_COMPLETE | chunks=%d | duplicates=%d | removed_pct=%.2f"
+            " | chars_removed_pct=%.2f | threshold=%.2f | bands=%d | rows=%d",
+            summary["chunks"],
+            summary["duplicates"],
+            summary["removed_pct"],
+            summary["chars_removed_pct"],
+            self.threshold,
+            self.bands,
+            self.rows,
+        )
+
+    def _find(self, sig: np.ndarray):
+        candidates = set()
+        for band, bucket in enumerate(self._buckets):
+            key = sig[band * self.rows:(band + 1) * self.rows].tobytes()
+            candidates.update(bucket.get(key, ()))
+
+        best, best_sim = None, -1.0
+        for idx in sorted(candidates):
+            sim = float(np.mean(self._signatures[idx] == sig))
+            if sim > best_sim:
+                best, best_sim = idx, sim
+        return best if best_sim >= self.threshold else None
+
+    def _add(self, sig: np.ndarray, chunk: Dict[str, Any]):
+        idx = len(self._signatures)
+        self._signatures.append(sig)
+        self._canonical.append(
+            {"chunk_id": chunk["chunk_id"], "doc_id": chunk["metadata"]["doc_id"]}
+        )
+        for band, bucket in enumerate(self._buckets):
+            bucket[sig[band * self.rows:(band + 1) * self.rows].tobytes()].append(idx)
+
+    @staticmethod
+    def _reference(chunk: Dict[str, Any]) -> Dict[str, Any]:
+        meta = chunk["metadata"]
+        return {
+            "chunk_id": chunk["chunk_id"],
+            "doc_id": meta["doc_id"],
+            "page_number": meta["page_number"],
+            "source_file": meta.get("source_file"),
+        }
@@ -0,0 +1,171 @@
+import os
+import json
+import time
+import hashlib
+from pathlib import Path
+from typing import Dict, Any, Iterable, Optional
+
+try:
+    import xxhash
+except ImportError:  # optional: touch-only changes then cost a full SHA-256
+    xxhash = None
+
+from api.config import settings
+from core.logger import get_logger
+
+
+_FORMAT_VERSION = 1
+
+# Large reads keep hashing CPU-bound instead of syscall-bound
+_READ_SIZE = 1 << 20
+
+# An mtime this close to the moment a file was hashed may hide a write in
+# the same timestamp tick, so that entry is not trusted on the next stat
+_RACY_WINDOW_NS = 2_000_000_000
+
+logger = get_logger("ingestion.file_manifest")
+
+
+def _hash_file(path: str, *hashers):
+    with open(path, "rb") as f:
+        while chunk := f.read(_READ_SIZE):
+            for hasher in hashers:
+                hasher.update(chunk)
+
+
+def _stat_key(st: os.stat_result) -> Dict[str, int]:
+    return {
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "inode": st.st_ino,
+        "device": st.st_dev,
+    }
+
+
+class FileManifest:
+    """
+    SHA-256 of each file, keyed by absolute path and trusted while the
+    file's (size, mtime, inode, device) tuple is unchanged.
+
+    Startup then costs one stat per file instead of reading the corpus.
+    When the tuple changes, an xxh3 hash (if `xxhash` is installed) tells
+    a touched-but-identical file from a modified one before paying for
+    SHA-256. The SHA-256 stays the document identity everywhere else
+    (doc_id, page cache, index metadata).
+
+    Stored as one JSON file, replaced atomically on save.
+    """
+
+    def __init__(self, path, fast_hash: bool = True):
+        self.path = Path(path)
+        self.fast_hash = fast_hash and xxhash is not None
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+
+        self.stats = {"hits": 0, "fast_matches": 0, "hashed": 0}
+
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text())
+                if data.get("version") == _FORMAT_VERSION:
+                    self.entries = data["files"]
+            except (OSError, ValueError, KeyError):
+                logger.warning(
+                    "event=FILE_MANIFEST_UNREADABLE | path=%s", self.path
+                )
+
+    def sha256(self, file_path) -> str:
+        key = os.path.abspath(file_path)
+        st = os.stat(key)
+        stat_key = _stat_key(st)
+        entry = self.entries.get(key)
+
+        if entry is not None and entry["stat"] == stat_key and not entry["racy"]:
+            self.stats["hits"] += 1
+            return entry["sha256"]
+
+        checked_ns = time.time_ns()
+
+        if entry is not None and self.fast_hash and entry.get("xxh3"):
+            fast = xxhash.xxh3_128()
+            _hash_file(key, fast)
+            if fast.hexdigest() == entry["xxh3"]:
+                self.stats["fast_matches"] += 1
+                self._record(key, stat_key, entry["sha256"], entry["xxh3"], checked_ns)
+                return entry["sha256"]
+
+        hasher = hashlib.sha256()
+        fast = xxhash.xxh3_128() if self.fast_hash else None
+        _hash_file(key, *(h for h in (hasher, fast) if h is not None))
+
+        self.stats["hashed"] += 1
+        digest = hasher.hexdigest()
+        self._record(
+            key, stat_key, digest, fast.hexdigest() if fast else None, checked_ns
+        )
+        return digest
+
+    def hashes(self, file_paths: Iterable[str]) -> Dict[str, str]:
+        """SHA-256 per path, saving the manifest once if anything changed."""
+        result = {path: self.sha256(path) for path in file_paths}
+        self.save()
+        return result
+
+    def save(self):
+        if not self.dirty:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Per process: API workers hashing the corpus at startup save together
+        tmp = self.path.with_name(f"{self.path.name}.tmp-{os.getpid()}")
+        tmp.write_text(
+            json.dumps({"version": _FORMAT_VERSION, "files": self.entries}, indent=2)
+        )
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+    def _record(
+        self,
+        key: str,
+        stat_key: Dict[str, int],
+        sha256: str,
+        xxh3: Optional[str],
+        checked_ns: int,
+    ):
+        self.entries[key] = {
+            "stat": stat_key,
+            "sha256": sha256,
+            "xxh3": xxh3,
+            "racy": stat_key["mtime_ns"] > checked_ns - _RACY_WINDOW_NS,
+        }
+        self.dirty = True
+
+
+_manifest: Optional[FileManifest] = None
+
+
+def get_manifest() -> FileManifest:
+    """Process-wide manifest at FILE_MANIFEST_PATH, loaded on first use."""
+    global _manifest
+    if _manifest is None or _manifest.path != Path(settings.FILE_MANIFEST_PATH):
+        _manifest = FileManifest(
+            settings.FILE_MANIFEST_PATH, fast_hash=settings.FILE_HASH_FAST
+        )
+    return _manifest
+
+
+def file_hashes(file_paths: Iterable[str]) -> Dict[str, str]:
+    """SHA-256 of each file, via the manifest when enabled."""
+    if not settings.FILE_MANIFEST_ENABLED:
+        result = {}
+        for path in file_paths:
+            hasher = hashlib.sha256()
+            _hash_file(path, hasher)
+            result[path] = hasher.hexdigest()
+        return result
+
+    return get_manifest().hashes(file_paths)
+
+
+def file_sha256(file_path) -> str:
+    return file_hashes([file_path])[file_path]
@@ -1,25 +1,168 @@
-import hashlib
+import gc
+import os
+import time
+import signal
+import threading
+from collections import deque
+from concurrent.futures import Future
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any
-
-from pypdf import PdfReader
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Iterator
 
+from api.config import settings
+from ingestion.page_cache import PageCache
+from ingestion.pdf_backends import PdfBackend, open_backend
+from ingestion.file_manifest import file_sha256
 from core.logger import get_logger
 from core.exceptions import CustomException
+from core.process_pool import spawn_pool
 
 
 logger = get_logger("ingestion.loader")
 
+# One backend per pool worker, opened once by the initializer
+_worker_backend: Optional[PdfBackend] = None
+
+
+class _PageTimeout(Exception):
+    pass
+
+
+@contextmanager
+def _time_limit(seconds: Optional[float]):
+    """
+    Interrupts the block after `seconds` via SIGALRM. Only available on
+    POSIX main threads (which every pool worker is); elsewhere a no-op.
+
+    The handler runs between Python bytecodes, so a call into native
+    code (pypdfium2) is not interrupted: it raises once the call returns.
+    """
+    if (
+        not seconds
+        or not hasattr(signal, "setitimer")
+        or threading.current_thread() is not threading.main_thread()
+    ):
+        yield
+        return
+
+    def on_alarm(signum, frame):
+        raise _PageTimeout()
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _init_worker(file_path: str, backend_name: str):
+    global _worker_backend
+    _worker_backend = open_backend(file_path, backend_name)
 
-def load_pdf(file_path: str) -> List[Dict[str, Any]]:
+
+def _extract_range(
+    start: int,
+    end: int,
+    timeout: Optional[float],
+    backend: Optional[PdfBackend] = None,
+) -> List[Tuple[str, bool]]:
+    """
+    Normalized text of pages [start, end), as (text, timed_out) pairs.
+    A page that exceeds `timeout` yields empty text instead of stalling
+    the build. Only the pure-Python backends (pypdf, pdfminer) are cut
+    off at `timeout`; a pypdfium2 page that runs over finishes first and
+    is then discarded as timed out.
     """
-    Loads and extracts text from a PDF file.
+    backend = backend or _worker_backend
+    pages = []
+
+    for i in range(start, end):
+        try:
+            with _time_limit(timeout):
+                raw_text = backend.page_text(i)
+        except _PageTimeout:
+            pages.append(("", True))
+            continue
+
+        pages.append((" ".join(raw_text.split()).strip(), False))
+
+    return pages
+
+
+def _resolve_workers(workers: Optional[int], n_tasks: int) -> int:
+    if workers is None:
+        workers = settings.PDF_EXTRACT_WORKERS
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return max(1, min(workers, n_tasks))
+
+
+def _iter_ranges(
+    path: Path,
+    backend: PdfBackend,
+    starts: List[int],
+    ends: List[int],
+    timeout: Optional[float],
+    workers: int,
+) -> Iterator[List[Tuple[str, bool]]]:
+    """
+    Page runs in order. With a pool, at most 2 runs per worker are in
+    flight, so a slow consumer never lets extracted text pile up.
+    """
+    if workers == 1:
+        for s, e in zip(starts, ends):
+            yield _extract_range(s, e, timeout, backend)
+        return
+
+    with spawn_pool(workers, _init_worker, (str(path), backend.name)) as pool:
+        pending = deque()
+        tasks = zip(starts, ends)
+
+        try:
+            for s, e in islice(tasks, 2 * workers):
+                pending.append(pool.submit(_extract_range, s, e, timeout))
+
+            while pending:
+                run = pending.popleft().result()
+                for s, e in islice(tasks, 1):
+                    pending.append(pool.submit(_extract_range, s, e, timeout))
+                yield run
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def iter_pdf_pages(
+    file_path: str,
+    workers: Optional[int] = None,
+    cache: Optional[bool] = None,
+    backend: Optional[str] = None,
+    doc_id: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Extracts text from a PDF file, yielding pages lazily in page order.
 
     Guarantees:
     - doc_id: Stable SHA-256 hash of file content
     - page_number: 1-indexed
     - content: Whitespace-normalized text
-    - schema: List[{content, metadata}]
+    - schema: {content, metadata} per page with text
+
+    Pages are extracted by `workers` processes (default
+    PDF_EXTRACT_WORKERS; 0 = one per CPU), each taking contiguous runs of
+    PDF_PAGES_PER_TASK pages; results come back in page order, identical
+    to a single-process run.
+
+    `doc_id` skips hashing the file when the caller already knows it.
+
+    Text comes from the `backend` library (default PDF_BACKEND, see
+    `ingestion.pdf_backends`); the page schema is the same for all.
+
+    With the page cache (`cache`, default PAGE_CACHE_ENABLED) a PDF seen
+    before is read back from PAGE_CACHE_DIR without parsing it.
     """
     try:
         path = Path(file_path)
@@ -32,48 +175,111 @@ def load_pdf(file_path: str) -> List[Dict[str, Any]]:
             path.name
         )
 
-        # Generate stable doc_id
-        sha256_hash = hashlib.sha256()
-        with open(path, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        doc_id = sha256_hash.hexdigest()
+        # Generate stable doc_id (reused from the file manifest when unchanged)
+        doc_id = doc_id or file_sha256(str(path))
+
+        def page_record(page_number: int, content: str) -> Dict[str, Any]:
+            return {
+                "content": content,
+                "metadata": {
+                    "doc_id": doc_id,
+                    "page_number": page_number,
+                    "source_file": path.name,
+                },
+            }
+
+        backend_name = backend or settings.PDF_BACKEND
+
+        page_cache = None
+        if settings.PAGE_CACHE_ENABLED if cache is None else cache:
+            page_cache = PageCache(settings.PAGE_CACHE_DIR, extractor=backend_name)
+
+            cached = page_cache.read(doc_id)
+            if cached is not None:
+                pages_with_text = 0
+                for page_number, content in cached:
+                    pages_with_text += 1
+                    yield page_record(page_number, content)
+
+                logger.info(
+                    "event=PDF_PAGE_CACHE_HIT | file=%s | pages_with_text=%d",
+                    path.name,
+                    pages_with_text,
+                )
+                return
 
-        reader = PdfReader(path)
-        total_pages = len(reader.pages)
+        pdf = open_backend(str(path), backend_name)
+        total_pages = pdf.page_count()
 
         logger.info(
-            "event=PDF_PAGES_DETECTED | file=%s | pages=%d",
+            "event=PDF_PAGES_DETECTED | file=%s | pages=%d | backend=%s",
             path.name,
-            total_pages
+            total_pages,
+            backend_name,
         )
 
-        documents: List[Dict[str, Any]] = []
-
-        for i, page in enumerate(reader.pages):
-            raw_text = page.extract_text() or ""
-            normalized = " ".join(raw_text.split()).strip()
-
-            if normalized:
-                documents.append(
-                    {
-                        "content": normalized,
-                        "metadata": {
-                            "doc_id": doc_id,
-                            "page_number": i + 1,
-                            "source_file": path.name,
-                        },
-                    }
-                )
+        timeout = settings.PDF_PAGE_TIMEOUT_SECONDS
+        step = max(1, settings.PDF_PAGES_PER_TASK)
+        starts = list(range(0, total_pages, step))
+        ends = [min(s + step, total_pages) for s in starts]
+
+        workers = _resolve_workers(workers, len(starts))
+        start_time = time.perf_counter()
+        pages_with_text = 0
+
+        runs = _iter_ranges(path, pdf, starts, ends, timeout, workers)
+        pages = (page for run in runs for page in run)
+
+        cache_writer = page_cache.writer(doc_id) if page_cache else None
+        complete = True
+
+        try:
+            for i, (normalized, timed_out) in enumerate(pages):
+                if timed_out:
+                    complete = False
+                    logger.warning(
+                        "event=PDF_PAGE_TIMEOUT | file=%s | page=%d | timeout_s=%s",
+                        path.name,
+                        i + 1,
+                        timeout,
+                    )
+
+                if normalized:
+                    pages_with_text += 1
+                    if cache_writer:
+                        cache_writer.add(i + 1, normalized)
+                    yield page_record(i + 1, normalized)
+
+        except BaseException:
+            if cache_writer:
+                cache_writer.abort()
+            raise
+
+        # A timed-out page is missing text, not empty: never cache it
+        if cache_writer:
+            if complete:
+                cache_writer.commit()
+            else:
+                cache_writer.abort()
+
+        elapsed = time.perf_counter() - start_time
+
+        # pypdf page trees are reference cycles; next to a large heap
+        # (torch) the full collection that frees them rarely runs, and a
+        # multi-PDF build would keep every parsed document alive
+        pdf.close()
+        del pdf, runs
+        gc.collect()
 
         logger.info(
-            "event=PDF_LOAD_COMPLETE | file=%s | pages_with_text=%d",
+            "event=PDF_LOAD_COMPLETE | file=%s | pages_with_text=%d"
+            " | workers=%d | pages_per_sec=%.1f",
             path.name,
-            len(documents),
+            pages_with_text,
+            workers,
+            total_pages / elapsed if elapsed > 0 else 0.0,
         )
 
-        return documents
-
     except Exception as e:
         logger.exception(
             "event=PDF_LOAD_FAILED | file=%s",
@@ -84,3 +290,123 @@ def load_pdf(file_path: str) -> List[Dict[str, Any]]:
             error=e,
             context={"file_path": file_path},
         ) from e
+
+
+def count_pages(file_path: str, backend: Optional[str] = None) -> int:
+    """Page count without extracting text (for progress and ETA)."""
+    pdf = open_backend(file_path, backend)
+    try:
+        return pdf.page_count()
+    finally:
+        pdf.close()
+
+
+def load_pdf(
+    file_path: str,
+    workers: Optional[int] = None,
+    cache: Optional[bool] = None,
+    backend: Optional[str] = None,
+    doc_id: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    All pages of `iter_pdf_pages` as a list: List[{content, metadata}].
+    """
+    return list(
+        iter_pdf_pages(
+            file_path, workers=workers, cache=cache, backend=backend, doc_id=doc_id
+        )
+    )
+
+
+def _load_document(
+    file_path: str,
+    doc_id: Optional[str],
+    backend: str,
+    cache: bool,
+) -> List[Dict[str, Any]]:
+    return load_pdf(file_path, workers=1, cache=cache, backend=backend, doc_id=doc_id)
+
+
+class DocumentPool:
+    """
+    Pages of a multi-PDF corpus, with whole documents extracted in
+    parallel by `workers` processes (default INGEST_DOC_WORKERS; 0 = one
+    per CPU).
+
+    `pages(pdf)` returns one document's pages, exactly as
+    `iter_pdf_pages` would. Documents are submitted in `pdf_paths` order,
+    at most 2 per worker ahead of the one being read, and every caller
+    gets its own document whichever worker finishes first, so the merged
+    corpus is the same as a sequential run. Documents in `skip` (pages
+    already held elsewhere) are never submitted.
+
+    With one worker or one document there is no pool: `pages` streams
+    `iter_pdf_pages`, which still spreads a single PDF's pages over
+    PDF_EXTRACT_WORKERS.
+    """
+
+    def __init__(
+        self,
+        pdf_paths: Iterable[str],
+        doc_hashes: Optional[Dict[str, str]] = None,
+        workers: Optional[int] = None,
+        skip: Iterable[str] = (),
+    ):
+        skip = set(skip)
+        self.doc_hashes = doc_hashes or {}
+        self.queue = deque(pdf for pdf in pdf_paths if pdf not in skip)
+        self.pending: Dict[str, Future] = {}
+
+        if workers is None:
+            workers = settings.INGEST_DOC_WORKERS
+        self.workers = _resolve_workers(workers, len(self.queue))
+
+        # Pool workers re-read settings on spawn; pass what may be overridden
+        self.backend = settings.PDF_BACKEND
+        self.cache = settings.PAGE_CACHE_ENABLED
+
+        self.pool = None
+        if self.workers > 1:
+            self.pool = spawn_pool(self.workers)
+            logger.info(
+                "event=DOCUMENT_POOL_START | documents=%d | workers=%d",
+                len(self.queue),
+                self.workers,
+            )
+            self._fill()
+
+    def _fill(self):
+        while self.queue and len(self.pending) < 2 * self.workers:
+            pdf = self.queue.popleft()
+            self.pending[pdf] = self.pool.submit(
+                _load_document,
+                pdf,
+                self.doc_hashes.get(pdf),
+                self.backend,
+                self.cache,
+            )
+
+    def pages(self, pdf: str) -> Iterable[Dict[str, Any]]:
+        future = self.pending.pop(pdf, None)
+
+        if future is None:
+            # No pool, or a document requested out of order: read it here
+            if pdf in self.queue:
+                self.queue.remove(pdf)
+            return iter_pdf_pages(pdf, doc_id=self.doc_hashes.get(pdf))
+
+        # Keep the workers busy while this document is consumed
+        self._fill()
+        return future.result()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            self.pool = None
+        self.pending.clear()
+
+    def __enter__(self) -> "DocumentPool":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
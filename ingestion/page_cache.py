@@ -0,0 +1,103 @@
+import os
+import gzip
+import json
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from core.logger import get_logger
+
+
+# Bumped when normalization or the record layout changes
+_FORMAT_VERSION = 1
+
+# zlib level 6: ~5x smaller than raw text, decompresses at hundreds of MB/s
+_COMPRESS_LEVEL = 6
+
+
+class PageCacheWriter:
+    """
+    Streams pages of one document into the cache. Nothing is visible to
+    readers until `commit`; an aborted or crashed write leaves no entry.
+    The temp file is per process, so document pool workers that extract
+    the same PDF never write into each other's file.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.tmp_path = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+        self._file = gzip.open(
+            self.tmp_path, "wt", encoding="utf-8", compresslevel=_COMPRESS_LEVEL
+        )
+        self.pages = 0
+
+    def add(self, page_number: int, content: str):
+        self._file.write(
+            json.dumps({"page": page_number, "text": content}, ensure_ascii=False)
+        )
+        self._file.write("\n")
+        self.pages += 1
+
+    def commit(self):
+        self._file.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        self._file.close()
+        self.tmp_path.unlink(missing_ok=True)
+
+
+class PageCache:
+    """
+    Persistent extracted page text.
+
+    Key:   doc_id (SHA-256 of the PDF bytes) + extractor name
+    Value: one gzip-compressed JSONL file per document, one
+           {"page", "text"} record per page with text, in page order
+
+    Extraction output depends only on the file bytes and the extractor,
+    so an entry never goes stale; re-chunking reads it back instead of
+    parsing the PDF again. Unbounded: entries are small (compressed text)
+    and removed by deleting the directory.
+    """
+
+    def __init__(self, root, extractor: str = "pypdf"):
+        self.root = Path(root)
+        self.extractor = extractor
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        self.logger = get_logger("ingestion.page_cache")
+
+    def path(self, doc_id: str) -> Path:
+        return self.root / f"{doc_id}.{self.extractor}.v{_FORMAT_VERSION}.jsonl.gz"
+
+    def read(self, doc_id: str) -> Optional[List[Tuple[int, str]]]:
+        """
+        (page_number, text) pairs of a cached document, else None.
+
+        The entry is decoded in full before anything is returned, so an
+        unreadable one (truncated, corrupt, removed meanwhile) is a miss
+        and the PDF is parsed again, never half-served.
+        """
+        path = self.path(doc_id)
+        if not path.exists():
+            return None
+
+        try:
+            return list(self._iter_file(path))
+        except (OSError, EOFError, ValueError, KeyError) as e:
+            self.logger.warning(
+                "event=PAGE_CACHE_UNREADABLE | file=%s | error=%s",
+                path.name,
+                type(e).__name__,
+            )
+            return None
+
+    def writer(self, doc_id: str) -> PageCacheWriter:
+        return PageCacheWriter(self.path(doc_id))
+
+    @staticmethod
+    def _iter_file(path: Path) -> Iterator[Tuple[int, str]]:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                yield record["page"], record["text"]
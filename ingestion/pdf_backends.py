@@ -0,0 +1,139 @@
+from io import StringIO
+from typing import Dict, Optional, Type
+
+from pypdf import PdfReader
+
+from api.config import settings
+
+
+class PdfBackend:
+    """
+    Raw page text of one PDF. Backends differ in speed and in how they
+    order and space text; the loader normalizes whitespace afterwards,
+    so the page schema is the same whichever one runs.
+
+    `name` is part of the page-cache key: cached text is never reused
+    across backends.
+    """
+
+    name = ""
+
+    def __init__(self, path: str):
+        self.path = str(path)
+
+    def page_count(self) -> int:
+        raise NotImplementedError
+
+    def page_text(self, index: int) -> str:
+        """Text of page `index` (0-based); "" for a page without text."""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class PypdfBackend(PdfBackend):
+    """Pure Python; the reference backend."""
+
+    name = "pypdf"
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.reader = PdfReader(self.path)
+
+    def page_count(self) -> int:
+        return len(self.reader.pages)
+
+    def page_text(self, index: int) -> str:
+        return self.reader.pages[index].extract_text() or ""
+
+    def close(self):
+        self.reader = None
+
+
+class PdfiumBackend(PdfBackend):
+    """PDFium (Chrome's PDF engine) through `pypdfium2`; native code."""
+
+    name = "pypdfium2"
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        import pypdfium2
+
+        self.document = pypdfium2.PdfDocument(self.path)
+
+    def page_count(self) -> int:
+        return len(self.document)
+
+    def page_text(self, index: int) -> str:
+        page = self.document[index]
+        textpage = page.get_textpage()
+        try:
+            return textpage.get_text_range() or ""
+        finally:
+            textpage.close()
+            page.close()
+
+    def close(self):
+        if self.document is not None:
+            self.document.close()
+            self.document = None
+
+
+class PdfminerBackend(PdfBackend):
+    """`pdfminer.six`: pure Python, layout analysis for reading order."""
+
+    name = "pdfminer"
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfdocument import PDFDocument
+        from pdfminer.pdfinterp import PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+        from pdfminer.pdfparser import PDFParser
+
+        self._file = open(self.path, "rb")
+        document = PDFDocument(PDFParser(self._file))
+        self.pages = list(PDFPage.create_pages(document))
+        self.resources = PDFResourceManager(caching=True)
+        self.laparams = LAParams()
+
+    def page_count(self) -> int:
+        return len(self.pages)
+
+    def page_text(self, index: int) -> str:
+        from pdfminer.converter import TextConverter
+        from pdfminer.pdfinterp import PDFPageInterpreter
+
+        out = StringIO()
+        device = TextConverter(self.resources, out, laparams=self.laparams)
+        try:
+            PDFPageInterpreter(self.resources, device).process_page(self.pages[index])
+        finally:
+            device.close()
+        return out.getvalue()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.pages = []
+
+
+BACKENDS: Dict[str, Type[PdfBackend]] = {
+    backend.name: backend
+    for backend in (PypdfBackend, PdfiumBackend, PdfminerBackend)
+}
+
+
+def backend_class(name: Optional[str] = None) -> Type[PdfBackend]:
+    name = name or settings.PDF_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown PDF backend: {name}")
+    return BACKENDS[name]
+
+
+def open_backend(path: str, name: Optional[str] = None) -> PdfBackend:
+    """Opens `path` with backend `name` (default PDF_BACKEND)."""
+    return backend_class(name)(path)
@@ -1,5 +1,5 @@
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator
 
 from core.logger import get_logger
 from core.exceptions import CustomException
@@ -7,6 +7,9 @@ from core.exceptions import CustomException
 
 logger = get_logger("ingestion.semantic_chunker")
 
+_PARAGRAPH_BREAK = re.compile(r"\n{2,}")
+_SEP = "\n\n"
+
 
 class SemanticChunker:
     """
@@ -24,50 +27,65 @@ class SemanticChunker:
         self.min_chars = min_chars
 
     def split_pages(self, pages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return list(self.iter_chunks(pages))
+
+    def iter_chunks(
+        self,
+        pages: Iterable[Dict[str, Any]],
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazy `split_pages`: chunks are yielded as each page is consumed,
+        so only the current page is held in memory.
+        """
         try:
             logger.info(
-                "event=SEMANTIC_CHUNKING_START | pages=%d | max_chars=%d | min_chars=%d",
-                len(pages),
+                "event=SEMANTIC_CHUNKING_START | max_chars=%d | min_chars=%d",
                 self.max_chars,
                 self.min_chars,
             )
 
-            chunks: List[Dict[str, Any]] = []
             chunk_index = 0
+            n_pages = 0
 
             for page in pages:
+                n_pages += 1
                 text = page["content"]
                 metadata = page["metadata"]
 
                 paragraphs = self._split_into_paragraphs(text)
-                buffer = ""
+
+                # Joined once per chunk; `length` tracks the joined length
+                parts: List[str] = []
+                length = 0
 
                 for para in paragraphs:
-                    if len(buffer) + len(para) <= self.max_chars:
-                        buffer = f"{buffer}\n\n{para}" if buffer else para
+                    if length + len(para) <= self.max_chars:
+                        length += len(_SEP) + len(para) if parts else len(para)
+                        parts.append(para)
                     else:
-                        if len(buffer) >= self.min_chars:
-                            chunks.append(
-                                self._make_chunk(buffer, metadata, chunk_index)
+                        if length >= self.min_chars:
+                            yield self._make_chunk(
+                                _SEP.join(parts), metadata, chunk_index
                             )
                             chunk_index += 1
-                            buffer = para
+                            parts = [para]
+                            length = len(para)
                         else:
-                            buffer = f"{buffer}\n\n{para}"
+                            # An empty buffer counts a separator too: the leading
+                            # "\n\n" that _make_chunk strips
+                            parts.append(para)
+                            length += len(_SEP) + len(para)
 
-                if buffer:
-                    chunks.append(
-                        self._make_chunk(buffer, metadata, chunk_index)
-                    )
+                if parts:
+                    yield self._make_chunk(_SEP.join(parts), metadata, chunk_index)
                     chunk_index += 1
 
             logger.info(
-                "event=SEMANTIC_CHUNKING_COMPLETE | total_chunks=%d",
-                len(chunks),
+                "event=SEMANTIC_CHUNKING_COMPLETE | pages=%d | total_chunks=%d",
+                n_pages,
+                chunk_index,
             )
 
-            return chunks
-
         except Exception as e:
             logger.exception("event=SEMANTIC_CHUNKING_FAILED")
             raise CustomException(
@@ -89,8 +107,8 @@ class SemanticChunker:
         - clinical notes
         - books
         """
-        paras = re.split("\\n{2,}", text)
-        return [p.strip() for p in paras if len(p.strip()) > 50]
+        paras = (p.strip() for p in _PARAGRAPH_BREAK.split(text))
+        return [p for p in paras if len(p) > 50]
 
     def _make_chunk(
         self,
@@ -1,27 +1,608 @@
+import os
 import re
+import math
 import pickle
+from array import array
+from collections import Counter
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple, Optional, Sequence, Iterable
 
-from rank_bm25 import BM25Okapi
+import numpy as np
+from scipy.sparse import csr_matrix, hstack
 
+from rag.chunk_store import ChunkStore, atomic_path
 from core.logger import get_logger
 from core.exceptions import CustomException
 
+
+_NON_TOKEN_PATTERN = re.compile(r"[^a-z0-9\\-\\s]")
+
+SEARCH_MODES = ("exhaustive", "maxscore")
+
+# Postings per block when computing impacts
+_IMPACT_BLOCK = 1 << 18
+
+# Relative slack on pruning bounds; far above float64 summation error,
+# so pruning never drops a document that could reach the top-k.
+_BOUND_SLACK = 1e-9
+
+# MaxScore tuning: docs used to seed the threshold, and candidates scored
+# exactly in the first refinement round (doubles every round).
+_SEED_DOCS = 256
+_REFINE_BATCH = 256
+
+
+# InvertedIndex.to_dict entries saved as .npy files next to the pickle
+_ARRAY_FIELDS = (
+    "indptr",
+    "indices",
+    "data",
+    "doc_len",
+    "live",
+    "idf",
+    "impacts",
+    "max_impacts",
+)
+
+
+class InvertedIndex:
+    """
+    Term -> postings index with precomputed BM25 (Okapi) impacts.
+
+    Layout (CSR, one row per term):
+    - indptr:  postings offsets per term id
+    - indices: doc ids, ascending within each term
+    - data:    raw term frequencies
+    - impacts: idf * tf-saturation per posting (float64)
+    - max_impacts: per-term upper bound on any posting's impact
+    - live:    False for removed documents (their ids are never reused)
+
+    Guarantees:
+    - scores identical to rank_bm25.BM25Okapi (same IDF epsilon floor,
+      same float64 expression, same per-term accumulation order)
+    - only documents containing a query term are touched
+    - after `remove_docs` / `add_docs`, scores equal a fresh build over
+      the live documents (up to float rounding in the IDF floor average)
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75, epsilon: float = 0.25):
+        self.k1 = k1
+        self.b = b
+        self.epsilon = epsilon
+
+        self.vocab: Dict[str, int] = {}
+        self.postings: csr_matrix = None
+        self.doc_len: np.ndarray = None
+        self.live: np.ndarray = None
+        self.n_live = 0
+        self.avgdl = 0.0
+        self.idf: np.ndarray = None
+        self.impacts: np.ndarray = None
+        self.max_impacts: np.ndarray = None
+
+    @property
+    def n_docs(self) -> int:
+        """Size of the doc id space, removed documents included."""
+        return 0 if self.doc_len is None else len(self.doc_len)
+
+    @classmethod
+    def from_corpus(
+        cls,
+        corpus: Iterable[List[str]],
+        **params,
+    ) -> "InvertedIndex":
+        index = cls(**params)
+
+        # Term ids follow first-seen order so the IDF average is summed
+        # in the same order as rank_bm25 (float addition is not associative).
+        vocab: Dict[str, int] = {}
+        postings, doc_len = _count_terms(corpus, vocab)
+        if not doc_len:
+            raise ValueError("BM25 build received empty chunks")
+
+        index.vocab = vocab
+        index.postings = postings
+        index.doc_len = np.asarray(doc_len, dtype=np.int64)
+        index.live = np.ones(len(doc_len), dtype=bool)
+        index.n_live = len(doc_len)
+        index.avgdl = sum(doc_len) / len(doc_len)
+        index._compute_impacts()
+
+        return index
+
+    def add_docs(self, corpus: List[List[str]]):
+        """
+        Appends documents with ids n_docs, n_docs + 1, ...; new terms
+        extend the vocab. IDF and impacts are recomputed for every term,
+        since N and avgdl change.
+        """
+        n_old = self.n_docs
+        added, doc_len = _count_terms(corpus, self.vocab)
+
+        old = self.postings
+        old_rows = np.concatenate(
+            [
+                old.indptr,
+                np.full(len(self.vocab) - old.shape[0], old.indptr[-1]),
+            ]
+        )
+        old = csr_matrix(
+            (old.data, old.indices, old_rows),
+            shape=(len(self.vocab), n_old),
+        )
+
+        self.postings = hstack([old, added], format="csr")
+        self.postings.sort_indices()
+
+        self.doc_len = np.concatenate(
+            [self.doc_len, np.asarray(doc_len, dtype=np.int64)]
+        )
+        self.live = np.concatenate([self.live, np.ones(len(doc_len), dtype=bool)])
+        self._refresh()
+
+    def remove_docs(self, doc_ids) -> int:
+        doc_ids = np.asarray(doc_ids, dtype=np.int64)
+        doc_ids = doc_ids[(doc_ids >= 0) & (doc_ids < self.n_docs)]
+        doc_ids = doc_ids[self.live[doc_ids]]
+
+        if len(doc_ids) == 0:
+            return 0
+
+        postings = self.postings
+        keep = ~np.isin(postings.indices, doc_ids)
+        term_of = np.repeat(
+            np.arange(postings.shape[0]), np.diff(postings.indptr)
+        )
+        counts = np.bincount(term_of[keep], minlength=postings.shape[0])
+
+        self.postings = csr_matrix(
+            (
+                postings.data[keep],
+                postings.indices[keep],
+                np.concatenate([[0], np.cumsum(counts)]),
+            ),
+            shape=postings.shape,
+        )
+
+        self.live = self.live.copy()
+        self.doc_len = self.doc_len.copy()
+        self.live[doc_ids] = False
+        self.doc_len[doc_ids] = 0
+        self._refresh()
+
+        return len(doc_ids)
+
+    def _refresh(self):
+        self.n_live = int(np.count_nonzero(self.live))
+        self.avgdl = (
+            self.doc_len[self.live].sum() / self.n_live if self.n_live else 0.0
+        )
+        self._compute_impacts()
+
+
+    def _compute_impacts(self):
+        n = self.n_live
+        df = np.diff(self.postings.indptr)
+
+        idf = np.zeros(len(df), dtype=np.float64)
+        idf_sum = 0
+        n_terms = 0
+        negative = []
+
+        for tid, freq in enumerate(df.tolist()):
+            # Terms only found in removed documents are not in the corpus
+            if freq == 0:
+                continue
+            value = math.log(n - freq + 0.5) - math.log(freq + 0.5)
+            idf[tid] = value
+            idf_sum += value
+            n_terms += 1
+            if value < 0:
+                negative.append(tid)
+
+        average_idf = idf_sum / n_terms if n_terms else 0.0
+        idf[negative] = self.epsilon * average_idf
+
+        self.idf = idf
+        self.impacts = np.empty(self.postings.nnz, dtype=np.float64)
+
+        # Blocks of postings keep the float64 temporaries bounded; the
+        # per-element arithmetic (and so every score) is unchanged
+        indptr = self.postings.indptr
+        for start in range(0, self.postings.nnz, _IMPACT_BLOCK):
+            end = min(start + _IMPACT_BLOCK, self.postings.nnz)
+
+            positions = np.arange(start, end)
+            term_idf = idf[np.searchsorted(indptr, positions, side="right") - 1]
+            tf = self.postings.data[start:end].astype(np.float64)
+            dl = self.doc_len[self.postings.indices[start:end]]
+
+            self.impacts[start:end] = term_idf * (
+                tf * (self.k1 + 1)
+                / (tf + self.k1 * (1 - self.b + self.b * dl / self.avgdl))
+            )
+
+        self._compute_upper_bounds()
+
+    def _compute_upper_bounds(self):
+        df = np.diff(self.postings.indptr)
+        present = df > 0
+
+        # reduceat cannot express empty segments: reduce present terms only
+        self.max_impacts = np.zeros(len(df), dtype=np.float64)
+        if present.any():
+            self.max_impacts[present] = np.maximum.reduceat(
+                self.impacts, self.postings.indptr[:-1][present]
+            )
+
+    def term_ids(self, tokens: List[str]) -> List[int]:
+        return [self.vocab[t] for t in tokens if t in self.vocab]
+
+    def score(self, tokens: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (doc_ids, scores) for every document containing at least
+        one query term. Documents not returned score exactly 0.
+        """
+        tids = self.term_ids(tokens)
+        indptr = self.postings.indptr
+        indices = self.postings.indices
+
+        if not tids:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+        spans = [(indptr[t], indptr[t + 1]) for t in tids]
+        total = sum(e - s for s, e in spans)
+
+        # Dense accumulation wins once postings cover a large share of the corpus
+        if total * 8 >= self.n_docs:
+            acc = np.zeros(self.n_docs, dtype=np.float64)
+            for s, e in spans:
+                acc[indices[s:e]] += self.impacts[s:e]
+            return np.arange(self.n_docs), acc
+
+        ids = np.concatenate([indices[s:e] for s, e in spans])
+        vals = np.concatenate([self.impacts[s:e] for s, e in spans])
+
+        doc_ids, inverse = np.unique(ids, return_inverse=True)
+        scores = np.bincount(inverse, weights=vals, minlength=len(doc_ids))
+
+        return doc_ids, scores
+
+    def _lookup(
+        self,
+        tid: int,
+        doc_ids: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        start, end = self.postings.indptr[tid], self.postings.indptr[tid + 1]
+        plist = self.postings.indices[start:end]
+
+        pos = np.minimum(np.searchsorted(plist, doc_ids), len(plist) - 1)
+        hit = plist[pos] == doc_ids
+
+        return hit, self.impacts[start + pos[hit]]
+
+    def _score_docs(self, tids: List[int], doc_ids: np.ndarray) -> np.ndarray:
+        """
+        Exact scores for the given (ascending) docs, accumulated in
+        query-term order so values match exhaustive scoring bit-for-bit.
+        """
+        acc = np.zeros(len(doc_ids), dtype=np.float64)
+        for tid in tids:
+            hit, vals = self._lookup(tid, doc_ids)
+            acc[hit] += vals
+        return acc
+
+    def score_maxscore(
+        self,
+        tokens: List[str],
+        k: int,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        MaxScore dynamic pruning.
+
+        1. Seed a threshold from docs of the highest-bound (rarest) terms.
+        2. Terms whose summed upper bounds stay below the threshold are
+           non-essential: a doc matching only those cannot reach top-k.
+        3. Candidates come from essential postings only and are scored
+           exactly in descending upper-bound order, raising the threshold
+           as they go, until no remaining candidate can beat it.
+
+        Returns a candidate set that contains the exact top-k. Falls back
+        to exhaustive scoring whenever the bounds cannot prune.
+        """
+        tids = self.term_ids(tokens)
+        unique = list(dict.fromkeys(tids))
+
+        if k <= 0 or len(unique) < 2 or self.max_impacts[unique].min() < 0:
+            return self.score(tokens)
+
+        indptr = self.postings.indptr
+        indices = self.postings.indices
+
+        multiplicity = Counter(tids)
+        bound = {t: multiplicity[t] * float(self.max_impacts[t]) for t in unique}
+        by_bound = sorted(unique, key=lambda t: bound[t], reverse=True)
+
+        # Seed with every doc of the short, high-bound lists: docs matching
+        # several rare terms give a tight threshold for very little work.
+        seed_parts = []
+        seeded = 0
+        for t in by_bound:
+            part = indices[indptr[t]:indptr[t + 1]][:_SEED_DOCS]
+            if seeded >= k and seeded + len(part) > _SEED_DOCS:
+                break
+            seed_parts.append(part)
+            seeded += len(part)
+
+        seed = np.unique(np.concatenate(seed_parts))
+        if len(seed) < k:
+            return self.score(tokens)
+
+        seed_scores = self._score_docs(tids, seed)
+        theta = np.partition(seed_scores, len(seed) - k)[len(seed) - k]
+        if theta <= 0:
+            return self.score(tokens)
+
+        limit = theta * (1 - _BOUND_SLACK)
+
+        non_essential_bound = 0.0
+        n_essential = len(by_bound)
+        while (
+            n_essential > 1
+            and non_essential_bound + bound[by_bound[n_essential - 1]] < limit
+        ):
+            n_essential -= 1
+            non_essential_bound += bound[by_bound[n_essential]]
+
+        essential = by_bound[:n_essential]
+        essential_postings = sum(indptr[t + 1] - indptr[t] for t in essential)
+
+        # Nothing prunable, or essential lists already span the corpus
+        if n_essential == len(by_bound) or essential_postings * 8 >= self.n_docs:
+            return self.score(tokens)
+
+        ids = np.concatenate(
+            [indices[indptr[t]:indptr[t + 1]] for t in essential]
+        )
+        vals = np.concatenate(
+            [
+                self.impacts[indptr[t]:indptr[t + 1]] * multiplicity[t]
+                for t in essential
+            ]
+        )
+
+        doc_ids, inverse = np.unique(ids, return_inverse=True)
+        upper = np.bincount(inverse, weights=vals, minlength=len(doc_ids))
+        upper += non_essential_bound
+
+        # Seed docs are already scored; keep the pool free of duplicates
+        keep = (upper >= limit) & ~np.isin(doc_ids, seed, assume_unique=True)
+        doc_ids, upper = doc_ids[keep], upper[keep]
+
+        # Probing each survivor costs ~log(list length) per query term;
+        # past this point one pass over all postings is cheaper.
+        total_postings = sum(indptr[t + 1] - indptr[t] for t in tids)
+        if len(doc_ids) * len(tids) * 4 > total_postings:
+            return self.score(tokens)
+
+        order = np.argsort(-upper, kind="stable")
+
+        scored_ids = [seed]
+        scored = [seed_scores]
+        pool = seed_scores
+
+        start = 0
+        batch_size = _REFINE_BATCH
+        while start < len(order):
+            batch = order[start:start + batch_size]
+            start += batch_size
+            batch_size *= 2
+
+            if upper[batch[0]] < limit:
+                break
+
+            batch_ids = np.sort(doc_ids[batch])
+            batch_scores = self._score_docs(tids, batch_ids)
+
+            scored_ids.append(batch_ids)
+            scored.append(batch_scores)
+
+            pool = np.concatenate([pool, batch_scores])
+            theta = max(theta, np.partition(pool, len(pool) - k)[len(pool) - k])
+            limit = theta * (1 - _BOUND_SLACK)
+
+        cand = np.concatenate(scored_ids)
+        order = np.argsort(cand)
+
+        return cand[order], np.concatenate(scored)[order]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "params": {"k1": self.k1, "b": self.b, "epsilon": self.epsilon},
+            "vocab": self.vocab,
+            "indptr": self.postings.indptr,
+            "indices": self.postings.indices,
+            "data": self.postings.data,
+            "doc_len": self.doc_len,
+            "avgdl": self.avgdl,
+            "idf": self.idf,
+            "impacts": self.impacts,
+            "max_impacts": self.max_impacts,
+            "live": self.live,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "InvertedIndex":
+        index = cls(**data["params"])
+        index.vocab = data["vocab"]
+        index.doc_len = data["doc_len"]
+        index.postings = csr_matrix(
+            (data["data"], data["indices"], data["indptr"]),
+            shape=(len(index.vocab), len(index.doc_len)),
+        )
+        index.avgdl = data["avgdl"]
+        index.idf = data["idf"]
+        index.impacts = data["impacts"]
+        index.max_impacts = data.get("max_impacts")
+        index.live = data.get("live")
+
+        if index.live is None:
+            index.live = np.ones(len(index.doc_len), dtype=bool)
+        index.n_live = int(np.count_nonzero(index.live))
+
+        if index.max_impacts is None:
+            index._compute_upper_bounds()
+
+        return index
+
+
+def _count_terms(
+    corpus: Iterable[List[str]],
+    vocab: Dict[str, int],
+) -> Tuple[csr_matrix, List[int]]:
+    """
+    Term x doc tf matrix for `corpus`; unseen terms are added to `vocab`
+    in first-seen order. `corpus` is consumed once, so it may be a
+    generator; postings are collected in typed arrays (4-8 bytes each
+    instead of a Python int object).
+    """
+    doc_ptr = array("q", [0])
+    term_ids = array("i")
+    tfs = array("i")
+    doc_len: List[int] = []
+
+    for tokens in corpus:
+        counts: Dict[str, int] = {}
+        for tok in tokens:
+            counts[tok] = counts.get(tok, 0) + 1
+
+        for tok, tf in counts.items():
+            tid = vocab.get(tok)
+            if tid is None:
+                tid = vocab[tok] = len(vocab)
+            term_ids.append(tid)
+            tfs.append(tf)
+
+        doc_ptr.append(len(term_ids))
+        doc_len.append(len(tokens))
+
+    doc_term = csr_matrix(
+        (
+            np.frombuffer(tfs, dtype=np.int32),
+            np.frombuffer(term_ids, dtype=np.int32),
+            np.frombuffer(doc_ptr, dtype=np.int64),
+        ),
+        shape=(len(doc_len), len(vocab)),
+    )
+
+    postings = doc_term.T.tocsr()
+    postings.sort_indices()
+
+    return postings, doc_len
+
+
+def _rank(
+    doc_ids: np.ndarray,
+    scores: np.ndarray,
+    k: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Orders candidates by score desc, doc id asc; keeps at most k.
+    Expects doc_ids ascending so ties at the cut keep the lowest ids.
+    """
+    if len(scores) > k:
+        part = np.argpartition(-scores, k - 1)[:k]
+        kth = scores[part].min()
+
+        above = np.flatnonzero(scores > kth)
+        ties = np.flatnonzero(scores == kth)[: k - len(above)]
+        keep = np.concatenate([above, ties])
+
+        doc_ids, scores = doc_ids[keep], scores[keep]
+
+    order = np.lexsort((doc_ids, -scores))
+    return doc_ids[order], scores[order]
+
+
+def top_k(
+    doc_ids: np.ndarray,
+    scores: np.ndarray,
+    n_docs: int,
+    k: int,
+    live: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Top-k over a sparse score vector (absent docs score 0).
+
+    Reproduces a stable descending sort over the full corpus: ties are
+    broken by doc id, and zero-score docs fill the tail when fewer than
+    k documents match. Docs with live=False are never returned.
+    """
+    n_live = n_docs if live is None else int(np.count_nonzero(live))
+
+    k = min(k, n_live)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+    positive = scores > 0
+    ids, vals = _rank(doc_ids[positive], scores[positive], k)
+
+    if len(ids) < k:
+        mask = np.ones(n_docs, dtype=bool) if live is None else live.copy()
+        mask[doc_ids[scores != 0]] = False
+        zero_ids = np.flatnonzero(mask)[: k - len(ids)]
+
+        ids = np.concatenate([ids, zero_ids])
+        vals = np.concatenate([vals, np.zeros(len(zero_ids))])
+
+    if len(ids) < k:
+        negative = scores < 0
+        neg_ids, neg_vals = _rank(
+            doc_ids[negative], scores[negative], k - len(ids)
+        )
+        ids = np.concatenate([ids, neg_ids])
+        vals = np.concatenate([vals, neg_vals])
+
+    return ids, vals
+
+
 class BM25Store:
     """
     Sparse lexical retriever (BM25).
 
-    Guarantees: 
+    Guarantees:
     - deterministic preprocessing
     - strict build/load lifecycle
     - aligned document corpus
+    - query cost proportional to matching postings, not corpus size
+    - "maxscore" search mode returns exactly the "exhaustive" top-k
+
+    On disk: <path> (params + vocab), <stem>_arrays/*.npy (postings,
+    impacts) and a <stem>_docs chunk store. mmap=True maps the arrays and
+    documents read-only instead of copying them into the process.
+
+    With a shared `chunk_store`, doc id i is row i of that store and no
+    documents are saved with the index.
     """
 
-    def __init__(self, path: str):
+    def __init__(
+        self,
+        path: str,
+        search_mode: str = "exhaustive",
+        mmap: bool = False,
+        chunk_store: Optional[ChunkStore] = None,
+    ):
+        if search_mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown BM25 search mode: {search_mode}")
+
         self.path = Path(path)
-        self.bm25 = None
-        self.documents: List[Dict[str, Any]] = []
+        self.arrays_dir = self.path.with_name(self.path.stem + "_arrays")
+        self.docs_path = self.path.with_name(self.path.stem + "_docs")
+        self.search_mode = search_mode
+        self.mmap = mmap
+        self.index: InvertedIndex = None
+        self.chunk_store = chunk_store
+        self.documents: Sequence[Dict[str, Any]] = []
 
         self._built = False
         self._loaded = False
@@ -40,41 +621,106 @@ class BM25Store:
         text = text.replace("/", " ")
 
         # keep words, numbers, hyphens (important for medical terms)
-        text = re.sub(r"[^a-z0-9\\-\\s]", " ", text)
+        text = _NON_TOKEN_PATTERN.sub(" ", text)
 
         tokens = text.split()
         return tokens
 
-    def build(self, chunks: List[Dict[str, Any]]):
+    def build(self, chunks: Iterable[Dict[str, Any]]):
+        """
+        `chunks` is read once; with a shared chunk store it can be the
+        store itself, which is decoded row by row instead of held in memory.
+        """
         if self._loaded:
             raise RuntimeError("Cannot build BM25 after loading")
 
-        if not chunks:
-            raise ValueError("BM25 build received empty chunks")
+        if self.chunk_store is None:
+            chunks = list(chunks)
+
+        corpus = (self._preprocess(c["content"]) for c in chunks)
+        index = InvertedIndex.from_corpus(corpus)
+
+        self.index = index
+        if self.chunk_store is not None:
+            if len(self.chunk_store) != index.n_docs:
+                raise ValueError("BM25 chunks are not aligned with the chunk store")
+            self.documents = self.chunk_store
+        else:
+            self.documents = chunks
+        self._built = True
+
+        self.logger.info(
+            "event=BM25_BUILT | docs=%d | terms=%d | postings=%d",
+            index.n_docs,
+            len(self.index.vocab),
+            self.index.postings.nnz,
+        )
+
+    def add_documents(self, chunks: List[Dict[str, Any]]):
+        """
+        Indexes chunks as doc ids n_docs, n_docs + 1, ...; with a shared
+        chunk store they must already be its last rows.
+        """
+        if self.index is None:
+            raise RuntimeError("BM25 index not initialized")
 
-        corpus = [self._preprocess(c["content"]) for c in chunks]
+        if self.chunk_store is not None:
+            if len(self.chunk_store) != self.index.n_docs + len(chunks):
+                raise ValueError("BM25 chunks are not aligned with the chunk store")
+        else:
+            self.documents = list(self.documents) + list(chunks)
 
-        self.bm25 = BM25Okapi(corpus)
-        self.documents = chunks
+        self.index.add_docs([self._preprocess(c["content"]) for c in chunks])
         self._built = True
 
         self.logger.info(
-            "event=BM25_BUILT | docs=%d",
+            "event=BM25_DOCS_ADDED | docs=%d | live=%d | terms=%d",
             len(chunks),
+            self.index.n_live,
+            len(self.index.vocab),
         )
 
+    def remove_documents(self, doc_ids) -> int:
+        if self.index is None:
+            raise RuntimeError("BM25 index not initialized")
+
+        removed = self.index.remove_docs(doc_ids)
+        self._built = True
+
+        self.logger.info(
+            "event=BM25_DOCS_REMOVED | docs=%d | live=%d",
+            removed,
+            self.index.n_live,
+        )
+        return removed
+
     def save(self):
-        if not self._built or self.bm25 is None:
+        if not self._built or self.index is None:
             raise RuntimeError("Cannot save empty BM25 index")
 
-        with open(self.path, "wb") as f:
+        state = self.index.to_dict()
+        arrays = {name: state.pop(name) for name in _ARRAY_FIELDS}
+
+        self.arrays_dir.mkdir(parents=True, exist_ok=True)
+        for name, arr in arrays.items():
+            target = self.arrays_dir / f"{name}.npy"
+            tmp = atomic_path(target)
+            with open(tmp, "wb") as f:
+                np.save(f, np.ascontiguousarray(arr))
+            os.replace(tmp, target)
+
+        if self.chunk_store is None:
+            ChunkStore.write(self.docs_path, self.documents)
+
+        # The pickle is written last: it is what load() keys on
+        tmp = atomic_path(self.path)
+        with open(tmp, "wb") as f:
             pickle.dump(
-                {
-                    "bm25": self.bm25,
-                    "documents": self.documents,
-                },
+                {"index": state, "arrays": list(arrays)},
                 f,
+                protocol=pickle.HIGHEST_PROTOCOL,
             )
+        os.replace(tmp, self.path)
 
         self.logger.info(
             "event=BM25_SAVED | path=%s | docs=%d",
@@ -92,40 +738,91 @@ class BM25Store:
         with open(self.path, "rb") as f:
             data = pickle.load(f)
 
-        self.bm25 = data["bm25"]
-        self.documents = data["documents"]
+        if "arrays" in data:
+            mmap_mode = "r" if self.mmap else None
+            for name in data["arrays"]:
+                data["index"][name] = np.load(
+                    self.arrays_dir / f"{name}.npy",
+                    mmap_mode=mmap_mode,
+                )
+
+        if self.chunk_store is not None:
+            self.documents = self.chunk_store
+        elif "documents" in data:
+            self.documents = data["documents"]
+        else:
+            docs = ChunkStore(self.docs_path).open()
+            if self.mmap:
+                self.documents = docs
+            else:
+                self.documents = list(docs)
+                docs.close()
+
+        if "index" in data:
+            self.index = InvertedIndex.from_dict(data["index"])
+        elif self.documents:
+            # Legacy rank_bm25 pickle: re-index from the stored chunks
+            self.logger.warning("event=BM25_LEGACY_REINDEX")
+            self.index = InvertedIndex.from_corpus(
+                [self._preprocess(c["content"]) for c in self.documents]
+            )
+
         self._loaded = True
 
-        if self.bm25 is None or not self.documents:
+        if self.index is None or not self.documents:
             raise RuntimeError("Loaded BM25 index is invalid")
 
+        if self.index.n_docs != len(self.documents):
+            raise RuntimeError("Loaded BM25 index/document length mismatch")
+
         self.logger.info(
-            "event=BM25_LOADED | docs=%d",
+            "event=BM25_LOADED | docs=%d | mmap=%s",
             len(self.documents),
+            self.mmap,
         )
 
-    def search(self, query: str, k: int):
-        if self.bm25 is None:
+    def search(self, query: str, k: int, mode: Optional[str] = None):
+        if self.index is None:
             raise RuntimeError("BM25 index not initialized")
 
+        mode = mode or self.search_mode
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown BM25 search mode: {mode}")
+
         tokens = self._preprocess(query)
-        scores = self.bm25.get_scores(tokens)
 
-        top_indices = sorted(
-            range(len(scores)),
-            key=lambda i: scores[i],
-            reverse=True,
-        )[:k]
+        try:
+            if mode == "maxscore":
+                doc_ids, scores = self.index.score_maxscore(tokens, k)
+            else:
+                doc_ids, scores = self.index.score(tokens)
+            # live only matters once documents have been removed
+            live = None
+            if self.index.n_live < self.index.n_docs:
+                live = self.index.live
+
+            top_ids, top_scores = top_k(
+                doc_ids, scores, self.index.n_docs, k, live
+            )
+        except Exception as e:
+            self.logger.exception("event=BM25_SEARCH_FAILED")
+            raise CustomException(
+                "BM25 search failed",
+                error=e,
+                context={"query_len": len(tokens), "k": k, "mode": mode},
+            ) from e
 
         results = [
-            (self.documents[i], float(scores[i]))
-            for i in top_indices
+            (self.documents[i], float(s))
+            for i, s in zip(top_ids.tolist(), top_scores.tolist())
         ]
 
         self.logger.info(
-            "event=BM25_SEARCH | query_len=%d | returned=%d",
+            "event=BM25_SEARCH | mode=%s | query_len=%d | candidates=%d | returned=%d",
+            mode,
             len(tokens),
+            len(doc_ids),
             len(results),
         )
 
-        return results
\ No newline at end of file
+        return results
@@ -0,0 +1,136 @@
+import os
+import json
+import shutil
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Iterator, Tuple, Callable
+
+import numpy as np
+
+from rag.chunk_store import atomic_path
+from core.logger import get_logger
+
+
+class BuildCheckpoint:
+    """
+    On-disk progress of one index rebuild, so a killed build resumes from
+    its last completed shard instead of page 1.
+
+    Layout (under `root`):
+    - state.json:                 fingerprint + completed shards
+    - pages/<sha256>.jsonl:       extracted pages of each finished PDF
+                                  (when the page cache is off)
+    - shard_<n>.jsonl / .npy:     chunks and their float32 embeddings
+
+    Every file is written then renamed, and state.json last, so a crash
+    leaves at worst an unlisted shard that is redone. A checkpoint from a
+    different fingerprint (PDFs or config changed) is discarded.
+    """
+
+    def __init__(self, root, fingerprint: str):
+        self.root = Path(root)
+        self.fingerprint = fingerprint
+        self.state_path = self.root / "state.json"
+        self.pages_dir = self.root / "pages"
+
+        self.shards: List[Dict[str, Any]] = []
+        self.logger = get_logger("rag.build_checkpoint")
+
+        if self.state_path.exists():
+            state = json.loads(self.state_path.read_text())
+            if state.get("fingerprint") == fingerprint:
+                self.shards = state["shards"]
+            else:
+                self.clear()
+
+        self.pages_dir.mkdir(parents=True, exist_ok=True)
+
+        if self.shards:
+            self.logger.info(
+                "event=BUILD_CHECKPOINT_RESUMED | shards=%d | rows=%d",
+                len(self.shards),
+                self.rows,
+            )
+
+    @property
+    def rows(self) -> int:
+        """Chunks already embedded; the build skips this many."""
+        return sum(shard["rows"] for shard in self.shards)
+
+    def has_pages(self, doc_sha: str) -> bool:
+        """Whether `pages` replays this PDF instead of extracting it."""
+        return (self.pages_dir / f"{doc_sha}.jsonl").exists()
+
+    def pages(
+        self,
+        doc_sha: str,
+        extract: Callable[[], Iterable[Dict[str, Any]]],
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Pages of one PDF: replayed from the checkpoint if its extraction
+        finished before, otherwise extracted and recorded as they pass.
+        """
+        path = self.pages_dir / f"{doc_sha}.jsonl"
+
+        if self.has_pages(doc_sha):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    yield json.loads(line)
+            return
+
+        tmp = atomic_path(path)
+        with open(tmp, "w", encoding="utf-8") as f:
+            for page in extract():
+                f.write(json.dumps(page, ensure_ascii=False))
+                f.write("\n")
+                yield page
+
+        os.replace(tmp, path)
+
+    def add_shard(self, chunks: List[Dict[str, Any]], vectors: np.ndarray):
+        name = f"shard_{len(self.shards):05d}"
+
+        chunks_path = self.root / f"{name}.jsonl"
+        tmp = atomic_path(chunks_path)
+        with open(tmp, "w", encoding="utf-8") as f:
+            for chunk in chunks:
+                f.write(json.dumps(chunk, ensure_ascii=False))
+                f.write("\n")
+        os.replace(tmp, chunks_path)
+
+        vectors_path = self.root / f"{name}.npy"
+        tmp = atomic_path(vectors_path)
+        with open(tmp, "wb") as f:
+            np.save(f, np.asarray(vectors, dtype=np.float32))
+        os.replace(tmp, vectors_path)
+
+        self.shards.append({"name": name, "rows": len(chunks)})
+        self._write_state()
+
+        self.logger.info(
+            "event=BUILD_CHECKPOINT_SHARD | shard=%s | rows=%d | total_rows=%d",
+            name,
+            len(chunks),
+            self.rows,
+        )
+
+    def batches(self) -> Iterator[Tuple[List[Dict[str, Any]], np.ndarray]]:
+        """Completed shards in order, as (chunks, vectors)."""
+        for shard in self.shards:
+            with open(self.root / f"{shard['name']}.jsonl", encoding="utf-8") as f:
+                chunks = [json.loads(line) for line in f]
+            vectors = np.load(self.root / f"{shard['name']}.npy", mmap_mode="r")
+            yield chunks, vectors
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+        self.shards = []
+
+    def _write_state(self):
+        tmp = atomic_path(self.state_path)
+        tmp.write_text(
+            json.dumps(
+                {"fingerprint": self.fingerprint, "shards": self.shards},
+                indent=2,
+            )
+        )
+        os.replace(tmp, self.state_path)
@@ -0,0 +1,123 @@
+"""
+Builds (or updates) the retrieval index ahead of API startup.
+
+    python -m rag.build_index
+    python -m rag.build_index data/a.pdf data/b.pdf
+    python -m rag.build_index --corpus data/pdfs/
+    python -m rag.build_index --corpus corpus.yaml
+    python -m rag.build_index --restart
+
+Uses the CORPUS_SOURCE corpus (a directory or YAML manifest; INDEX_PDFS
+when unset) by default. A rebuild checkpoints its embeddings in shards
+under data/index/build; rerunning after a crash or Ctrl-C resumes from
+the last completed shard. Progress, throughput and ETA are printed to
+stderr.
+"""
+
+import sys
+import time
+import shutil
+import argparse
+from typing import Dict, Any, Optional
+
+from rag.index_manager import build_or_load_index, BUILD_DIR
+from ingestion.corpus import load_corpus
+
+
+def format_seconds(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:d}:{minutes:02d}:{seconds:02d}"
+
+
+class ProgressPrinter:
+    """
+    One status line per progress event. Rates are measured from the
+    first event of this run, so resumed work does not inflate them.
+    """
+
+    def __init__(self, stream=sys.stderr):
+        self.stream = stream
+        self.first: Optional[Dict[str, Any]] = None
+
+    def __call__(self, event: Dict[str, Any]):
+        if self.first is None:
+            self.first = event
+
+        elapsed = event["elapsed_s"] - self.first["elapsed_s"]
+        pages = event["pages_done"] - self.first["pages_done"]
+        chunks = event["chunks_done"] - self.first["chunks_done"]
+
+        line = (
+            f"pages {event['pages_done']}/{event['pages_total']}"
+            f" ({100 * event['pages_done'] / max(event['pages_total'], 1):.1f}%)"
+            f" | chunks {event['chunks_done']}"
+        )
+        if event["chunks_resumed"]:
+            line += f" ({event['chunks_resumed']} resumed)"
+
+        if elapsed > 0 and pages > 0:
+            pages_per_sec = pages / elapsed
+            eta = (event["pages_total"] - event["pages_done"]) / pages_per_sec
+            line += (
+                f" | {pages_per_sec:.1f} pages/s"
+                f" | {chunks / elapsed:.1f} chunks/s"
+                f" | ETA {format_seconds(eta)}"
+            )
+
+        self.stream.write("\r" + line.ljust(100))
+        self.stream.flush()
+
+    def close(self):
+        if self.first is not None:
+            self.stream.write("\n")
+            self.stream.flush()
+            self.first = None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "pdfs",
+        nargs="*",
+        help="PDFs to index (default: the corpus, see --corpus)",
+    )
+    parser.add_argument(
+        "--corpus",
+        default=None,
+        help="directory of PDFs or YAML manifest (default: CORPUS_SOURCE)",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="discard the checkpoint of an interrupted build",
+    )
+    args = parser.parse_args(argv)
+
+    if args.restart:
+        shutil.rmtree(BUILD_DIR, ignore_errors=True)
+
+    pdfs = args.pdfs or load_corpus(args.corpus)
+
+    printer = ProgressPrinter()
+    start = time.perf_counter()
+
+    try:
+        faiss_store, bm25_store = build_or_load_index(pdfs, progress=printer)
+    except KeyboardInterrupt:
+        printer.close()
+        print("Interrupted; rerun to resume from the last checkpoint.", file=sys.stderr)
+        return 130
+    finally:
+        printer.close()
+
+    print(
+        f"Index ready in {format_seconds(time.perf_counter() - start)}: "
+        f"{faiss_store.index.ntotal} vectors, {bm25_store.index.n_live} BM25 docs "
+        f"({faiss_store.describe()})"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+import os
+import json
+import mmap
+from array import array
+from collections.abc import Sequence
+from pathlib import Path
+from typing import List, Dict, Any, Iterable
+
+import numpy as np
+
+from core.logger import get_logger
+
+
+def atomic_path(path: Path) -> Path:
+    """
+    Temporary sibling for write-then-rename, named per process so two
+    writers never share (and corrupt) one temp file.
+
+    Files may be memory-mapped by running API workers; replacing them with
+    os.replace keeps those mappings on the old inode instead of letting a
+    rebuild truncate pages under a live reader.
+    """
+    return path.with_name(f"{path.name}.tmp-{os.getpid()}")
+
+
+class ChunkStore(Sequence):
+    """
+    Read-only, memory-mapped sequence of chunk dicts.
+
+    Layout (one logical store, two files):
+    - <path>.jsonl:        one JSON-encoded chunk per line
+    - <path>.offsets.npy:  int64 byte offsets, len = n_chunks + 1
+
+    Only the offsets are read at open; a chunk is decoded when indexed,
+    so resident memory is the page-cache pages actually touched, shared
+    by every process that maps the same file.
+
+    Append-only: row ids never change. Rows of removed documents stay in
+    the file until the next full rebuild.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.data_path = self.path.with_suffix(".jsonl")
+        self.offsets_path = self.path.with_suffix(".offsets.npy")
+
+        self._file = None
+        self._data = None
+        self._offsets = None
+
+        self.logger = get_logger("rag.chunk_store")
+
+    def exists(self) -> bool:
+        return self.data_path.exists() and self.offsets_path.exists()
+
+    @classmethod
+    def write(cls, path, chunks: Iterable[Dict[str, Any]]) -> "ChunkStore":
+        store = cls(path)
+        store.path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Typed array: `chunks` may be a stream of millions of rows
+        offsets = array("q", [0])
+        tmp_data = atomic_path(store.data_path)
+
+        with open(tmp_data, "wb") as f:
+            for chunk in chunks:
+                line = json.dumps(chunk, ensure_ascii=False).encode("utf-8")
+                f.write(line)
+                f.write(b"\n")
+                offsets.append(offsets[-1] + len(line) + 1)
+
+        tmp_offsets = atomic_path(store.offsets_path)
+        with open(tmp_offsets, "wb") as f:
+            np.save(f, np.frombuffer(offsets, dtype=np.int64))
+
+        os.replace(tmp_data, store.data_path)
+        os.replace(tmp_offsets, store.offsets_path)
+
+        store.logger.info(
+            "event=CHUNK_STORE_WRITTEN | path=%s | chunks=%d | bytes=%d",
+            store.data_path,
+            len(offsets) - 1,
+            offsets[-1],
+        )
+        return store
+
+    def open(self) -> "ChunkStore":
+        if not self.exists():
+            raise FileNotFoundError(f"Chunk store missing: {self.path}")
+
+        self._offsets = np.load(self.offsets_path, mmap_mode="r")
+
+        self._file = open(self.data_path, "rb")
+        # mmap of an empty file is an error; an empty store has no reads
+        if self._offsets[-1] > 0:
+            self._data = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+
+        return self
+
+    def append(self, chunks: Iterable[Dict[str, Any]]) -> range:
+        """
+        Appends chunks and returns their row ids. Existing bytes are never
+        rewritten, so mappings held by other processes stay valid; the
+        offsets file is replaced atomically.
+
+        Bytes past the last offset are left by an append that failed
+        midway (no offsets point to them); they are cut first, so new
+        rows start exactly where the offsets say.
+        """
+        if self._offsets is None:
+            raise RuntimeError("Chunk store must be open to append")
+
+        end = int(self._offsets[-1])
+        offsets = array("q", [end])
+        start = len(self)
+
+        with open(self.data_path, "r+b") as f:
+            if f.seek(0, os.SEEK_END) != end:
+                self.logger.warning(
+                    "event=CHUNK_STORE_TAIL_TRUNCATED | path=%s | bytes=%d",
+                    self.data_path,
+                    f.tell() - end,
+                )
+                f.truncate(end)
+                f.seek(end)
+
+            for chunk in chunks:
+                line = json.dumps(chunk, ensure_ascii=False).encode("utf-8")
+                f.write(line)
+                f.write(b"\n")
+                offsets.append(offsets[-1] + len(line) + 1)
+
+        merged = np.concatenate(
+            [
+                np.asarray(self._offsets[:-1], dtype=np.int64),
+                np.frombuffer(offsets, dtype=np.int64),
+            ]
+        )
+
+        tmp_offsets = atomic_path(self.offsets_path)
+        with open(tmp_offsets, "wb") as f:
+            np.save(f, merged)
+        os.replace(tmp_offsets, self.offsets_path)
+
+        self.close()
+        self.open()
+
+        rows = range(start, len(self))
+        self.logger.info(
+            "event=CHUNK_STORE_APPENDED | path=%s | chunks=%d | total=%d",
+            self.data_path,
+            len(rows),
+            len(self),
+        )
+        return rows
+
+    def close(self):
+        if self._data is not None:
+            self._data.close()
+        if self._file is not None:
+            self._file.close()
+        self._data = self._file = self._offsets = None
+
+    def __len__(self) -> int:
+        if self._offsets is None:
+            return 0
+        return len(self._offsets) - 1
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+
+        n = len(self)
+        idx = int(idx)
+        if idx < 0:
+            idx += n
+        if not 0 <= idx < n:
+            raise IndexError("chunk index out of range")
+
+        start = int(self._offsets[idx])
+        end = int(self._offsets[idx + 1]) - 1
+        return json.loads(self._data[start:end])
+
+    def take(self, ids: Iterable[int]) -> List[Dict[str, Any]]:
+        return [self[i] for i in ids]
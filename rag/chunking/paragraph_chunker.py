@@ -1,6 +1,10 @@
 
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator
+
+
+_PARAGRAPH_BREAK = re.compile(r"\n{2,}")
+_SEP = "\n\n"
 
 
 class ParagraphChunker:
@@ -10,35 +14,43 @@ class ParagraphChunker:
         self.min_chars = min_chars
 
     def split_pages(self, pages: List[Dict[str, Any]]):
-        chunks = []
+        return list(self.iter_chunks(pages))
+
+    def iter_chunks(self, pages: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
         idx = 0
 
         for page in pages:
-            paras = re.split(r"\n{2,}", page["content"])
-            paras = [p.strip() for p in paras if len(p.strip()) > 30]
+            paras = (p.strip() for p in _PARAGRAPH_BREAK.split(page["content"]))
+            paras = [p for p in paras if len(p) > 30]
 
-            buffer = ""
+            # Parts joined by _SEP once per chunk; `length` is the joined length
+            parts: List[str] = []
+            length = 0
 
             for para in paras:
-                if len(buffer) + len(para) <= self.max_chars:
-                    buffer += ("\n\n" + para) if buffer else para
+                if length + len(para) <= self.max_chars:
+                    length += len(_SEP) + len(para) if parts else len(para)
+                    parts.append(para)
                 else:
-                    if len(buffer) >= self.min_chars:
-                        chunks.append(self._make_chunk(buffer, page["metadata"], idx))
+                    if length >= self.min_chars:
+                        yield self._make_chunk(_SEP.join(parts), page["metadata"], idx)
                         idx += 1
-                        buffer = para
+                        parts = [para]
+                        length = len(para)
                     else:
-                        buffer += "\n\n" + para
-
-            if buffer:
-                chunks.append(self._make_chunk(buffer, page["metadata"], idx))
+                        # An empty buffer still gets the separator prepended
+                        if not parts:
+                            parts.append("")
+                        parts.append(para)
+                        length += len(_SEP) + len(para)
+
+            if parts:
+                yield self._make_chunk(_SEP.join(parts), page["metadata"], idx)
                 idx += 1
 
-        return chunks
-
     def _make_chunk(self, text, meta, idx):
         return {
             "chunk_id": f"{meta['doc_id']}_p{meta['page_number']}_s{idx}",
             "content": text,
             "metadata": meta,
-        }
\ No newline at end of file
+        }
@@ -1,6 +1,9 @@
 
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator
+
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?]) +")
 
 
 class SentenceChunker:
@@ -9,38 +12,39 @@ class SentenceChunker:
         self.target_chars = target_chars
 
     def split_pages(self, pages: List[Dict[str, Any]]):
-        chunks = []
+        return list(self.iter_chunks(pages))
+
+    def iter_chunks(self, pages: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
         idx = 0
 
         for page in pages:
-            sentences = re.split(r'(?<=[.!?]) +', page["content"])
+            # Sentences joined by a space once per chunk; `length` is the joined length
+            parts: List[str] = []
+            length = 0
 
-            buffer = ""
-
-            for sent in sentences:
+            for sent in _SENTENCE_BOUNDARY.split(page["content"]):
                 sent = sent.strip()
                 if not sent:
                     continue
 
-                sep = 1 if buffer else 0
-                if len(buffer) + sep + len(sent) <= self.target_chars:
-                    buffer = f"{buffer} {sent}" if buffer else sent
+                sep = 1 if parts else 0
+                if length + sep + len(sent) <= self.target_chars:
+                    parts.append(sent)
+                    length += sep + len(sent)
                 else:
-                    if buffer.strip():
-                        chunks.append(self._make_chunk(buffer.strip(), page["metadata"], idx))
+                    if parts:
+                        yield self._make_chunk(" ".join(parts), page["metadata"], idx)
                         idx += 1
-                    buffer = sent
+                    parts = [sent]
+                    length = len(sent)
 
-            if buffer.strip():
-                chunks.append(self._make_chunk(buffer.strip(), page["metadata"], idx))
+            if parts:
+                yield self._make_chunk(" ".join(parts), page["metadata"], idx)
                 idx += 1
 
-
-        return chunks
-
     def _make_chunk(self, text, meta, idx):
         return {
             "chunk_id": f"{meta['doc_id']}_p{meta['page_number']}_s{idx}",
             "content": text,
             "metadata": meta,
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,124 @@
+
+import re
+from itertools import islice
+from typing import List, Dict, Any, Iterable, Iterator, Tuple
+
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
+
+class TokenChunker:
+    """
+    Packs whole sentences into chunks of at most `max_tokens` word pieces
+    of the embedding model's tokenizer (special tokens included), so no
+    chunk loses text to truncation at embedding time.
+
+    Sentences of `batch_pages` pages are tokenized in one call of the fast
+    tokenizer. A sentence longer than the budget on its own is cut at
+    word boundaries into full-budget windows.
+
+    Defaults come from `EmbeddingService`: its tokenizer and
+    `max_seq_length` (256 for all-MiniLM-L6-v2).
+    """
+
+    def __init__(self, tokenizer=None, max_tokens=None, batch_pages=64):
+        if tokenizer is None or max_tokens is None:
+            from rag.embedder import EmbeddingService
+
+            service = EmbeddingService()
+            tokenizer = tokenizer or service.tokenizer
+            max_tokens = max_tokens or service.max_seq_length
+
+        if not getattr(tokenizer, "is_fast", False):
+            raise ValueError("TokenChunker needs a fast (Rust-backed) tokenizer")
+
+        self.tokenizer = tokenizer
+        self.max_tokens = max_tokens
+        # [CLS]/[SEP] (or the model's equivalents) count against the limit
+        self.budget = max_tokens - tokenizer.num_special_tokens_to_add()
+        self.batch_pages = batch_pages
+
+    def split_pages(self, pages: List[Dict[str, Any]]):
+        return list(self.iter_chunks(pages))
+
+    def iter_chunks(self, pages: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        idx = 0
+        pages = iter(pages)
+
+        while batch := list(islice(pages, self.batch_pages)):
+            page_sentences = [self._split_sentences(p["content"]) for p in batch]
+            flat = [s for sentences in page_sentences for s in sentences]
+            if not flat:
+                continue
+
+            encoded = self.tokenizer(
+                flat,
+                add_special_tokens=False,
+                return_offsets_mapping=True,
+                return_attention_mask=False,
+                return_token_type_ids=False,
+            )
+
+            first = 0
+            for page, sentences in zip(batch, page_sentences):
+                for text, n_tokens in self._pack(encoded, sentences, first):
+                    yield self._make_chunk(text, n_tokens, page["metadata"], idx)
+                    idx += 1
+                first += len(sentences)
+
+    def _split_sentences(self, text: str) -> List[str]:
+        sentences = (s.strip() for s in _SENTENCE_BOUNDARY.split(text))
+        return [s for s in sentences if s]
+
+    def _pack(self, encoded, sentences: List[str], first: int) -> Iterator[Tuple[str, int]]:
+        buffer: List[str] = []
+        n_buffer = 0
+
+        for i, sent in enumerate(sentences, start=first):
+            n_tokens = len(encoded["offset_mapping"][i])
+
+            if n_tokens > self.budget:
+                if buffer:
+                    yield " ".join(buffer), n_buffer
+                    buffer, n_buffer = [], 0
+                yield from self._windows(encoded, i, sent)
+                continue
+
+            if buffer and n_buffer + n_tokens > self.budget:
+                yield " ".join(buffer), n_buffer
+                buffer, n_buffer = [], 0
+
+            buffer.append(sent)
+            n_buffer += n_tokens
+
+        if buffer:
+            yield " ".join(buffer), n_buffer
+
+    def _windows(self, encoded, i: int, sent: str) -> Iterator[Tuple[str, int]]:
+        """
+        Cuts one oversized sentence. Windows end on a word boundary, so
+        re-tokenizing a window gives back exactly its own word pieces.
+        """
+        offsets = encoded["offset_mapping"][i]
+        word_ids = encoded.word_ids(i)
+        start = 0
+
+        while start < len(offsets):
+            end = min(start + self.budget, len(offsets))
+            if end < len(offsets):
+                cut = end
+                while cut > start + 1 and word_ids[cut] == word_ids[cut - 1]:
+                    cut -= 1
+                # A single word longer than the budget is cut mid-word
+                if word_ids[cut] != word_ids[cut - 1]:
+                    end = cut
+
+            yield sent[offsets[start][0]:offsets[end - 1][1]], end - start
+            start = end
+
+    def _make_chunk(self, text, n_tokens, meta, idx):
+        return {
+            "chunk_id": f"{meta['doc_id']}_p{meta['page_number']}_s{idx}",
+            "content": text,
+            "metadata": {**meta, "token_count": n_tokens},
+        }
@@ -1,55 +1,338 @@
-import torch
-from typing import List
+import os
+import queue
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, List, Dict, Any, Optional
 
+import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
 
 from api.config import settings
+from rag.embedding_cache import normalize_text
 from core.logger import get_logger
 from core.exceptions import CustomException
 
 
 logger = get_logger("rag.embedder")
 
+# Lookups between two QUERY_CACHE_STATS log lines
+_STATS_EVERY = 1000
+
+# Forward passes between two QUERY_BATCH_STATS log lines
+_BATCH_STATS_EVERY = 1000
+
+# Token-length bucket width for batching; bounds padding per input
+_BUCKET_TOKENS = 32
+
+EMBEDDING_BACKENDS = ("torch", "onnx")
+ONNX_QUANTIZE_TARGETS = ("arm64", "avx2", "avx512", "avx512_vnni")
+
+
+class QueryEmbeddingCache:
+    """
+    Bounded in-memory LRU of query embeddings.
+
+    Key:   normalized query text (NFC, collapsed whitespace); the model
+           sees the normalized text, so every spelling of a key gets the
+           same vector
+    Value: read-only float32 vector, exactly as returned by the model
+
+    Entries belong to the model named by `bind`; binding another model
+    empties the cache. Thread-safe; `max_entries` = 0 disables it.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.model_name: Optional[str] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def bind(self, model_name: str):
+        with self._lock:
+            if model_name == self.model_name:
+                return
+            if self._entries:
+                logger.info(
+                    "event=QUERY_CACHE_INVALIDATED | old_model=%s | new_model=%s | entries=%d",
+                    self.model_name,
+                    model_name,
+                    len(self._entries),
+                )
+            self._entries.clear()
+            self.model_name = model_name
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        if not self.max_entries:
+            return None
+
+        with self._lock:
+            vector = self._entries.get(text)
+            if vector is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(text)
+            lookups = self.hits + self.misses
+
+        if lookups % _STATS_EVERY == 0:
+            self.log_stats()
+        return vector
+
+    def put(self, text: str, vector: np.ndarray, model_name: str):
+        if not self.max_entries:
+            return
+
+        vector.setflags(write=False)
+        with self._lock:
+            # Computed by a model that was replaced meanwhile
+            if model_name != self.model_name:
+                return
+            self._entries[text] = vector
+            self._entries.move_to_end(text)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "model": self.model_name,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def log_stats(self):
+        stats = self.stats()
+        logger.info(
+            "event=QUERY_CACHE_STATS | entries=%d | hits=%d | misses=%d"
+            " | evictions=%d | hit_rate=%.3f",
+            stats["entries"],
+            stats["hits"],
+            stats["misses"],
+            stats["evictions"],
+            stats["hit_rate"],
+        )
+
+
+class QueryBatcher:
+    """
+    Dynamic micro-batching of single-query embeddings across threads.
+
+    `embed(text)` queues the text and blocks on a future. A background
+    thread takes the first waiting query, collects others for up to
+    `window_ms` (or until `max_batch`), and embeds them all with one
+    `embed_many` call. Queries that queue up during a forward pass are
+    picked up by the next one without waiting further. The same text
+    twice in one batch is embedded once.
+
+    Errors of a forward pass are raised in every caller of that batch.
+    """
+
+    def __init__(
+        self,
+        embed_many: Callable[[List[str]], np.ndarray],
+        window_ms: float,
+        max_batch: int,
+    ):
+        self.embed_many = embed_many
+        self.window = window_ms / 1000
+        self.max_batch = max(1, max_batch)
+
+        self.batches = 0
+        self.queries = 0
+
+        self._queue: "queue.SimpleQueue[tuple[str, Future]]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def embed(self, text: str) -> np.ndarray:
+        return self.submit(text).result()
+
+    def submit(self, text: str) -> Future:
+        future: Future = Future()
+        self._queue.put((text, future))
+
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="query-batcher", daemon=True
+                    )
+                    self._thread.start()
+        return future
+
+    def _collect(self) -> List[tuple]:
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.window
+
+        while len(batch) < self.max_batch:
+            try:
+                # Already waiting: no need to wait for the window
+                batch.append(self._queue.get_nowait())
+                continue
+            except queue.Empty:
+                pass
+
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            texts = list(dict.fromkeys(text for text, _ in batch))
+
+            try:
+                vectors = self.embed_many(texts)
+            except BaseException as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            # Own rows: a cached view would keep the whole batch alive
+            by_text = {text: vector.copy() for text, vector in zip(texts, vectors)}
+            for text, future in batch:
+                future.set_result(by_text[text])
+
+            self.batches += 1
+            self.queries += len(batch)
+            if self.batches % _BATCH_STATS_EVERY == 0:
+                self.log_stats()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "queries": self.queries,
+            "mean_batch_size": self.queries / self.batches if self.batches else 0.0,
+            "window_ms": 1000 * self.window,
+            "max_batch": self.max_batch,
+        }
+
+    def log_stats(self):
+        stats = self.stats()
+        logger.info(
+            "event=QUERY_BATCH_STATS | batches=%d | queries=%d | mean_batch_size=%.2f",
+            stats["batches"],
+            stats["queries"],
+            stats["mean_batch_size"],
+        )
+
 
 class EmbeddingService:
     """
     Singleton embedding service.
 
     Guarantees:
-    - single model instance per process
+    - single model instance per process, reloaded if EMBEDDING_MODEL
+      or the backend settings change
     - deterministic embeddings
     - explicit device control
+    - repeated queries served from a shared QUERY_CACHE_SIZE LRU
+    - concurrent query misses embedded together (QUERY_BATCH_WINDOW_MS)
+
+    EMBEDDING_BACKEND "onnx" runs the same model through ONNX Runtime,
+    exported once under EMBEDDING_ONNX_DIR (optionally int8-quantized,
+    EMBEDDING_ONNX_QUANTIZE); `model_id` tells the variants apart.
     """
 
     _model = None
+    _model_name = None
     _device = None
+    _load_lock = threading.Lock()
+    _query_cache: Optional[QueryEmbeddingCache] = None
+    _query_batcher: Optional[QueryBatcher] = None
 
     def __init__(self):
+        self._load()
+
+    @property
+    def model(self) -> SentenceTransformer:
+        return self._load()
+
+    @staticmethod
+    def model_id() -> str:
+        """
+        EMBEDDING_MODEL plus the backend that runs it, e.g.
+        "<model>@onnx-int8_avx2"; plain EMBEDDING_MODEL for torch. Vectors
+        of different ids differ slightly, so caches are keyed by it.
+        """
+        backend = settings.EMBEDDING_BACKEND
+        if backend not in EMBEDDING_BACKENDS:
+            raise ValueError(f"Unknown embedding backend: {backend}")
+        if backend == "torch":
+            return settings.EMBEDDING_MODEL
+
+        quantize = settings.EMBEDDING_ONNX_QUANTIZE
+        if quantize and quantize not in ONNX_QUANTIZE_TARGETS:
+            raise ValueError(f"Unknown ONNX quantization target: {quantize}")
+        suffix = f"-int8_{quantize}" if quantize else ""
+        return f"{settings.EMBEDDING_MODEL}@onnx{suffix}"
+
+    @classmethod
+    def _load(cls) -> SentenceTransformer:
+        model_id = cls.model_id()
+        if cls._model is not None and cls._model_name == model_id:
+            return cls._model
+
+        with cls._load_lock:
+            if cls._model is None or cls._model_name != model_id:
+                cls._load_model()
+            return cls._model
+
+    @classmethod
+    def _load_model(cls):
         try:
-            if EmbeddingService._model is None:
-                device = "cpu"
+            device = "cpu"
 
-                if device == "cuda":
-                    if not torch.cuda.is_available():
-                        logger.warning(
-                            "event=EMBEDDER_FALLBACK_CPU | reason=cuda_not_available"
-                        )
-                        device = "cpu"
+            if device == "cuda":
+                if not torch.cuda.is_available():
+                    logger.warning(
+                        "event=EMBEDDER_FALLBACK_CPU | reason=cuda_not_available"
+                    )
+                    device = "cpu"
 
-                EmbeddingService._device = device
+            EmbeddingService._device = device
 
-                logger.info(
-                    "event=EMBEDDER_INIT | model=%s | device=%s",
-                    settings.EMBEDDING_MODEL,
-                    device,
-                )
+            model_id = cls.model_id()
+            logger.info(
+                "event=EMBEDDER_INIT | model=%s | backend=%s | device=%s",
+                settings.EMBEDDING_MODEL,
+                model_id,
+                device,
+            )
 
-                EmbeddingService._model = SentenceTransformer(
+            if settings.EMBEDDING_BACKEND == "onnx":
+                model = cls._load_onnx_model(device)
+            else:
+                model = SentenceTransformer(
                     settings.EMBEDDING_MODEL,
                     device=device,
                 )
 
-            self.model = EmbeddingService._model
+            EmbeddingService._model = model
+            EmbeddingService._model_name = model_id
+            if EmbeddingService._query_cache is not None:
+                EmbeddingService._query_cache.bind(model_id)
 
         except Exception as e:
             logger.exception("event=EMBEDDER_INIT_FAILED")
@@ -58,26 +341,153 @@ class EmbeddingService:
                 error=e,
                 context={
                     "model": settings.EMBEDDING_MODEL,
+                    "backend": settings.EMBEDDING_BACKEND,
                     "device": settings.EMBEDDING_DEVICE,
                 },
             ) from e
 
+    @staticmethod
+    def _load_onnx_model(device: str) -> SentenceTransformer:
+        """
+        EMBEDDING_MODEL on ONNX Runtime. The export (and the quantized
+        copy) is written once under EMBEDDING_ONNX_DIR and reused by
+        later loads; needs `optimum[onnxruntime]`.
+        """
+        export_dir = Path(settings.EMBEDDING_ONNX_DIR) / settings.EMBEDDING_MODEL.replace("/", "__")
+        quantize = settings.EMBEDDING_ONNX_QUANTIZE
+        file_name = f"onnx/model_int8_{quantize}.onnx" if quantize else "onnx/model.onnx"
+
+        if not (export_dir / "onnx" / "model.onnx").exists():
+            # Export next to the target and rename, so concurrent loaders
+            # never see a half-written model
+            tmp_dir = export_dir.with_name(f"{export_dir.name}.tmp-{os.getpid()}")
+            SentenceTransformer(
+                settings.EMBEDDING_MODEL, device=device, backend="onnx"
+            ).save_pretrained(str(tmp_dir))
+            try:
+                tmp_dir.rename(export_dir)
+            except OSError:
+                # Another process finished the export first
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+            logger.info("event=EMBEDDER_ONNX_EXPORTED | path=%s", export_dir)
+
+        if not (export_dir / file_name).exists():
+            from sentence_transformers.backend import export_dynamic_quantized_onnx_model
+
+            export_dynamic_quantized_onnx_model(
+                SentenceTransformer(str(export_dir), device=device, backend="onnx"),
+                quantize,
+                str(export_dir),
+                file_suffix=f"int8_{quantize}",
+            )
+            logger.info(
+                "event=EMBEDDER_ONNX_QUANTIZED | path=%s | target=%s",
+                export_dir / file_name,
+                quantize,
+            )
+
+        import onnxruntime
+
+        # As many threads as torch, so pinned pool workers stay pinned
+        session_options = onnxruntime.SessionOptions()
+        session_options.intra_op_num_threads = torch.get_num_threads()
+
+        return SentenceTransformer(
+            str(export_dir),
+            device=device,
+            backend="onnx",
+            model_kwargs={"file_name": file_name, "session_options": session_options},
+        )
+
+    @property
+    def tokenizer(self):
+        """The model's own (fast) tokenizer."""
+        return self.model.tokenizer
+
+    @property
+    def max_seq_length(self) -> int:
+        """Word pieces per input, special tokens included; the rest is truncated."""
+        return self.model.max_seq_length
+
+    def token_batches(self, texts: List[str], budget: int) -> List[np.ndarray]:
+        """
+        Positions of `texts`, longest first, cut into batches of one
+        _BUCKET_TOKENS-wide length bucket each, whose padded size (batch
+        size x longest input, in tokens after truncation) stays within
+        `budget`. Short inputs share large batches, long ones go a few at
+        a time, and no input is padded by more than a bucket width.
+        """
+        encoded = self.tokenizer(
+            texts,
+            truncation=True,
+            max_length=self.max_seq_length,
+            return_attention_mask=False,
+            return_token_type_ids=False,
+        )
+        lengths = np.fromiter(
+            (len(ids) for ids in encoded["input_ids"]), dtype=np.int64, count=len(texts)
+        )
+        order = np.argsort(-lengths, kind="stable")
+
+        buckets = (lengths[order] - 1) // _BUCKET_TOKENS
+
+        batches = []
+        start = 0
+        while start < len(order):
+            size = max(1, budget // max(int(lengths[order[start]]), 1))
+            end = min(start + size, len(order))
+            # Stop at the bucket edge; `buckets` is sorted descending
+            end = start + int(np.searchsorted(-buckets[start:end], -buckets[start], side="right"))
+            batches.append(order[start:end])
+            start = end
+        return batches
+
+    def _encode(self, texts: List[str], batch_size: int) -> torch.Tensor:
+        return self.model.encode(
+            texts,
+            batch_size=batch_size,
+            show_progress_bar=False,
+            convert_to_tensor=True,
+            normalize_embeddings=True,
+        )
+
     def embed_texts(self, texts: List[str]) -> torch.Tensor:
+        """
+        Normalized embeddings of `texts`, in input order.
+
+        With EMBED_BATCH_TOKENS, inputs are sorted by token length and
+        batched by that padded-token budget (see `token_batches`), so
+        little compute goes to padding; 0 keeps fixed batches of 32.
+        """
         if not texts:
             raise ValueError("embed_texts received empty input")
 
         try:
-            embeddings = self.model.encode(
-                texts,
-                batch_size=32,
-                show_progress_bar=False,
-                convert_to_tensor=True,
-                normalize_embeddings=True,
-            )
+            budget = settings.EMBED_BATCH_TOKENS
+            batches = 1
+
+            if budget <= 0 or len(texts) == 1:
+                embeddings = self._encode(texts, batch_size=32)
+            else:
+                positions = self.token_batches(texts, budget)
+                batches = len(positions)
+
+                sorted_embeddings = torch.cat([
+                    self._encode([texts[i] for i in batch], batch_size=len(batch))
+                    for batch in positions
+                ])
+
+                # Scatter back to input order
+                order = torch.from_numpy(np.concatenate(positions)).to(
+                    sorted_embeddings.device
+                )
+                embeddings = torch.empty_like(sorted_embeddings)
+                embeddings[order] = sorted_embeddings
 
             logger.info(
-                "event=EMBEDDINGS_GENERATED | count=%d | device=%s",
+                "event=EMBEDDINGS_GENERATED | count=%d | batches=%d | device=%s",
                 len(texts),
+                batches,
                 EmbeddingService._device,
             )
 
@@ -93,3 +503,73 @@ class EmbeddingService:
                     "device": EmbeddingService._device,
                 },
             ) from e
+
+    @staticmethod
+    def _embed_many(texts: List[str]) -> np.ndarray:
+        return (
+            EmbeddingService()
+            .embed_texts(texts)
+            .cpu()
+            .numpy()
+            .astype("float32", copy=False)
+        )
+
+    @classmethod
+    def _cache(cls) -> QueryEmbeddingCache:
+        # Sized on first use, so QUERY_CACHE_SIZE set after import applies
+        if cls._query_cache is None:
+            with cls._load_lock:
+                if cls._query_cache is None:
+                    cls._query_cache = QueryEmbeddingCache(settings.QUERY_CACHE_SIZE)
+        return cls._query_cache
+
+    @classmethod
+    def _batcher(cls) -> Optional[QueryBatcher]:
+        if settings.QUERY_BATCH_WINDOW_MS <= 0:
+            return None
+
+        if cls._query_batcher is None:
+            with cls._load_lock:
+                if cls._query_batcher is None:
+                    cls._query_batcher = QueryBatcher(
+                        cls._embed_many,
+                        window_ms=settings.QUERY_BATCH_WINDOW_MS,
+                        max_batch=settings.QUERY_BATCH_MAX_SIZE,
+                    )
+        return cls._query_batcher
+
+    def embed_query(self, query: str) -> np.ndarray:
+        """
+        float32 vector of one query. The same normalized text is embedded
+        once per model; later calls are served from the query cache.
+        Misses from concurrent callers share a forward pass (see
+        `QueryBatcher`).
+        """
+        self._load()  # reloads (and invalidates) on a model change
+        model_name = EmbeddingService._model_name
+        cache = self._cache()
+        cache.bind(model_name)
+
+        text = normalize_text(query)
+        vector = cache.get(text)
+        if vector is not None:
+            return vector
+
+        batcher = self._batcher()
+        if batcher is not None:
+            vector = batcher.embed(text)
+        else:
+            vector = self._embed_many([text])[0]
+        cache.put(text, vector, model_name)
+        return vector
+
+    @staticmethod
+    def query_cache_stats() -> Dict[str, Any]:
+        """Size, hits, misses, evictions and hit rate of the query cache."""
+        return EmbeddingService._cache().stats()
+
+    @staticmethod
+    def query_batch_stats() -> Dict[str, Any]:
+        """Forward passes, queries and mean batch size of the query batcher."""
+        batcher = EmbeddingService._query_batcher
+        return batcher.stats() if batcher is not None else {}
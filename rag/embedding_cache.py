@@ -0,0 +1,215 @@
+import time
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+from pathlib import Path
+from typing import List, Callable, Dict, Optional
+
+import numpy as np
+
+from core.logger import get_logger
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    key TEXT PRIMARY KEY,
+    dim INTEGER NOT NULL,
+    nbytes INTEGER NOT NULL,
+    vector BLOB NOT NULL,
+    last_used REAL NOT NULL
+)
+"""
+
+# Running byte total kept by triggers, so eviction checks never scan the
+# table. Seeded once from the rows of a cache created before it existed.
+_STATS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_stats (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    total_bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO cache_stats (id, total_bytes)
+    SELECT 0, COALESCE(SUM(nbytes), 0) FROM embeddings;
+CREATE TRIGGER IF NOT EXISTS embeddings_insert AFTER INSERT ON embeddings
+BEGIN
+    UPDATE cache_stats SET total_bytes = total_bytes + NEW.nbytes WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS embeddings_delete AFTER DELETE ON embeddings
+BEGIN
+    UPDATE cache_stats SET total_bytes = total_bytes - OLD.nbytes WHERE id = 0;
+END;
+"""
+
+# Eviction frees down to this share of the cap, so a rebuild that adds a
+# few chunks over the cap does not evict on every call
+_EVICT_TO = 0.9
+
+# SQLite bound-parameter limit is 999 on older builds
+_QUERY_BATCH = 500
+
+
+def normalize_text(text: str) -> str:
+    """
+    Unicode NFC + collapsed whitespace. Re-extraction of an unchanged PDF
+    can differ only in line breaks and spacing; those must not miss.
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class EmbeddingCache:
+    """
+    Persistent content-addressed embedding cache.
+
+    Key:   sha256(model name + normalized chunk text)
+    Value: float32 vector, exactly as returned by the model
+
+    Bounded by `max_bytes` of vector data; least recently used entries
+    are evicted first. Hit/miss counters are per instance.
+    """
+
+    def __init__(self, path, model_name: str, max_bytes: int):
+        self.path = Path(path)
+        self.model_name = model_name
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Rows replaced by INSERT OR REPLACE fire the delete trigger too
+        self._conn.execute("PRAGMA recursive_triggers=ON")
+        self._conn.execute(_SCHEMA)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_last_used ON embeddings(last_used)"
+        )
+        self._conn.commit()
+        self._conn.executescript("BEGIN IMMEDIATE;" + _STATS_SCHEMA + "COMMIT;")
+
+        self.logger = get_logger("rag.embedding_cache")
+
+    def key(self, text: str) -> str:
+        hasher = hashlib.sha256()
+        hasher.update(self.model_name.encode("utf-8"))
+        hasher.update(b"\0")
+        hasher.update(normalize_text(text).encode("utf-8"))
+        return hasher.hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+        unique = list(dict.fromkeys(keys))
+
+        with self._lock:
+            for i in range(0, len(unique), _QUERY_BATCH):
+                batch = unique[i : i + _QUERY_BATCH]
+                rows = self._conn.execute(
+                    "SELECT key, vector FROM embeddings WHERE key IN (%s)"
+                    % ",".join("?" * len(batch)),
+                    batch,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+                self._conn.commit()
+
+        return found
+
+    def put_many(self, keys: List[str], vectors: np.ndarray):
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        now = time.time()
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?, ?)",
+                [
+                    (key, vec.shape[0], vec.nbytes, vec.tobytes(), now)
+                    for key, vec in zip(keys, vectors)
+                ],
+            )
+            self._conn.commit()
+            self._evict()
+
+    def total_bytes(self) -> int:
+        return self._conn.execute(
+            "SELECT total_bytes FROM cache_stats WHERE id = 0"
+        ).fetchone()[0]
+
+    def _evict(self):
+        total = self.total_bytes()
+
+        if total <= self.max_bytes:
+            return
+
+        to_free = total - int(self.max_bytes * _EVICT_TO)
+        victims = []
+        freed = 0
+
+        for key, nbytes in self._conn.execute(
+            "SELECT key, nbytes FROM embeddings ORDER BY last_used ASC"
+        ):
+            victims.append((key,))
+            freed += nbytes
+            if freed >= to_free:
+                break
+
+        self._conn.executemany("DELETE FROM embeddings WHERE key = ?", victims)
+        self._conn.commit()
+        self.evicted += len(victims)
+
+        self.logger.info(
+            "event=EMBEDDING_CACHE_EVICTED | entries=%d | freed_mb=%.1f",
+            len(victims),
+            freed / 1e6,
+        )
+
+    def embed(
+        self,
+        texts: List[str],
+        embed_fn: Callable[[List[str]], np.ndarray],
+    ) -> np.ndarray:
+        """
+        Vectors for `texts` in order; only cache misses reach `embed_fn`,
+        and each distinct missing text is embedded once.
+        """
+        keys = [self.key(t) for t in texts]
+        found = self.get_many(keys)
+
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+
+        n_missed = sum(1 for k in keys if k not in found)
+        self.hits += len(keys) - n_missed
+        self.misses += n_missed
+
+        if missing:
+            new_vectors = np.asarray(
+                embed_fn(list(missing.values())), dtype=np.float32
+            )
+            self.put_many(list(missing), new_vectors)
+            found.update(zip(missing, new_vectors))
+
+        return np.stack([found[k] for k in keys])
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evicted": self.evicted,
+            "hit_rate": self.hits / lookups if lookups else None,
+        }
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,118 @@
+import math
+import os
+from typing import List, Optional
+
+import numpy as np
+import torch
+
+from api.config import settings
+from rag.embedder import EmbeddingService
+from core.logger import get_logger
+from core.process_pool import spawn_pool
+
+
+logger = get_logger("rag.embedding_pool")
+
+# Fewer texts per worker than this are embedded in-process; IPC and
+# small batches would cost more than they save
+MIN_SHARD_TEXTS = 32
+
+# Settings a caller may override at runtime; pool workers re-read the
+# rest on spawn
+_FORWARDED_SETTINGS = (
+    "EMBEDDING_MODEL",
+    "EMBEDDING_BACKEND",
+    "EMBEDDING_ONNX_QUANTIZE",
+    "EMBEDDING_ONNX_DIR",
+    "EMBED_BATCH_TOKENS",
+)
+
+# One model per pool worker, loaded once by the initializer
+_worker_embedder: Optional[EmbeddingService] = None
+
+
+def _init_worker(threads: int, overrides: dict):
+    global _worker_embedder
+    torch.set_num_threads(threads)
+    torch.set_num_interop_threads(1)
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    _worker_embedder = EmbeddingService()
+
+
+def _embed_shard(texts: List[str]) -> np.ndarray:
+    return _worker_embedder.embed_texts(texts).cpu().numpy()
+
+
+class EmbeddingPool:
+    """
+    Bulk embedding over `workers` processes (default EMBED_WORKERS;
+    0 = one per EMBED_WORKER_THREADS CPUs), each with its own model and
+    `threads` torch / ONNX Runtime threads, so workers do not contend
+    for cores.
+
+    `embed_texts` cuts its input into one contiguous shard per worker
+    and concatenates the shard results, so vectors come back in input
+    order, as from `EmbeddingService.embed_texts`. Each shard is
+    length-sorted and batched by its worker (EMBED_BATCH_TOKENS).
+
+    With one worker, or inputs too small to shard, texts are embedded
+    in-process.
+    """
+
+    def __init__(self, workers: Optional[int] = None, threads: Optional[int] = None):
+        cpus = os.cpu_count() or 1
+        self.threads = max(1, threads or settings.EMBED_WORKER_THREADS or 1)
+
+        if workers is None:
+            workers = settings.EMBED_WORKERS
+        if workers <= 0:
+            workers = cpus // self.threads
+        self.workers = max(1, workers)
+
+        self.pool = None
+        self._embedder: Optional[EmbeddingService] = None
+
+        if self.workers > 1:
+            self.pool = spawn_pool(
+                self.workers,
+                _init_worker,
+                (
+                    self.threads,
+                    {name: getattr(settings, name) for name in _FORWARDED_SETTINGS},
+                ),
+            )
+            logger.info(
+                "event=EMBEDDING_POOL_START | workers=%d | threads=%d | model=%s",
+                self.workers,
+                self.threads,
+                EmbeddingService.model_id(),
+            )
+
+    def embed_texts(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            raise ValueError("embed_texts received empty input")
+
+        shards = min(self.workers, len(texts) // MIN_SHARD_TEXTS)
+        if self.pool is None or shards <= 1:
+            if self._embedder is None:
+                self._embedder = EmbeddingService()
+            return self._embedder.embed_texts(texts).cpu().numpy()
+
+        size = math.ceil(len(texts) / shards)
+        futures = [
+            self.pool.submit(_embed_shard, texts[i : i + size])
+            for i in range(0, len(texts), size)
+        ]
+        return np.concatenate([future.result() for future in futures])
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            self.pool = None
+
+    def __enter__(self) -> "EmbeddingPool":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
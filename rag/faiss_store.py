@@ -1,12 +1,31 @@
+import os
+import math
 import faiss
 import numpy as np
 import pickle
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence
 
+from rag.chunk_store import ChunkStore, atomic_path
 from core.logger import get_logger
 from core.exceptions import CustomException
 
+
+INDEX_TYPES = ("flat", "ivf_flat", "hnsw")
+CODECS = ("none", "sq8", "pq")
+
+
+def _default_pq_m(dim: int) -> int:
+    """
+    Largest sub-quantizer count <= dim / 4 that divides dim
+    (384-d MiniLM -> 96 bytes per vector, 16x smaller than float32).
+    """
+    for m in range(max(1, dim // 4), 0, -1):
+        if dim % m == 0:
+            return m
+    return 1
+
+
 class FaissStore:
     """
     FAISS vector store with strict lifecycle guarantees.
@@ -14,6 +33,33 @@ class FaissStore:
     Lifecycle:
     - Either `build` OR `load`
     - Never both in the same process
+    - A loaded index can be updated (`add_chunks`, `remove_ids`) and saved
+      again, unless it is memory-mapped
+
+    Ids: flat and HNSW indexes are wrapped in IndexIDMap2 (IVF maps ids
+    natively), so a vector's id is its chunk row and survives removals.
+
+    Index types (inner product over normalized vectors):
+    - flat:     exact scan
+    - ivf_flat: inverted lists, trained on a sample; tuned by `nprobe`
+    - hnsw:     graph index; tuned by `efSearch`
+
+    Codecs (vector storage inside the index):
+    - none: float32
+    - sq8:  8-bit scalar quantization (4x smaller)
+    - pq:   product quantization (up to 16x smaller)
+    With a codec, a float16 copy of the vectors is kept on disk and
+    memory-mapped; `search` re-scores the top `k * rerank_factor`
+    candidates exactly against it.
+
+    Search parameters are written into the index file by FAISS and can be
+    overridden after load through `set_search_params`.
+
+    mmap=True loads the index (IO_FLAG_MMAP_IFC) and chunk metadata as
+    read-only file mappings, so API workers share one page-cache copy.
+
+    With a shared `chunk_store`, vector i is row i of that store: chunk
+    text is neither copied into nor saved with the index.
     """
 
     def __init__(
@@ -21,22 +67,245 @@ class FaissStore:
         index_path: str,
         metadata_path: str,
         dimension: Optional[int] = None,
+        index_type: str = "flat",
+        nlist: int = 0,
+        hnsw_m: int = 32,
+        ef_construction: int = 200,
+        train_sample: int = 100_000,
+        nprobe: int = 16,
+        ef_search: int = 64,
+        codec: str = "none",
+        pq_m: int = 0,
+        pq_nbits: int = 8,
+        rerank_factor: int = 4,
+        mmap: bool = False,
+        chunk_store: Optional[ChunkStore] = None,
     ):
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"Unknown FAISS index type: {index_type}")
+
+        if codec not in CODECS:
+            raise ValueError(f"Unknown FAISS codec: {codec}")
+
         self.index_path = Path(index_path)
         self.metadata_path = Path(metadata_path)
+        self.vectors_path = self.index_path.with_name(
+            self.index_path.stem + "_vectors.f16.npy"
+        )
+        self.chunks_path = self.metadata_path.with_suffix("")
+        self.mmap = mmap
 
         self.index = None
         self.dim = dimension
-        self.metadata: List[Dict[str, Any]] = []
+        self.chunk_store = chunk_store
+        self.metadata: Sequence[Dict[str, Any]] = (
+            chunk_store if chunk_store is not None else []
+        )
+
+        self.index_type = index_type
+        self.nlist = nlist
+        self.hnsw_m = hnsw_m
+        self.ef_construction = ef_construction
+        self.train_sample = train_sample
+        self.nprobe = nprobe
+        self.ef_search = ef_search
+
+        self.codec = codec
+        self.pq_m = pq_m
+        self.pq_nbits = pq_nbits
+        self.rerank_factor = rerank_factor
+        self._vector_batches: List[np.ndarray] = []
 
         self._loaded = False
         self._built = False
 
         self.logger = get_logger("rag.faiss_store")
 
-    def add_chunks(self, embeddings: np.ndarray, chunks: List[Dict[str, Any]]):
-        if self._loaded:
-            raise RuntimeError("Cannot add chunks to a loaded index")
+    def _create_index(self, embeddings: np.ndarray):
+        metric = faiss.METRIC_INNER_PRODUCT
+        sq8 = faiss.ScalarQuantizer.QT_8bit
+        n_train = min(len(embeddings), self.train_sample)
+
+        if self.codec == "pq":
+            self.pq_m = self.pq_m or _default_pq_m(self.dim)
+            # 2**nbits centroids per sub-quantizer need enough training points
+            self.pq_nbits = max(1, min(self.pq_nbits, int(math.log2(n_train))))
+
+        if self.index_type == "hnsw":
+            if self.codec == "sq8":
+                index = faiss.IndexHNSWSQ(self.dim, sq8, self.hnsw_m, metric)
+            elif self.codec == "pq":
+                index = faiss.IndexHNSWPQ(
+                    self.dim, self.pq_m, self.hnsw_m, self.pq_nbits, metric
+                )
+            else:
+                index = faiss.IndexHNSWFlat(self.dim, self.hnsw_m, metric)
+            index.hnsw.efConstruction = self.ef_construction
+
+        elif self.index_type == "ivf_flat":
+            # FAISS wants ~39 training points per centroid
+            nlist = self.nlist or int(4 * math.sqrt(len(embeddings)))
+            self.nlist = max(1, min(nlist, n_train // 39))
+
+            quantizer = faiss.IndexFlatIP(self.dim)
+            if self.codec == "sq8":
+                index = faiss.IndexIVFScalarQuantizer(
+                    quantizer, self.dim, self.nlist, sq8, metric
+                )
+            elif self.codec == "pq":
+                index = faiss.IndexIVFPQ(
+                    quantizer, self.dim, self.nlist, self.pq_m, self.pq_nbits, metric
+                )
+            else:
+                index = faiss.IndexIVFFlat(quantizer, self.dim, self.nlist, metric)
+
+        elif self.codec == "sq8":
+            index = faiss.IndexScalarQuantizer(self.dim, sq8, metric)
+        elif self.codec == "pq":
+            index = faiss.IndexPQ(self.dim, self.pq_m, self.pq_nbits, metric)
+        else:
+            index = faiss.IndexFlatIP(self.dim)
+
+        if not index.is_trained:
+            rng = np.random.default_rng(0)
+            sample = embeddings[
+                np.sort(rng.choice(len(embeddings), size=n_train, replace=False))
+            ]
+            index.train(sample)
+
+            self.logger.info(
+                "event=FAISS_INDEX_TRAINED | type=%s | codec=%s | train_vectors=%d",
+                self.index_type,
+                self.codec,
+                n_train,
+            )
+
+        # IVF maps ids natively; flat and HNSW need the wrapper so row ids
+        # survive removals
+        if self.index_type != "ivf_flat":
+            index = faiss.IndexIDMap2(index)
+
+        return index
+
+    @property
+    def vectors(self) -> Optional[np.ndarray]:
+        """float16 re-scoring copy, row = id; None without a codec."""
+        if not self._vector_batches:
+            return None
+        if len(self._vector_batches) > 1:
+            self._vector_batches = [np.concatenate(self._vector_batches)]
+        return self._vector_batches[0]
+
+    def _base(self):
+        """The index under the id map, where the search knobs live."""
+        if isinstance(self.index, faiss.IndexIDMap):
+            return faiss.downcast_index(self.index.index)
+        return self.index
+
+    @property
+    def needs_training(self) -> bool:
+        """IVF and compressed codecs learn centroids before the first add."""
+        return self.index_type == "ivf_flat" or self.codec != "none"
+
+    @property
+    def maps_ids(self) -> bool:
+        # Indexes saved before id mapping number vectors by position
+        return isinstance(self.index, (faiss.IndexIDMap, faiss.IndexIVF))
+
+    def set_search_params(
+        self,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
+    ):
+        if nprobe is not None:
+            self.nprobe = nprobe
+        if ef_search is not None:
+            self.ef_search = ef_search
+
+        if self.index is None:
+            return
+
+        if self.index_type == "ivf_flat":
+            self._base().nprobe = self.nprobe
+        elif self.index_type == "hnsw":
+            self._base().hnsw.efSearch = self.ef_search
+
+    def describe(self) -> Dict[str, Any]:
+        """
+        Index structure and search parameters, for index_meta.json.
+        """
+        info: Dict[str, Any] = {"index_type": self.index_type}
+
+        if self.index_type == "ivf_flat":
+            info.update(nlist=self.nlist, nprobe=self.nprobe)
+        elif self.index_type == "hnsw":
+            info.update(
+                hnsw_m=self.hnsw_m,
+                ef_construction=self.ef_construction,
+                ef_search=self.ef_search,
+            )
+
+        info["codec"] = self.codec
+        if self.codec == "pq":
+            info.update(pq_m=self.pq_m, pq_nbits=self.pq_nbits)
+        if self.codec != "none":
+            info["rerank_factor"] = self.rerank_factor
+
+        if self.dim is not None:
+            info["bytes_per_vector"] = self.bytes_per_vector()
+        return info
+
+    def bytes_per_vector(self) -> float:
+        if self.codec == "sq8":
+            return float(self.dim)
+        if self.codec == "pq":
+            return self.pq_m * self.pq_nbits / 8
+        return float(self.dim * 4)
+
+    def search(self, query_vectors: np.ndarray, k: int):
+        """
+        Same contract as `faiss.Index.search`: (scores, indices), -1 padded.
+        """
+        if self.index is None:
+            raise RuntimeError("FAISS index not initialized")
+
+        if self.codec == "none" or self.vectors is None:
+            return self.index.search(query_vectors, k)
+
+        _, candidates = self.index.search(
+            query_vectors, k * self.rerank_factor
+        )
+
+        scores = np.full((len(query_vectors), k), -np.inf, dtype="float32")
+        indices = np.full((len(query_vectors), k), -1, dtype="int64")
+
+        for row, (query, cand) in enumerate(zip(query_vectors, candidates)):
+            cand = cand[cand != -1]
+            if len(cand) == 0:
+                continue
+
+            # Fancy indexing on the memmap reads only the candidate rows
+            order = np.sort(cand)
+            exact = self.vectors[order].astype("float32") @ query
+
+            top = np.argsort(-exact, kind="stable")[:k]
+            scores[row, : len(top)] = exact[top]
+            indices[row, : len(top)] = order[top]
+
+        return scores, indices
+
+    def add_chunks(
+        self,
+        embeddings: np.ndarray,
+        chunks: List[Dict[str, Any]],
+        ids: Optional[np.ndarray] = None,
+    ):
+        """
+        `ids` default to the chunks' rows: the end of `metadata` (or of the
+        shared chunk store, which already holds them).
+        """
+        if self._loaded and self.mmap:
+            raise RuntimeError("Cannot add chunks to a memory-mapped index")
 
         if embeddings.ndim != 2:
             raise ValueError("Embeddings must be 2D")
@@ -52,15 +321,46 @@ class FaissStore:
                 f"Embedding dimension mismatch: expected {self.dim}, got {embeddings.shape[1]}"
             )
 
+        embeddings = np.ascontiguousarray(embeddings, dtype="float32")
+
         if self.index is None:
             self.logger.info(
-                "event=FAISS_INDEX_INIT | dim=%d",
+                "event=FAISS_INDEX_INIT | dim=%d | type=%s | codec=%s",
                 self.dim,
+                self.index_type,
+                self.codec,
             )
-            self.index = faiss.IndexFlatIP(self.dim)
+            try:
+                self.index = self._create_index(embeddings)
+            except Exception as e:
+                self.logger.exception("event=FAISS_INDEX_INIT_FAILED")
+                raise CustomException(
+                    "FAISS index creation failed",
+                    error=e,
+                    context={
+                        "index_type": self.index_type,
+                        "codec": self.codec,
+                        "dim": self.dim,
+                    },
+                ) from e
+            self.set_search_params()
+
+        if self.chunk_store is None:
+            self.metadata.extend(chunks)
+
+        if ids is None:
+            ids = np.arange(len(self.metadata) - len(chunks), len(self.metadata))
+        ids = np.asarray(ids, dtype="int64")
 
-        self.index.add(embeddings.astype("float32"))
-        self.metadata.extend(chunks)
+        if self.maps_ids:
+            self.index.add_with_ids(embeddings, ids)
+        elif np.array_equal(ids, np.arange(self.index.ntotal, self.index.ntotal + len(ids))):
+            self.index.add(embeddings)
+        else:
+            raise ValueError("Index without id map only accepts positional ids")
+
+        if self.codec != "none":
+            self._store_vectors(ids, embeddings)
         self._built = True
 
         self.logger.info(
@@ -69,48 +369,182 @@ class FaissStore:
             self.index.ntotal,
         )
 
+    def _store_vectors(self, ids: np.ndarray, embeddings: np.ndarray):
+        # The float16 copy is indexed by id; removed ids leave dead rows
+        rows = sum(len(b) for b in self._vector_batches)
+        start = int(ids[0])
+
+        if start < rows or not np.array_equal(ids, np.arange(start, start + len(ids))):
+            raise ValueError("Compressed indexes need ascending, unused ids")
+
+        if start > rows:
+            self._vector_batches.append(
+                np.zeros((start - rows, self.dim), dtype="float16")
+            )
+        self._vector_batches.append(embeddings.astype("float16"))
+
+    def remove_ids(self, ids) -> int:
+        if self._loaded and self.mmap:
+            raise RuntimeError("Cannot remove from a memory-mapped index")
+
+        if self.index is None:
+            raise RuntimeError("FAISS index not initialized")
+
+        ids = np.asarray(ids, dtype="int64")
+
+        if isinstance(self._base(), faiss.IndexHNSW):
+            removed = self._rebuild_without(ids)
+        elif self.maps_ids:
+            removed = self.index.remove_ids(faiss.IDSelectorBatch(ids))
+        else:
+            raise RuntimeError("Index has no id map; rebuild it to remove vectors")
+
+        self._built = True
+
+        self.logger.info(
+            "event=FAISS_IDS_REMOVED | requested=%d | removed=%d | total=%d",
+            len(ids),
+            removed,
+            self.index.ntotal,
+        )
+        return removed
+
+    def _rebuild_without(self, ids: np.ndarray) -> int:
+        # HNSW graphs cannot drop nodes: rebuild from the stored vectors
+        # (no re-embedding); float16 copy for codecs, exact storage otherwise
+        all_ids = faiss.vector_to_array(self.index.id_map)
+        keep = all_ids[~np.isin(all_ids, ids)]
+
+        if len(keep) == 0:
+            raise ValueError("Cannot remove every vector from an HNSW index")
+
+        if self.vectors is not None:
+            vectors = np.asarray(self.vectors[keep], dtype="float32")
+        else:
+            vectors = self.index.reconstruct_batch(keep)
+
+        self.index = self._create_index(np.ascontiguousarray(vectors))
+        self.set_search_params()
+        self.index.add_with_ids(vectors, keep)
+
+        return len(all_ids) - len(keep)
+
     def save(self):
         if not self._built or self.index is None:
             raise RuntimeError("Cannot save empty FAISS index")
 
-        if self.index.ntotal != len(self.metadata):
+        # Removed documents leave dead rows in metadata, never the reverse
+        if self.index.ntotal > len(self.metadata):
             raise RuntimeError(
                 "Index/metadata length mismatch before save"
             )
 
         self.index_path.parent.mkdir(parents=True, exist_ok=True)
 
-        faiss.write_index(self.index, str(self.index_path))
-        with open(self.metadata_path, "wb") as f:
-            pickle.dump(self.metadata, f)
+        # Write-then-rename: other workers may have these files mapped
+        tmp_index = atomic_path(self.index_path)
+        faiss.write_index(self.index, str(tmp_index))
+        os.replace(tmp_index, self.index_path)
+
+        if self.chunk_store is None:
+            ChunkStore.write(self.chunks_path, self.metadata)
+
+        if self.codec != "none":
+            tmp_vectors = atomic_path(self.vectors_path)
+            with open(tmp_vectors, "wb") as f:
+                np.save(f, self.vectors)
+            os.replace(tmp_vectors, self.vectors_path)
 
         self.logger.info(
-            "event=FAISS_INDEX_SAVED | path=%s | vectors=%d",
+            "event=FAISS_INDEX_SAVED | path=%s | vectors=%d | type=%s",
             self.index_path,
             self.index.ntotal,
+            self.index_type,
         )
 
     def load(self):
         if self._built:
             raise RuntimeError("Cannot load index after building in same process")
 
-        if not self.index_path.exists() or not self.metadata_path.exists():
+        chunks = ChunkStore(self.chunks_path)
+
+        if not self.index_path.exists() or not (
+            self.chunk_store is not None
+            or chunks.exists()
+            or self.metadata_path.exists()
+        ):
             raise FileNotFoundError("FAISS index or metadata missing")
 
-        self.index = faiss.read_index(str(self.index_path))
-        with open(self.metadata_path, "rb") as f:
-            self.metadata = pickle.load(f)
+        io_flags = faiss.IO_FLAG_MMAP_IFC if self.mmap else 0
+        self.index = faiss.read_index(str(self.index_path), io_flags)
+
+        if self.chunk_store is not None:
+            self.metadata = self.chunk_store
+        elif chunks.exists():
+            chunks.open()
+            if self.mmap:
+                self.metadata = chunks
+            else:
+                self.metadata = list(chunks)
+                chunks.close()
+        else:
+            # Indexes saved before the chunk store pickled the metadata
+            with open(self.metadata_path, "rb") as f:
+                self.metadata = pickle.load(f)
 
-        if self.index.ntotal != len(self.metadata):
+        if self.index.ntotal > len(self.metadata):
             raise RuntimeError(
                 "Loaded index/metadata length mismatch"
             )
 
         self.dim = self.index.d
+        self._read_structure()
+
+        if self.codec != "none":
+            if not self.vectors_path.exists():
+                raise FileNotFoundError("FAISS re-scoring vectors missing")
+
+            self._vector_batches = [np.load(self.vectors_path, mmap_mode="r")]
+            if len(self.vectors) < self.index.ntotal:
+                raise RuntimeError("Loaded index/vector length mismatch")
+
         self._loaded = True
 
         self.logger.info(
-            "event=FAISS_INDEX_LOADED | vectors=%d | dim=%d",
+            "event=FAISS_INDEX_LOADED | vectors=%d | dim=%d | type=%s | codec=%s | mmap=%s",
             self.index.ntotal,
             self.dim,
+            self.index_type,
+            self.codec,
+            self.mmap,
         )
+
+    def _read_structure(self):
+        # The file, not the constructor, decides what was built
+        base = self._base()
+        codec_index = base
+
+        if isinstance(base, faiss.IndexHNSW):
+            self.index_type = "hnsw"
+            self.hnsw_m = base.hnsw.nb_neighbors(1)
+            self.ef_construction = base.hnsw.efConstruction
+            self.ef_search = base.hnsw.efSearch
+            codec_index = faiss.downcast_index(base.storage)
+        elif isinstance(base, faiss.IndexIVF):
+            self.index_type = "ivf_flat"
+            self.nlist = base.nlist
+            self.nprobe = base.nprobe
+        else:
+            self.index_type = "flat"
+
+        if isinstance(
+            codec_index,
+            (faiss.IndexScalarQuantizer, faiss.IndexIVFScalarQuantizer),
+        ):
+            self.codec = "sq8"
+        elif isinstance(codec_index, (faiss.IndexPQ, faiss.IndexIVFPQ)):
+            self.codec = "pq"
+            self.pq_m = codec_index.pq.M
+            self.pq_nbits = codec_index.pq.nbits
+        else:
+            self.codec = "none"
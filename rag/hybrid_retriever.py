@@ -1,13 +1,64 @@
-from typing import List, Dict, Any, Tuple
+import time
+import asyncio
+import threading
+from concurrent.futures import (
+    Future,
+    ThreadPoolExecutor,
+    TimeoutError as FutureTimeoutError,
+)
+from typing import List, Dict, Any, Tuple, Optional, Callable
 
 from rag.retriever import Retriever
 from rag.bm25_store import BM25Store
+from api.config import settings
 from core.logger import get_logger
 
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_retrieval_executor() -> ThreadPoolExecutor:
+    """
+    Process-wide bounded pool shared by every HybridRetriever.
+
+    Late legs keep running after a timeout; the bound caps how many
+    such threads can pile up under load.
+    """
+    global _executor
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.RETRIEVAL_MAX_WORKERS,
+                    thread_name_prefix="retrieval",
+                )
+    return _executor
+
+
+def _limit(timeout: float) -> Optional[float]:
+    """Seconds to wait; 0 (or less) = no limit, as for every *_TIMEOUT_SECONDS."""
+    return timeout if timeout > 0 else None
+
+
+def _timed(fn: Callable, *args) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
 class HybridRetriever:
     """
     Combines dense vector retrieval and sparse BM25 retrieval.
 
+    Execution:
+    - concurrent=True: both legs run on the shared retrieval executor;
+      latency is roughly the slower leg
+    - a leg that exceeds its timeout contributes no results, and the
+      other leg's results are returned on their own; a timeout of 0
+      waits for the leg without limit
+
     Return Contract:
     - status: "ANSWER" | "NO_ANSWER"
     - chunks: List[chunk dicts]
@@ -20,25 +71,136 @@ class HybridRetriever:
         sparse: BM25Store,
         k_dense: int = 5,
         k_sparse: int = 5,
+        concurrent: Optional[bool] = None,
+        dense_timeout: Optional[float] = None,
+        sparse_timeout: Optional[float] = None,
     ):
         self.dense = dense
         self.sparse = sparse
         self.k_dense = k_dense
         self.k_sparse = k_sparse
 
+        self.concurrent = (
+            settings.HYBRID_CONCURRENT if concurrent is None else concurrent
+        )
+        self.dense_timeout = (
+            settings.DENSE_TIMEOUT_SECONDS if dense_timeout is None else dense_timeout
+        )
+        self.sparse_timeout = (
+            settings.SPARSE_TIMEOUT_SECONDS if sparse_timeout is None else sparse_timeout
+        )
+
         self.logger = get_logger("rag.hybrid_retriever")
 
+    def _dense_leg(self, query: str):
+        return _timed(self.dense.search, query, self.k_dense)
+
+    def _sparse_leg(self, query: str):
+        return _timed(self.sparse.search, query, self.k_sparse)
+
+    def _collect(
+        self,
+        future: Future,
+        leg: str,
+        timeout: float,
+        wait: Optional[float],
+        query: str,
+    ):
+        try:
+            return future.result(timeout=wait)
+        except FutureTimeoutError:
+            self.logger.warning(
+                "event=HYBRID_LEG_TIMEOUT | leg=%s | timeout_s=%.2f | query_len=%d",
+                leg,
+                timeout,
+                len(query),
+            )
+            return None
+
     def search(
         self, query: str
     ) -> Tuple[str, List[Dict[str, Any]], Dict[str, float]]:
 
-        # ---- Dense retrieval ----
-        status, dense_chunks, dense_scores = self.dense.search(
-            query, self.k_dense
+        start = time.perf_counter()
+
+        if not self.concurrent:
+            dense = self._dense_leg(query)
+            # Even if dense fails, sparse can rescue recall
+            sparse = self._sparse_leg(query)
+            return self._merge(query, dense, sparse, start, concurrent=False)
+
+        executor = get_retrieval_executor()
+        dense_future = executor.submit(self._dense_leg, query)
+        sparse_future = executor.submit(self._sparse_leg, query)
+
+        dense = self._collect(
+            dense_future,
+            "dense",
+            self.dense_timeout,
+            _limit(self.dense_timeout),
+            query,
+        )
+
+        # Both legs started together; the sparse budget counts from submission
+        sparse_wait = _limit(self.sparse_timeout)
+        if sparse_wait is not None:
+            sparse_wait = max(0.0, sparse_wait - (time.perf_counter() - start))
+        sparse = self._collect(
+            sparse_future,
+            "sparse",
+            self.sparse_timeout,
+            sparse_wait,
+            query,
         )
 
-        # Even if dense fails, sparse can rescue recall
-        sparse_results = self.sparse.search(query, self.k_sparse)
+        return self._merge(query, dense, sparse, start, concurrent=True)
+
+    async def asearch(
+        self, query: str
+    ) -> Tuple[str, List[Dict[str, Any]], Dict[str, float]]:
+
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        executor = get_retrieval_executor()
+
+        async def run_leg(fn: Callable, leg: str, timeout: float):
+            try:
+                return await asyncio.wait_for(
+                    loop.run_in_executor(executor, fn, query),
+                    timeout=_limit(timeout),
+                )
+            except asyncio.TimeoutError:
+                self.logger.warning(
+                    "event=HYBRID_LEG_TIMEOUT | leg=%s | timeout_s=%.2f | query_len=%d",
+                    leg,
+                    timeout,
+                    len(query),
+                )
+                return None
+
+        dense, sparse = await asyncio.gather(
+            run_leg(self._dense_leg, "dense", self.dense_timeout),
+            run_leg(self._sparse_leg, "sparse", self.sparse_timeout),
+        )
+
+        return self._merge(query, dense, sparse, start, concurrent=True)
+
+    def _merge(
+        self,
+        query: str,
+        dense: Optional[Tuple[Any, float]],
+        sparse: Optional[Tuple[Any, float]],
+        start: float,
+        concurrent: bool,
+    ) -> Tuple[str, List[Dict[str, Any]], Dict[str, float]]:
+
+        dense_chunks, dense_scores, dense_ms = [], [], None
+        if dense is not None:
+            (_, dense_chunks, dense_scores), dense_ms = dense
+
+        sparse_results, sparse_ms = [], None
+        if sparse is not None:
+            sparse_results, sparse_ms = sparse
 
         combined_chunks: Dict[str, Dict[str, Any]] = {}
         combined_scores: Dict[str, float] = {}
@@ -56,18 +218,33 @@ class HybridRetriever:
                 combined_chunks[cid] = chunk
                 combined_scores[cid] = float(bm25_score)
 
+        total_ms = (time.perf_counter() - start) * 1000
+
         if not combined_chunks:
             self.logger.info(
-                "event=HYBRID_NO_ANSWER | query_len=%d",
+                "event=HYBRID_NO_ANSWER | query_len=%d | dense_ms=%s | sparse_ms=%s | total_ms=%.1f",
                 len(query),
+                _fmt_ms(dense_ms),
+                _fmt_ms(sparse_ms),
+                total_ms,
             )
             return "NO_ANSWER", [], {}
 
         self.logger.info(
-            "event=HYBRID_RETRIEVAL | dense=%d | sparse=%d | merged=%d",
+            "event=HYBRID_RETRIEVAL | dense=%d | sparse=%d | merged=%d"
+            " | dense_ms=%s | sparse_ms=%s | total_ms=%.1f | concurrent=%s",
             len(dense_chunks),
             len(sparse_results),
             len(combined_chunks),
+            _fmt_ms(dense_ms),
+            _fmt_ms(sparse_ms),
+            total_ms,
+            concurrent,
         )
 
         return "ANSWER", list(combined_chunks.values()), combined_scores
+
+
+def _fmt_ms(value: Optional[float]) -> str:
+    # "timeout" keeps a late leg visible in the log line
+    return "timeout" if value is None else f"{value:.1f}"
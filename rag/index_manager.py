@@ -1,13 +1,28 @@
+import os
 import json
+import time
+import fcntl
 import hashlib
 from pathlib import Path
-from typing import List, Tuple
+from contextlib import contextmanager
+from itertools import islice
+from typing import List, Tuple, Dict, Any, Optional, Iterable, Iterator, Callable
 
-from ingestion.loader import load_pdf
+import numpy as np
+
+from ingestion.loader import DocumentPool, iter_pdf_pages, count_pages
+from ingestion.file_manifest import file_hashes
+from ingestion.dedup import NearDuplicateFilter
+from ingestion.boilerplate import BoilerplateStripper
 from ingestion.semantic_splitter import SemanticChunker
+from rag.chunking.token_chunker import TokenChunker
 from rag.embedder import EmbeddingService
+from rag.embedding_pool import EmbeddingPool
 from rag.faiss_store import FaissStore
 from rag.bm25_store import BM25Store
+from rag.chunk_store import ChunkStore, atomic_path
+from rag.embedding_cache import EmbeddingCache
+from rag.build_checkpoint import BuildCheckpoint
 from api.config import settings
 from core.logger import get_logger
 from core.exceptions import CustomException
@@ -20,25 +35,86 @@ INDEX_DIR.mkdir(parents=True, exist_ok=True)
 FAISS_INDEX = INDEX_DIR / "faiss.index"
 FAISS_META = INDEX_DIR / "faiss_meta.pkl"
 BM25_INDEX = INDEX_DIR / "bm25.pkl"
+# Chunk text shared by both backends, addressed by row id
+CHUNK_STORE = INDEX_DIR / "chunks"
 META_FILE = INDEX_DIR / "index_meta.json"
+# Shards of an unfinished rebuild; removed once the build completes
+BUILD_DIR = INDEX_DIR / "build"
+# flock()ed for a whole build, update or rebuild (see build_lock)
+BUILD_LOCK = INDEX_DIR / "build.lock"
 
 
-def compute_fingerprint(pdf_paths: List[str]) -> str:
-    hasher = hashlib.sha256()
+def document_hashes(pdf_paths: List[str]) -> Dict[str, str]:
+    return file_hashes(pdf_paths)
 
-    for path in sorted(pdf_paths):
-        with open(path, "rb") as f:
-            while chunk := f.read(8192):
-                hasher.update(chunk)
 
-    config_blob = (
+def config_blob() -> str:
+    """
+    Everything besides the PDFs that shapes the index. A change here
+    forces a full rebuild; PDF changes alone are applied incrementally.
+    """
+    blob = (
         f"{settings.EMBEDDING_MODEL}-"
         f"{settings.MAX_CHARS}-"
         f"{settings.MIN_CHARS}-"
-        "semantic"
+        f"{settings.CHUNKER}"
     )
 
-    hasher.update(config_blob.encode())
+    # Flat indexes add nothing here. The corpus fingerprint itself changed
+    # to per-document hashes (see compute_fingerprint), so every index
+    # built before that is rebuilt once
+    if settings.FAISS_INDEX_TYPE != "flat":
+        blob += (
+            f"-{settings.FAISS_INDEX_TYPE}-"
+            f"{settings.FAISS_IVF_NLIST}-"
+            f"{settings.FAISS_HNSW_M}-"
+            f"{settings.FAISS_HNSW_EF_CONSTRUCTION}"
+        )
+
+    if settings.PDF_BACKEND != "pypdf":
+        blob += f"-pdf-{settings.PDF_BACKEND}"
+
+    if settings.EMBEDDING_BACKEND != "torch":
+        blob += f"-{settings.EMBEDDING_BACKEND}-{settings.EMBEDDING_ONNX_QUANTIZE or 'fp32'}"
+
+    if settings.BOILERPLATE_STRIP:
+        blob += (
+            f"-boilerplate-{settings.BOILERPLATE_MIN_SHARE}-"
+            f"{settings.BOILERPLATE_SAMPLE_PAGES}"
+        )
+
+    if settings.DEDUP_ENABLED:
+        blob += f"-dedup-{settings.DEDUP_THRESHOLD}-{settings.DEDUP_NUM_PERM}"
+
+    if settings.FAISS_CODEC != "none":
+        blob += (
+            f"-{settings.FAISS_CODEC}-"
+            f"{settings.FAISS_PQ_M}-"
+            f"{settings.FAISS_PQ_NBITS}"
+        )
+
+    return blob
+
+
+def config_fingerprint() -> str:
+    return hashlib.sha256(config_blob().encode()).hexdigest()
+
+
+def compute_fingerprint(
+    pdf_paths: List[str],
+    doc_hashes: Optional[Dict[str, str]] = None,
+) -> str:
+    """
+    Corpus fingerprint: per-document hashes (path order independent)
+    plus the config blob.
+    """
+    doc_hashes = doc_hashes or document_hashes(pdf_paths)
+
+    hasher = hashlib.sha256()
+    for path in sorted(pdf_paths):
+        hasher.update(doc_hashes[path].encode())
+
+    hasher.update(config_blob().encode())
     return hasher.hexdigest()
 
 
@@ -48,97 +124,695 @@ def load_index_metadata():
     return json.loads(META_FILE.read_text())
 
 
-def save_index_metadata(fingerprint: str, pdf_paths: List[str]):
-    META_FILE.write_text(
-        json.dumps(
-            {
-                "fingerprint": fingerprint,
-                "pdf_files": pdf_paths,
-                "embedding_model": settings.EMBEDDING_MODEL,
-                "chunking": "semantic",
-                "max_chars": settings.MAX_CHARS,
-                "min_chars": settings.MIN_CHARS,
-            },
-            indent=2,
-        )
-    )
+def write_index_metadata(meta: Dict[str, Any]):
+    tmp = atomic_path(META_FILE)
+    tmp.write_text(json.dumps(meta, indent=2))
+    os.replace(tmp, META_FILE)
 
 
-def build_or_load_index(
+def invalidate_index_metadata():
+    """
+    Removes the metadata before the index files are rewritten. The files
+    are replaced one after another; until `save_index_metadata` marks the
+    new set complete, a crash leaves no metadata, so the next start
+    rebuilds instead of trusting row ranges of a partly replaced index.
+    """
+    META_FILE.unlink(missing_ok=True)
+
+
+def save_index_metadata(
+    fingerprint: str,
     pdf_paths: List[str],
-) -> Tuple[FaissStore, BM25Store]:
+    faiss_info: Dict[str, Any],
+    documents: Dict[str, Dict[str, Any]],
+):
+    """
+    `documents`: path -> {"sha256", "rows": [start, end)} into the chunk
+    store; what incremental updates diff against.
+    """
+    write_index_metadata(
+        {
+            "fingerprint": fingerprint,
+            "config": config_fingerprint(),
+            "pdf_files": pdf_paths,
+            "documents": documents,
+            "embedding_model": settings.EMBEDDING_MODEL,
+            "chunking": settings.CHUNKER,
+            "max_chars": settings.MAX_CHARS,
+            "min_chars": settings.MIN_CHARS,
+            "faiss": faiss_info,
+        }
+    )
+
 
-    fingerprint = compute_fingerprint(pdf_paths)
+def save_search_params(
+    nprobe: Optional[int] = None,
+    ef_search: Optional[int] = None,
+):
+    """
+    Persists a tuned ANN operating point; applied on the next load.
+    """
     meta = load_index_metadata()
+    if meta is None:
+        raise FileNotFoundError("No index metadata to update")
 
-    if (
-        meta
-        and meta.get("fingerprint") == fingerprint
-        and FAISS_INDEX.exists()
-        and BM25_INDEX.exists()
-    ):
-        logger.info("event=INDEX_LOAD_START")
+    faiss_info = meta.setdefault("faiss", {"index_type": "flat"})
+    if nprobe is not None:
+        faiss_info["nprobe"] = nprobe
+    if ef_search is not None:
+        faiss_info["ef_search"] = ef_search
 
-        faiss_store = FaissStore(FAISS_INDEX, FAISS_META)
-        faiss_store.load()
+    write_index_metadata(meta)
 
-        bm25_store = BM25Store(BM25_INDEX)
-        bm25_store.load()
+    logger.info(
+        "event=INDEX_SEARCH_PARAMS_SAVED | nprobe=%s | ef_search=%s",
+        faiss_info.get("nprobe"),
+        faiss_info.get("ef_search"),
+    )
 
-        logger.info(
-            "event=INDEX_LOADED | faiss_vectors=%d | bm25_docs=%d",
-            len(faiss_store.metadata),
-            len(bm25_store.documents),
-        )
 
-        return faiss_store, bm25_store
+def new_faiss_store(
+    chunk_store: ChunkStore,
+    dimension: Optional[int] = None,
+    mmap: Optional[bool] = None,
+) -> FaissStore:
+    return FaissStore(
+        FAISS_INDEX,
+        FAISS_META,
+        dimension=dimension,
+        index_type=settings.FAISS_INDEX_TYPE,
+        nlist=settings.FAISS_IVF_NLIST,
+        hnsw_m=settings.FAISS_HNSW_M,
+        ef_construction=settings.FAISS_HNSW_EF_CONSTRUCTION,
+        train_sample=settings.FAISS_TRAIN_SAMPLE,
+        codec=settings.FAISS_CODEC,
+        pq_m=settings.FAISS_PQ_M,
+        pq_nbits=settings.FAISS_PQ_NBITS,
+        rerank_factor=settings.FAISS_RERANK_FACTOR,
+        mmap=settings.INDEX_MMAP if mmap is None else mmap,
+        chunk_store=chunk_store,
+    )
+
+
+def new_bm25_store(
+    chunk_store: ChunkStore,
+    mmap: Optional[bool] = None,
+) -> BM25Store:
+    return BM25Store(
+        BM25_INDEX,
+        search_mode=settings.BM25_SEARCH_MODE,
+        mmap=settings.INDEX_MMAP if mmap is None else mmap,
+        chunk_store=chunk_store,
+    )
+
+
+def new_embedding_cache() -> Optional[EmbeddingCache]:
+    if not settings.EMBEDDING_CACHE_ENABLED:
+        return None
+
+    return EmbeddingCache(
+        settings.EMBEDDING_CACHE_PATH,
+        model_name=EmbeddingService.model_id(),
+        max_bytes=settings.EMBEDDING_CACHE_MAX_MB * 1024 * 1024,
+    )
+
+
+def embed_chunks(
+    chunks: List[Dict[str, Any]],
+    cache: Optional[EmbeddingCache],
+    pool: Optional[EmbeddingPool] = None,
+) -> np.ndarray:
+    if pool is not None:
+        embed = pool.embed_texts
+    else:
+        embedder = EmbeddingService()
+
+        def embed(texts: List[str]) -> np.ndarray:
+            return embedder.embed_texts(texts).cpu().numpy()
 
-    logger.warning("event=INDEX_REBUILD_START")
+    texts = [c["content"] for c in chunks]
+    if cache is None:
+        return embed(texts)
+    return cache.embed(texts, embed)
 
-    try:
-        pages = []
-        for pdf in pdf_paths:
-            pages.extend(load_pdf(pdf))
 
-        chunker = SemanticChunker(
+def new_chunker():
+    if settings.CHUNKER == "semantic":
+        return SemanticChunker(
             max_chars=settings.MAX_CHARS,
             min_chars=settings.MIN_CHARS,
         )
-        chunks = chunker.split_pages(pages)
+    if settings.CHUNKER == "token":
+        return TokenChunker()
+    raise ValueError(f"Unknown chunker: {settings.CHUNKER}")
 
-        embedder = EmbeddingService()
-        embeddings = embedder.embed_texts(
-            [c["content"] for c in chunks]
-        ).cpu().numpy()
-
-        faiss_store = FaissStore(
-            FAISS_INDEX,
-            FAISS_META,
-            dimension=embeddings.shape[1],
+
+def new_dedup_filter() -> Optional[NearDuplicateFilter]:
+    if not settings.DEDUP_ENABLED:
+        return None
+    return NearDuplicateFilter(
+        threshold=settings.DEDUP_THRESHOLD,
+        num_perm=settings.DEDUP_NUM_PERM,
+    )
+
+
+def add_dedup_links(
+    documents: Dict[str, Dict[str, Any]],
+    dedup: Optional[NearDuplicateFilter],
+):
+    """
+    Records, per document, the other documents it shares collapsed
+    chunks with; removing either one then needs a rebuild.
+    """
+    if dedup is None:
+        return
+
+    links = dedup.document_links()
+    for doc in documents.values():
+        if links.get(doc["sha256"]):
+            doc["dedup_links"] = sorted(links[doc["sha256"]])
+
+
+def iter_corpus_chunks(
+    pdf_paths: List[str],
+    doc_hashes: Dict[str, str],
+    documents: Dict[str, Dict[str, Any]],
+    first_row: int = 0,
+    pages: Callable[[str], Iterable[Dict[str, Any]]] = iter_pdf_pages,
+    dedup: Optional[NearDuplicateFilter] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Chunks of every PDF in order, with pages streamed from `pages`
+    (the loader, or a build checkpoint replaying it).
+
+    Each PDF is chunked on its own, so its chunk_ids do not depend on the
+    other documents in the corpus. `documents` receives each PDF's
+    {"sha256", "rows": [start, end)} once its last chunk has been read.
+    With BOILERPLATE_STRIP, repeated page heads/footers are cut first.
+    With `dedup`, near-duplicates of earlier chunks (in any PDF) are
+    dropped and recorded on the chunk they duplicate.
+    """
+    chunker = new_chunker()
+    row = first_row
+
+    for pdf in pdf_paths:
+        start = row
+        doc_pages = pages(pdf)
+
+        stripper = None
+        if settings.BOILERPLATE_STRIP:
+            stripper = BoilerplateStripper(
+                sample_pages=settings.BOILERPLATE_SAMPLE_PAGES,
+                min_share=settings.BOILERPLATE_MIN_SHARE,
+            )
+            doc_pages = stripper.iter_pages(doc_pages)
+
+        chunks = chunker.iter_chunks(doc_pages)
+        if dedup is not None:
+            chunks = dedup.filter(chunks)
+
+        for chunk in chunks:
+            row += 1
+            yield chunk
+
+        documents[pdf] = {"sha256": doc_hashes[pdf], "rows": [start, row]}
+
+        if stripper is not None:
+            stripper.log_summary(pdf)
+            documents[pdf]["boilerplate_bytes_removed"] = stripper.stats["bytes_removed"]
+
+
+def embed_batches(
+    chunks: Iterable[Dict[str, Any]],
+    cache: Optional[EmbeddingCache],
+    pool: Optional[EmbeddingPool] = None,
+) -> Iterator[Tuple[List[Dict[str, Any]], np.ndarray]]:
+    """
+    `chunks` in batches of INDEX_BATCH_SIZE per embedding worker, with
+    their embeddings.
+    """
+    size = settings.INDEX_BATCH_SIZE * (pool.workers if pool is not None else 1)
+    chunks = iter(chunks)
+    while batch := list(islice(chunks, size)):
+        yield batch, embed_chunks(batch, cache, pool)
+
+
+def add_batches(
+    faiss_store: FaissStore,
+    batches: Iterable[Tuple[List[Dict[str, Any]], np.ndarray]],
+    first_row: int,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Adds each (chunks, vectors) batch to `faiss_store` as rows first_row,
+    first_row + 1, ...; yields the chunks back so the chunk store is
+    written in the same pass.
+
+    Indexes that train before their first add (IVF, SQ8/PQ) hold back up
+    to FAISS_TRAIN_SAMPLE vectors for training; after that, memory does
+    not grow with the corpus.
+    """
+    row = first_row
+    held_chunks: List[Dict[str, Any]] = []
+    held_vectors: List[np.ndarray] = []
+
+    def add(batch, vectors):
+        nonlocal row
+        ids = np.arange(row, row + len(batch))
+        faiss_store.add_chunks(vectors, batch, ids=ids)
+        row += len(batch)
+
+    for batch, vectors in batches:
+        if faiss_store.index is None and faiss_store.needs_training:
+            held_chunks.extend(batch)
+            held_vectors.append(vectors)
+            if len(held_chunks) >= faiss_store.train_sample:
+                add(held_chunks, np.concatenate(held_vectors))
+                held_chunks, held_vectors = [], []
+        else:
+            add(batch, vectors)
+
+        yield from batch
+
+    if held_chunks:
+        add(held_chunks, np.concatenate(held_vectors))
+
+
+def embed_checkpointed(
+    pdf_paths: List[str],
+    doc_hashes: Dict[str, str],
+    documents: Dict[str, Dict[str, Any]],
+    checkpoint: BuildCheckpoint,
+    cache: Optional[EmbeddingCache],
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    dedup: Optional[NearDuplicateFilter] = None,
+    pool: Optional[EmbeddingPool] = None,
+):
+    """
+    Embeds the corpus into checkpoint shards of INDEX_CHECKPOINT_CHUNKS
+    chunks. Chunks of shards completed by an earlier, interrupted run are
+    re-chunked (and re-deduplicated) from the checkpointed pages but not
+    re-embedded.
+    """
+    page_totals = {pdf: count_pages(pdf) for pdf in pdf_paths}
+    pages_total = sum(page_totals.values())
+
+    skip = []
+    if not settings.PAGE_CACHE_ENABLED:
+        skip = [pdf for pdf in pdf_paths if checkpoint.has_pages(doc_hashes[pdf])]
+
+    with DocumentPool(pdf_paths, doc_hashes, skip=skip) as loader:
+        if settings.PAGE_CACHE_ENABLED:
+            # Finished PDFs are replayed from the page cache already
+            pages = loader.pages
+        else:
+            def pages(pdf):
+                return checkpoint.pages(doc_hashes[pdf], lambda: loader.pages(pdf))
+
+        chunks = iter_corpus_chunks(
+            pdf_paths, doc_hashes, documents, pages=pages, dedup=dedup
         )
-        faiss_store.add_chunks(embeddings, chunks)
-        faiss_store.save()
 
-        bm25_store = BM25Store(BM25_INDEX)
-        bm25_store.build(chunks)
-        bm25_store.save()
+        resumed = checkpoint.rows
+        chunks_done = resumed
+        start_time = time.perf_counter()
+
+        shard_chunks: List[Dict[str, Any]] = []
+        shard_vectors: List[np.ndarray] = []
+
+        def report(last_chunk: Dict[str, Any]):
+            # Documents enter `documents` only once the stream moves past them
+            pages_done = sum(page_totals[pdf] for pdf in documents)
+            pages_done += last_chunk["metadata"]["page_number"]
+
+            event = {
+                "pages_done": min(pages_done, pages_total),
+                "pages_total": pages_total,
+                "chunks_done": chunks_done,
+                "chunks_resumed": resumed,
+                "elapsed_s": time.perf_counter() - start_time,
+            }
+            if progress is not None:
+                progress(event)
+            return event
+
+        for batch, vectors in embed_batches(islice(chunks, resumed, None), cache, pool):
+            shard_chunks.extend(batch)
+            shard_vectors.append(vectors)
+            chunks_done += len(batch)
+
+            if len(shard_chunks) >= settings.INDEX_CHECKPOINT_CHUNKS:
+                checkpoint.add_shard(shard_chunks, np.concatenate(shard_vectors))
+                shard_chunks, shard_vectors = [], []
+
+                event = report(batch[-1])
+                logger.info(
+                    "event=INDEX_BUILD_PROGRESS | pages_done=%d | pages_total=%d"
+                    " | chunks_done=%d | elapsed_s=%.1f",
+                    event["pages_done"],
+                    event["pages_total"],
+                    event["chunks_done"],
+                    event["elapsed_s"],
+                )
+            else:
+                report(batch[-1])
+
+        if shard_chunks:
+            checkpoint.add_shard(shard_chunks, np.concatenate(shard_vectors))
 
-        save_index_metadata(fingerprint, pdf_paths)
 
-        logger.info(
-            "event=INDEX_REBUILT | chunks=%d",
-            len(chunks),
+@contextmanager
+def build_lock():
+    """
+    Exclusive inter-process lock on the index directory. API workers
+    that start together on a stale index queue here: the first one
+    builds, the others then find the index current and load it.
+    """
+    with open(BUILD_LOCK, "a") as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            logger.info("event=INDEX_BUILD_LOCK_WAIT | pid=%d", os.getpid())
+            start = time.perf_counter()
+            fcntl.flock(f, fcntl.LOCK_EX)
+            logger.info(
+                "event=INDEX_BUILD_LOCK_ACQUIRED | pid=%d | waited_s=%.1f",
+                os.getpid(),
+                time.perf_counter() - start,
+            )
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def index_files_exist() -> bool:
+    return (
+        FAISS_INDEX.exists()
+        and BM25_INDEX.exists()
+        and ChunkStore(CHUNK_STORE).exists()
+    )
+
+
+def load_index(meta: Dict[str, Any]) -> Tuple[FaissStore, BM25Store]:
+    logger.info("event=INDEX_LOAD_START")
+
+    chunk_store = ChunkStore(CHUNK_STORE).open()
+
+    faiss_store = new_faiss_store(chunk_store)
+    faiss_store.load()
+
+    # Precedence: explicit settings > tuned values in index_meta.json
+    persisted = meta.get("faiss", {})
+    faiss_store.set_search_params(
+        nprobe=settings.FAISS_NPROBE or persisted.get("nprobe"),
+        ef_search=settings.FAISS_EF_SEARCH or persisted.get("ef_search"),
+    )
+
+    bm25_store = new_bm25_store(chunk_store)
+    bm25_store.load()
+
+    logger.info(
+        "event=INDEX_LOADED | chunks=%d | faiss_vectors=%d | bm25_docs=%d | faiss=%s",
+        len(chunk_store),
+        faiss_store.index.ntotal,
+        bm25_store.index.n_live,
+        faiss_store.describe(),
+    )
+
+    return faiss_store, bm25_store
+
+
+def rebuild_index(
+    pdf_paths: List[str],
+    doc_hashes: Dict[str, str],
+    fingerprint: str,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Tuple[FaissStore, BM25Store]:
+    """
+    Two passes, both streaming:
+    1. PDFs -> pages -> chunks -> embeddings, checkpointed in shards
+       under BUILD_DIR; an interrupted build resumes from the last shard.
+    2. Shards -> FAISS and the chunk store; BM25 from the chunk store.
+    No step holds the whole corpus in memory. The metadata is removed
+    before pass 2 writes anything and saved last, so an index that was
+    only partly replaced is never loaded or updated.
+    """
+    checkpoint = BuildCheckpoint(BUILD_DIR, fingerprint)
+    logger.warning(
+        "event=INDEX_REBUILD_START | resumed_chunks=%d", checkpoint.rows
+    )
+
+    cache = new_embedding_cache()
+    dedup = new_dedup_filter()
+    documents: Dict[str, Dict[str, Any]] = {}
+
+    with EmbeddingPool() as pool:
+        embed_checkpointed(
+            pdf_paths, doc_hashes, documents, checkpoint, cache, progress, dedup, pool
         )
 
-        return faiss_store, bm25_store
+    # Filled by ChunkStore.write below; FAISS gets explicit row ids until then
+    chunk_store = ChunkStore(CHUNK_STORE)
 
-    except Exception as e:
-        logger.exception("event=INDEX_BUILD_FAILED")
+    faiss_store = new_faiss_store(chunk_store)
+    faiss_store.set_search_params(
+        nprobe=settings.FAISS_NPROBE,
+        ef_search=settings.FAISS_EF_SEARCH,
+    )
+
+    chunks = add_batches(faiss_store, checkpoint.batches(), 0)
+    if dedup is not None:
+        # Every duplicate is known by now, so provenance is complete
+        chunks = dedup.attach_provenance(chunks)
+        dedup.log_summary()
+        add_dedup_links(documents, dedup)
+
+    invalidate_index_metadata()
+    ChunkStore.write(CHUNK_STORE, chunks)
+    chunk_store.open()
+
+    if not len(chunk_store):
+        raise ValueError("No chunks extracted from the PDFs")
+
+    faiss_store.save()
+
+    bm25_store = new_bm25_store(chunk_store)
+    bm25_store.build(chunk_store)
+    bm25_store.save()
+
+    save_index_metadata(
+        fingerprint, pdf_paths, faiss_store.describe(), documents
+    )
+    checkpoint.clear()
+
+    logger.info(
+        "event=INDEX_REBUILT | chunks=%d | embed_cache_hits=%s | embed_cache_misses=%s",
+        len(chunk_store),
+        cache.hits if cache else "off",
+        cache.misses if cache else "off",
+    )
+
+    if cache is not None:
+        cache.close()
+
+    return faiss_store, bm25_store
+
+
+def update_index(
+    pdf_paths: List[str],
+    doc_hashes: Dict[str, str],
+    fingerprint: str,
+    meta: Dict[str, Any],
+) -> Optional[Tuple[FaissStore, BM25Store]]:
+    """
+    Applies document-level changes to the existing index: removed and
+    changed PDFs are deleted by row id, new and changed PDFs are appended.
+    Unchanged documents keep their vectors and postings.
+
+    Returns None when a full rebuild is the better option. As in
+    `rebuild_index`, the metadata is absent while files are rewritten;
+    a failed update forces a rebuild on the next start.
+    """
+    indexed: Dict[str, Dict[str, Any]] = meta["documents"]
+
+    stale = [
+        path for path, doc in indexed.items()
+        if doc_hashes.get(path) != doc["sha256"]
+    ]
+    fresh = [
+        path for path in pdf_paths
+        if path not in indexed or path in stale
+    ]
+    kept = {
+        path: doc for path, doc in indexed.items() if path not in stale
+    }
+
+    if not kept:
+        return None
+
+    # A removed document may hold the only copy of a kept one's chunks.
+    # Byte-identical PDFs share a doc_id, so dedup records no link between
+    # them; the later copy simply has no rows of its own
+    kept_hashes = {doc["sha256"] for doc in kept.values()}
+    if any(kept_hashes.intersection(indexed[path].get("dedup_links", ())) for path in stale):
+        return None
+    if settings.DEDUP_ENABLED and any(indexed[path]["sha256"] in kept_hashes for path in stale):
+        return None
+
+    chunk_store = ChunkStore(CHUNK_STORE).open()
+
+    # Dead rows accumulate in the append-only chunk store until a rebuild
+    live_rows = sum(end - start for start, end in (d["rows"] for d in kept.values()))
+    if 1 - live_rows / max(len(chunk_store), 1) > settings.INDEX_MAX_DEAD_RATIO:
+        chunk_store.close()
+        return None
+
+    logger.info(
+        "event=INDEX_UPDATE_START | unchanged=%d | removed=%d | added=%d",
+        len(kept),
+        len(stale),
+        len(fresh),
+    )
+
+    # Updates rewrite the index; they need private, writable copies
+    faiss_store = new_faiss_store(chunk_store, mmap=False)
+    faiss_store.load()
+    faiss_store.set_search_params(
+        nprobe=settings.FAISS_NPROBE or meta.get("faiss", {}).get("nprobe"),
+        ef_search=settings.FAISS_EF_SEARCH or meta.get("faiss", {}).get("ef_search"),
+    )
+
+    if not faiss_store.maps_ids:
+        chunk_store.close()
+        return None
+
+    bm25_store = new_bm25_store(chunk_store, mmap=False)
+    bm25_store.load()
+
+    dead = [
+        row
+        for path in stale
+        for row in range(*indexed[path]["rows"])
+    ]
+    if dead:
+        faiss_store.remove_ids(dead)
+        bm25_store.remove_documents(dead)
+
+    cache = new_embedding_cache()
+    documents: Dict[str, Dict[str, Any]] = {}
+
+    first_row = len(chunk_store)
+    dedup = new_dedup_filter()
+
+    # From the chunk-store append on, the files on disk change
+    invalidate_index_metadata()
+    with DocumentPool(fresh, doc_hashes) as loader, EmbeddingPool() as pool:
+        chunks = iter_corpus_chunks(
+            fresh, doc_hashes, documents, first_row, pages=loader.pages, dedup=dedup
+        )
+
+        if dedup is not None:
+            # Added documents are deduplicated among themselves; provenance is
+            # only complete once they are all chunked
+            chunks = list(chunks)
+            dedup.log_summary()
+            add_dedup_links(documents, dedup)
+            chunks = dedup.attach_provenance(chunks)
+
+        rows = chunk_store.append(
+            add_batches(faiss_store, embed_batches(chunks, cache, pool), first_row)
+        )
+
+    if len(rows):
+        bm25_store.add_documents(chunk_store[rows.start : rows.stop])
+
+    faiss_store.save()
+    bm25_store.save()
+
+    save_index_metadata(
+        fingerprint,
+        pdf_paths,
+        faiss_store.describe(),
+        {**kept, **documents},
+    )
+
+    logger.info(
+        "event=INDEX_UPDATED | removed_chunks=%d | added_chunks=%d | live_chunks=%d"
+        " | embed_cache_hits=%s | embed_cache_misses=%s",
+        len(dead),
+        len(rows),
+        faiss_store.index.ntotal,
+        cache.hits if cache else "off",
+        cache.misses if cache else "off",
+    )
+
+    if cache is not None:
+        cache.close()
+
+    return faiss_store, bm25_store
+
+
+def build_or_load_index(
+    pdf_paths: List[str],
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    build: bool = True,
+) -> Tuple[FaissStore, BM25Store]:
+    """
+    Loads the index if it matches `pdf_paths` and the config, applies PDF
+    changes incrementally when it can, and rebuilds otherwise. `progress`
+    receives rebuild progress events (see `embed_checkpointed`).
+
+    With build=False a missing or stale index is an error instead.
+    Building holds `build_lock`, so concurrent callers build only once.
+    """
+
+    doc_hashes = document_hashes(pdf_paths)
+    fingerprint = compute_fingerprint(pdf_paths, doc_hashes)
+    meta = load_index_metadata()
+    index_exists = index_files_exist()
+
+    if meta and meta.get("fingerprint") == fingerprint and index_exists:
+        return load_index(meta)
+
+    if not build:
         raise CustomException(
-            "Index build/load failed",
-            error=e,
+            "Index is missing or out of date; build it with `python -m rag.build_index`",
             context={
                 "pdf_count": len(pdf_paths),
                 "fingerprint": fingerprint,
+                "index_exists": index_exists,
             },
-        ) from e
+        )
+
+    with build_lock():
+        # Another process may have built the index while this one waited
+        meta = load_index_metadata()
+        index_exists = index_files_exist()
+
+        if meta and meta.get("fingerprint") == fingerprint and index_exists:
+            return load_index(meta)
+
+        try:
+            if (
+                settings.INDEX_INCREMENTAL
+                and index_exists
+                and meta
+                and meta.get("config") == config_fingerprint()
+                and "documents" in meta
+            ):
+                stores = update_index(pdf_paths, doc_hashes, fingerprint, meta)
+                if stores is not None:
+                    return stores
+
+            return rebuild_index(pdf_paths, doc_hashes, fingerprint, progress)
+
+        except Exception as e:
+            logger.exception("event=INDEX_BUILD_FAILED")
+            raise CustomException(
+                "Index build/load failed",
+                error=e,
+                context={
+                    "pdf_count": len(pdf_paths),
+                    "fingerprint": fingerprint,
+                },
+            ) from e
@@ -1,6 +1,9 @@
 # rag/retriever.py
 
 from typing import List, Dict, Any, Tuple
+
+import numpy as np
+
 from api.config import settings
 from rag.embedder import EmbeddingService
 from rag.faiss_store import FaissStore
@@ -12,14 +15,9 @@ class Retriever:
         self.threshold = settings.SIMILARITY_THRESHOLD
 
     def search(self, query: str, top_k:int) -> Tuple[str, List[Dict[str, Any]], List[float]]:
-        query_vector = (
-            self.embedder.embed_texts([query])
-            .cpu()
-            .numpy()
-            .astype("float32")
-        )
-
-        scores, indices = self.store.index.search(query_vector, top_k)
+        query_vector = self.embedder.embed_query(query)[np.newaxis]
+
+        scores, indices = self.store.search(query_vector, top_k)
 
         chunks = []
         chunk_scores = []